@@ -3,7 +3,18 @@ import os
 import discord
 from discord.ext import commands
 import config
-from database.database import init_db
+from database.database import init_db, track_replica_lag, async_session, read_session, engines
+from database.pool import check_liveness
+from database import statements
+from database.erasure import ErasureJobs
+from utils.router import InteractionRouter
+from utils.fastmode import FastModeSettings
+from utils.outbound import OutboundQueue
+from utils.guild_cache import GuildConfigCache
+from utils.prefixes import PrefixMatcher
+from utils.profiles import ProfilePages
+from utils.state import create_state
+from utils.metrics import metrics
 import logging
 
 # Setup intents for the bot
@@ -11,20 +22,84 @@ intents = discord.Intents.default()
 intents.message_content = True  # Needed to read message content
 intents.members = True  # Needed for user-related commands
 
-async def setup_bot():
-    """Set up and configure the bot with all cogs"""
+class ChannelRestricted(commands.CheckFailure):
+    """Raised when a command is used outside the channels a guild allows"""
+    pass
+
+async def setup_bot(shard_ids=None, shard_count=None, state_url=None, cluster_id=None):
+    """Set up and configure the bot with all cogs
+    
+    Sharded when AUTO_SHARD is on or the cluster launcher hands this process a
+    range of shards, with state shared between clusters through state_url.
+    """
     
     # Initialize database
     await init_db()
     
+    def get_prefix(bot, message):
+        """Resolve a message's prefixes from the precomputed per-guild lookup, without touching the database"""
+        return bot.prefixes.prefixes(message.guild.id if message.guild else None)
+    
     # Create bot instance
-    bot = commands.Bot(
-        command_prefix=commands.when_mentioned_or(config.DEFAULT_PREFIX),
+    options = dict(
+        command_prefix=get_prefix,
         description=config.BOT_DESCRIPTION,
         intents=intents,
         help_command=None,  # We'll implement our own help command
         case_insensitive=True
     )
+    if shard_ids is not None or config.AUTO_SHARD:
+        bot = commands.AutoShardedBot(
+            shard_ids=shard_ids,
+            shard_count=shard_count or config.SHARD_COUNT or None,
+            **options
+        )
+    else:
+        bot = commands.Bot(**options)
+    
+    # Cooldowns, busy players, leaderboards and the lottery live in shared state so every process agrees
+    bot.cluster_id = cluster_id
+    bot.state = create_state(state_url or config.STATE_URL)
+    
+    # Rendered profile pages, shared between clusters and dropped when their user's rows change
+    bot.profiles = ProfilePages(bot.state)
+    
+    # Measure how far reads trail writes when they go to a separate pool or replica
+    bot.replica_lag_task = None
+    if read_session is not async_session:
+        bot.replica_lag_task = asyncio.create_task(track_replica_lag(config.REPLICA_LAG_INTERVAL))
+    
+    # Check connections in the background rather than pinging on every checkout
+    bot.liveness_task = None
+    if config.DB_LIVENESS_INTERVAL > 0:
+        bot.liveness_task = asyncio.create_task(check_liveness(engines(), config.DB_LIVENESS_INTERVAL))
+    
+    # Guild configs are needed for every message, so load them all before connecting
+    bot.guild_configs = GuildConfigCache()
+    await bot.guild_configs.load()
+    
+    # Turn away messages that can't be commands before discord.py builds a context for them
+    bot.prefixes = PrefixMatcher(config.DEFAULT_PREFIX, bot.guild_configs)
+    
+    # Route game replies and button clicks by key instead of per-game wait_for checks
+    bot.router = InteractionRouter()
+    bot.add_listener(bot.router.on_message, "on_message")
+    bot.add_listener(bot.router.on_interaction, "on_interaction")
+    
+    # Pace game messages per channel, coalescing edits and merging small results
+    bot.outbound = OutboundQueue(
+        config.OUTBOUND_SENDS_PER_WINDOW,
+        config.OUTBOUND_EDITS_PER_WINDOW,
+        config.OUTBOUND_WINDOW,
+        config.OUTBOUND_MERGE_LIMIT
+    )
+    
+    # Fast mode settings are read on every game, so keep them all in memory
+    bot.fast_mode = FastModeSettings()
+    await bot.fast_mode.load()
+    
+    # Account erasures run in the background so large accounts don't hold up the command
+    bot.erasures = ErasureJobs(on_erased=bot.fast_mode.forget_users, state=bot.state)
     
     # Cog loading function
     async def load_cogs():
@@ -44,14 +119,71 @@ async def setup_bot():
             except Exception as e:
                 logging.error(f"Failed to load cog {cog}: {e}")
     
+    @bot.check
+    async def channel_gate(ctx):
+        """Only run commands in a guild's allowed channels; admins may use them anywhere"""
+        if ctx.guild is None:
+            return True
+        if bot.guild_configs.allows_channel(ctx.guild.id, ctx.channel.id, getattr(ctx.channel, "parent_id", None)):
+            return True
+        if ctx.author.guild_permissions.administrator or bot.guild_configs.is_admin(ctx.guild.id, ctx.author.id):
+            return True
+        metrics.incr("guild_config.channel_blocks")
+        raise ChannelRestricted("Commands are disabled in this channel.")
+    
     # Bot events
+    @bot.event
+    async def on_message(message):
+        """Only hand messages that start with a prefix to the command parser"""
+        if message.author.bot:
+            return
+        if bot.prefixes.match(message.guild.id if message.guild else None, message.content) is None:
+            return
+        await bot.process_commands(message)
+    
+    @bot.event
+    async def on_command(ctx):
+        """Count commands dispatched, to compare against messages seen"""
+        metrics.incr("gateway.commands")
+    
+    # In development, count each command's statements and log repeats that look like N+1 queries
+    if config.DEV_MODE:
+        statements.install()
+        
+        @bot.before_invoke
+        async def start_statement_log(ctx):
+            ctx.statement_token = statements.start(ctx.command.qualified_name)
+        
+        @bot.after_invoke
+        async def finish_statement_log(ctx):
+            if hasattr(ctx, "statement_token"):
+                log = statements.finish(ctx.statement_token)
+                logging.debug(f"{log.name} ran {log.count} statements")
+    
     @bot.event
     async def on_ready():
+        bot.prefixes.set_user(bot.user.id)
         activity = discord.Activity(
             type=getattr(discord.ActivityType, config.ACTIVITY_TYPE.lower()), 
             name=config.ACTIVITY_NAME
         )
         await bot.change_presence(status=getattr(discord.Status, config.STATUS.lower()), activity=activity)
+        
+        if bot.cluster_id is not None and not getattr(bot, "heartbeat_task", None):
+            bot.heartbeat_task = asyncio.create_task(heartbeat())
+    
+    async def heartbeat():
+        """Report this cluster's shards and guilds to the launcher"""
+        while not bot.is_closed():
+            try:
+                await bot.state.set(f"cluster:{bot.cluster_id}", {
+                    "shards": list(bot.shards),
+                    "guilds": len(bot.guilds),
+                    "latency": bot.latency
+                }, ttl=config.CLUSTER_HEARTBEAT_INTERVAL * 3)
+            except Exception as e:
+                logging.warning(f"Cluster {bot.cluster_id} heartbeat failed: {e}")
+            await asyncio.sleep(config.CLUSTER_HEARTBEAT_INTERVAL)
     
     @bot.event
     async def on_guild_join(guild):
@@ -64,6 +196,12 @@ async def setup_bot():
         if isinstance(error, commands.CommandNotFound):
             return
         
+        # Stay quiet in restricted channels, except to answer a slash command privately
+        if isinstance(error, ChannelRestricted):
+            if ctx.interaction:
+                await ctx.send(str(error), ephemeral=True)
+            return
+            
         if isinstance(error, commands.CommandOnCooldown):
             await ctx.send(f"This command is on cooldown. Try again in {error.retry_after:.2f} seconds.")
             return
@@ -3,14 +3,30 @@ from discord import app_commands
 from discord.ext import commands
 import random
 import asyncio
+import heapq
+import logging
+import uuid
+from datetime import timedelta
 import config
 from utils.cooldowns import cooldown
 from utils.embeds import EmbedBuilder
 from utils.economy import EconomyManager
-from utils.helpers import parse_amount, SlotMachine, RockPaperScissors
+from utils.helpers import parse_amount, SlotMachine, RockPaperScissors, RoutedView
 from database.models import User, GameStats
 from database.database import get_session
-from assets.icons import get_slot_icon, CARD_SUITS, CARD_VALUES
+from utils.cards import Shoe, format_cards
+from utils.blackjack import (
+    BlackjackTable, hand_value, is_natural, format_hand, settle,
+    PAYOUTS, BLACKJACK, WIN, LOSS, PUSH, HIT, STAND, NATURAL_STATE
+)
+from utils.roulette import RouletteTable, lookup_bet, spin, resolve, bet_label, bet_odds, NUMBER_TEXT
+from utils.crash import CrashRound, generate_crash_point, BETTING, RUNNING, CRASHED
+from utils.poker import HoldemTable, STREET_NAMES, FOLD, CHECK, CALL, RAISE
+from utils.sessions import SessionStore
+from utils.fastmode import suspense
+from utils.metrics import metrics
+from utils.autoplay import play_batch, slot_outcomes, highlow_outcomes, COINFLIP_OUTCOMES, DICE_OUTCOMES, STOP_REASONS
+from assets.icons import get_slot_icon, CARD_SUITS
 
 class GamblingCommands(commands.Cog):
     """Commands related to gambling games and betting"""
@@ -18,12 +34,123 @@ class GamblingCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.economy = EconomyManager(bot)
-        self.games_in_progress = {}
+        self.sessions = SessionStore(config.GAME_SESSION_TTL, bot.state)
+        self.games_in_progress = self.sessions.players  # Busy players, released when their session closes
+        self.session_sweeper = None
+        self.shoes = {}  # Persistent blackjack shoes by channel
+        self.bj_tables = {}  # Multiplayer blackjack tables by channel
+        self.roulette_tables = {}  # Shared-spin roulette tables by channel
+        self.crash_rounds = {}  # Crash rounds by channel
+        self.holdem_tables = {}  # Hold'em tables by channel
+        self.slot_odds = slot_outcomes(SlotMachine.SYMBOLS)  # Exact spin odds for batch play
+    
+    async def cog_load(self):
+        """Recover the games left by the last run, then start expiring abandoned game sessions"""
+        self.session_sweeper = asyncio.create_task(self.recover_then_sweep())
+    
+    async def cog_unload(self):
+        """Stop the session sweeper"""
+        if self.session_sweeper:
+            self.session_sweeper.cancel()
+    
+    async def recover_then_sweep(self):
+        """Sweep sessions only once recovery is done, so none expire before they are refunded"""
+        await self.bot.wait_until_ready()
+        try:
+            await self.recover_games()
+        except Exception as e:
+            logging.error(f"Game recovery failed: {e}")
+        await self.sessions.run_sweeper(config.GAME_SESSION_SWEEP_INTERVAL)
+    
+    async def recover_games(self):
+        """Resume or refund the games that were in flight when the bot last stopped"""
+        resumed = refunded = 0
+        for game in await self.sessions.load_open():
+            channel = self.bot.get_channel(game.channel_id)
+            message = None
+            if channel and game.message_id:
+                try:
+                    message = await channel.fetch_message(game.message_id)
+                except discord.HTTPException:
+                    message = None
+            
+            # Blackjack hands pick up where they left off; the old buttons route to the same session key
+            if game.game_name == "blackjack" and message and not game.expired:
+                self.sessions.adopt(game)
+                self.bot.loop.create_task(self.resume_blackjack(game, channel, message))
+                resumed += 1
+                continue
+                
+            await self.refund_session(game, channel, message)
+            refunded += 1
+            
+        # Table rounds don't resume; every stake they still held goes back to its player
+        stakes = await self.economy.refund_held_stakes()
+        by_channel = {}
+        for user_id, game_name, channel_id, amount in stakes:
+            by_channel.setdefault((channel_id, game_name), []).append((user_id, amount))
+        for (channel_id, game_name), refunds in by_channel.items():
+            channel = self.bot.get_channel(channel_id) if channel_id else None
+            if channel is None:
+                continue
+            lines = ", ".join(f"<@{user_id}> ${amount:,}" for user_id, amount in refunds)
+            try:
+                await channel.send(f"The bot restarted during a {game_name} round, so its bets were returned: {lines}")
+            except discord.HTTPException:
+                pass
+                
+        if resumed or refunded or stakes:
+            logging.info(f"Recovered game sessions: {resumed} resumed, {refunded} refunded, {len(stakes)} held stakes returned")
+    
+    async def resume_blackjack(self, game, channel, message):
+        """Continue a Blackjack hand restored from the session store"""
+        try:
+            await channel.send(f"<@{game.user_ids[0]}>, your Blackjack hand is back! Carry on with the buttons above.")
+            await self.play_blackjack(game, channel, message)
+        finally:
+            await self.sessions.close(game)
+    
+    async def refund_session(self, game, channel, message):
+        """Cancel a solo or head-to-head game that can't be resumed
+        
+        These games only move cash when they are settled, so cancelling one
+        returns every stake. Table rounds take stakes when bets are placed; those
+        are refunded from the held stakes recorded with them.
+        """
+        await self.sessions.close(game)
+        try:
+            if message:
+                await self.bot.outbound.edit(message, view=None)
+            if channel:
+                players = ", ".join(f"<@{user_id}>" for user_id in game.user_ids)
+                bet_text = f" The ${game.bet_amount:,} bet was returned." if game.bet_amount else ""
+                await channel.send(f"{players}: the bot restarted during your {game.game_name} game, so it was cancelled.{bet_text}")
+        except discord.HTTPException:
+            pass
+    
+    @commands.command(name="gamesessions", hidden=True)
+    @commands.is_owner()
+    async def gamesessions(self, ctx):
+        """Show the live game session count and memory use"""
+        stats = self.sessions.stats()
+        embed = EmbedBuilder.info(
+            title="Game Sessions",
+            description=f"{stats['live']:,} live sessions holding {stats['players']:,} busy players"
+        )
+        embed.add_field(name="State Size", value=f"{stats['state_bytes']:,} bytes", inline=True)
+        embed.add_field(name="Memory", value=f"{stats['memory_bytes'] / 1024:,.1f} KiB", inline=True)
+        embed.add_field(name="Snapshots Written", value=f"{stats['saves']:,}", inline=True)
+        embed.add_field(name="Expired", value=f"{stats['expired']:,}", inline=True)
+        await ctx.send(embed=embed)
     
     #
     # UTILITY METHODS
     #
     
+    def round_key(self, game, channel_id):
+        """A unique key for one round of a table game, which its held stakes are recorded under"""
+        return f"{game}:{channel_id}:{uuid.uuid4().hex[:12]}"
+    
     async def update_game_stats(self, user_id, game_name, bet_amount, won):
         """Update game statistics for a user"""
         async with get_session() as session:
@@ -58,6 +185,14 @@ class GamblingCommands(commands.Cog):
                 
             await session.commit()
     
+    def get_shoe(self, channel_id):
+        """Get the blackjack shoe for a channel's table, creating it if needed"""
+        shoe = self.shoes.get(channel_id)
+        if shoe is None:
+            shoe = Shoe(config.BLACKJACK_DECKS, config.BLACKJACK_PENETRATION)
+            self.shoes[channel_id] = shoe
+        return shoe
+    
     def is_valid_bet(self, cash, bet_amount):
         """Check if a bet amount is valid"""
         if bet_amount < config.MIN_BET:
@@ -68,14 +203,19 @@ class GamblingCommands(commands.Cog):
             return False, f"You don't have enough cash! You only have ${cash:,}."
         return True, None
     
-    async def process_bet_result(self, ctx, bet_amount, game_name, won, win_amount=None, multiplier=None):
+    async def process_bet_result(self, ctx, bet_amount, game_name, won, win_amount=None, multiplier=None, reveal=None):
         """Process the result of a bet and send appropriate message"""
-        user_id = ctx.author.id
+        return await self.send_bet_result(ctx, ctx.author.id, bet_amount, game_name, won, win_amount, multiplier, reveal)
+    
+    async def send_bet_result(self, destination, user_id, bet_amount, game_name, won, win_amount=None, multiplier=None, reveal=None):
+        """Process the result of a user's bet and send the result to a channel or context
         
-        # Calculate win amount if not provided
+        A reveal embed (the game's own result in fast mode) goes out in the same message.
+        """
+        # Calculate win amount if not provided; the stake was never taken, so it's the net win
         if win_amount is None:
             if multiplier is None:
-                multiplier = 2  # Default 1:1 payout
+                multiplier = 1  # Default 1:1 payout
             win_amount = bet_amount * multiplier
         
         # Process economy transaction
@@ -108,17 +248,83 @@ class GamblingCommands(commands.Cog):
         await self.update_game_stats(user_id, game_name.lower(), bet_amount, won)
         
         # Send result message
-        await ctx.send(embed=embed)
+        # Results are small, so ones waiting in a busy channel may share a message
+        if reveal:
+            await self.bot.outbound.send(destination, merge=True, embeds=[reveal, embed])
+        else:
+            await self.bot.outbound.send(destination, merge=True, embed=embed)
         
         return new_balance
     
+    async def play_rounds(self, ctx, game_name, bet_amount, rounds, outcomes, stop_loss=None, take_profit=None, choice=None):
+        """Play a batch of rounds in one pass and settle them all with a single transaction"""
+        if rounds < 1 or rounds > config.AUTOPLAY_MAX_ROUNDS:
+            return await ctx.send(f"You can play between 1 and {config.AUTOPLAY_MAX_ROUNDS:,} rounds at once!")
+        if (stop_loss is not None and stop_loss <= 0) or (take_profit is not None and take_profit <= 0):
+            return await ctx.send("Stop-loss and take-profit must be positive amounts!")
+        # Hold the player until the batch is settled so two batches can't spend the same cash
+        if not await self.sessions.claim(ctx.author.id, "autoplay"):
+            return await ctx.send("You already have a game in progress!")
+        try:
+            # Cap the batch by the balance once the player is held, not the one the command read
+            cash = (await self.economy.get_balances([ctx.author.id]))[ctx.author.id]
+            valid, message = self.is_valid_bet(cash, bet_amount)
+            if not valid:
+                return await ctx.send(message)
+            batch = play_batch(outcomes, bet_amount, rounds, cash, stop_loss, take_profit)
+            results = [(ctx.author.id, bet_amount, net * bet_amount) for net in batch["nets"]]
+            try:
+                balances = await self.economy.settle_bets(game_name, results)
+            except ValueError:
+                # Cash spent elsewhere while the batch ran; settle_bets refused and wrote nothing
+                return await ctx.send("Your balance changed while the rounds were played, so none of them counted!")
+        finally:
+            self.games_in_progress.pop(ctx.author.id, None)
+            
+        await ctx.send(embed=self.build_autoplay_embed(game_name, bet_amount, batch, balances.get(ctx.author.id), choice))
+    
+    def build_autoplay_embed(self, game_name, bet_amount, batch, balance, choice=None):
+        """Create the summary embed for a batch of rounds"""
+        net = batch["net"]
+        description = f"Played **{batch['rounds']:,}** of {batch['requested']:,} rounds at ${bet_amount:,} each."
+        if batch["stopped"]:
+            description += f"\n{STOP_REASONS[batch['stopped']]}, so the remaining rounds were skipped."
+            
+        title = f"{game_name} Autoplay"
+        if net > 0:
+            embed = EmbedBuilder.success(title=title, description=description)
+        elif net < 0:
+            embed = EmbedBuilder.error(title=title, description=description)
+        else:
+            embed = EmbedBuilder.info(title=title, description=description)
+            
+        if choice:
+            embed.add_field(name="Your Choice", value=choice, inline=True)
+        embed.add_field(name="Wins", value=f"{batch['wins']:,} ({batch['wins'] / batch['rounds']:.0%})", inline=True)
+        embed.add_field(name="Wagered", value=f"${batch['wagered']:,}", inline=True)
+        embed.add_field(name="Net", value=f"{'+' if net >= 0 else '-'}${abs(net):,}", inline=True)
+        embed.add_field(name="Biggest Win", value=f"${batch['biggest_win']:,}", inline=True)
+        if balance is not None:
+            embed.add_field(name="New Balance", value=f"${balance:,}", inline=True)
+        
+        # Break the rounds down by payout, best first
+        lines = [
+            f"{'Won ' + str(outcome) + 'x' if outcome > 0 else 'Lost'}: {count:,}"
+            for outcome, count in sorted(batch["counts"].items(), reverse=True)
+        ]
+        embed.add_field(name="Outcomes", value="\n".join(lines), inline=False)
+        return embed
+    
     #
     # GAMBLING GAMES
     #
     
     @commands.hybrid_command(name="coinflip", aliases=["coin", "flip", "cf"])
-    @app_commands.describe(bet="Amount to bet", choice="Heads or Tails")
-    async def coinflip(self, ctx, bet: str, choice: str = None):
+    @app_commands.describe(
+        bet="Amount to bet", choice="Heads or Tails", rounds="Rounds to play in one go",
+        stop_loss="Stop once you're down this much", take_profit="Stop once you're up this much"
+    )
+    async def coinflip(self, ctx, bet: str, choice: str = None, rounds: int = 1, stop_loss: int = None, take_profit: int = None):
         """Flip a coin and bet on the outcome!"""
         # Get user's cash
         async with get_session() as session:
@@ -150,11 +356,15 @@ class GamblingCommands(commands.Cog):
             choice = random.choice(["heads", "tails"])
             await ctx.send(f"No choice provided. I'll choose {choice.capitalize()} for you!")
         
-        # Send initial message
-        message = await ctx.send("Flipping coin...")
+        # Play many flips at once if asked
+        if rounds != 1:
+            return await self.play_rounds(
+                ctx, "Coinflip", bet_amount, rounds, COINFLIP_OUTCOMES,
+                stop_loss, take_profit, choice.capitalize()
+            )
         
-        # Add suspense
-        await asyncio.sleep(1.5)
+        # Send initial message and add suspense, unless the player wants fast results
+        message = await suspense(ctx, "Flipping coin...")
         
         # Determine result
         result = random.choice(["heads", "tails"])
@@ -176,15 +386,19 @@ class GamblingCommands(commands.Cog):
         embed.add_field(name="Result", value="🪙 " + result.capitalize(), inline=True)
         embed.add_field(name="Your Choice", value="🪙 " + choice.capitalize(), inline=True)
         
-        # Update the message
-        await message.edit(content=None, embed=embed)
+        # Update the message; in fast mode the result goes out with the bet result instead
+        if message:
+            await self.bot.outbound.edit(message, content=None, embed=embed)
         
         # Process bet result
-        await self.process_bet_result(ctx, bet_amount, "Coinflip", won)
+        await self.process_bet_result(ctx, bet_amount, "Coinflip", won, reveal=None if message else embed)
     
     @commands.hybrid_command(name="slots", aliases=["slot", "s"])
-    @app_commands.describe(bet="Amount to bet")
-    async def slots(self, ctx, bet: str):
+    @app_commands.describe(
+        bet="Amount to bet", rounds="Rounds to play in one go",
+        stop_loss="Stop once you're down this much", take_profit="Stop once you're up this much"
+    )
+    async def slots(self, ctx, bet: str, rounds: int = 1, stop_loss: int = None, take_profit: int = None):
         """Try your luck with the slot machine!"""
         # Get user's cash
         async with get_session() as session:
@@ -202,11 +416,14 @@ class GamblingCommands(commands.Cog):
         if not valid:
             return await ctx.send(message)
         
-        # Send initial message
-        message = await ctx.send("🎰 Spinning the slots...")
+        # Play many spins at once if asked
+        if rounds != 1:
+            return await self.play_rounds(
+                ctx, "Slots", bet_amount, rounds, self.slot_odds, stop_loss, take_profit
+            )
         
-        # Add suspense
-        await asyncio.sleep(1.5)
+        # Send initial message and add suspense, unless the player wants fast results
+        message = await suspense(ctx, "🎰 Spinning the slots...")
         
         # Spin the slots
         result = SlotMachine.spin()
@@ -233,18 +450,23 @@ class GamblingCommands(commands.Cog):
             win_amount = bet_amount * result["multiplier"]
             embed.add_field(name="Won", value=f"${win_amount:,}", inline=True)
         
-        # Update the message
-        await message.edit(content=None, embed=embed)
+        # Update the message; in fast mode the result goes out with the bet result instead
+        if message:
+            await self.bot.outbound.edit(message, content=None, embed=embed)
         
         # Process bet result
         await self.process_bet_result(
             ctx, bet_amount, "Slots", won, 
-            multiplier=result["multiplier"] if won else None
+            multiplier=result["multiplier"] if won else None,
+            reveal=None if message else embed
         )
     
     @commands.hybrid_command(name="dice", aliases=["roll", "rolldice"])
-    @app_commands.describe(bet="Amount to bet", choice="Number to bet on (1-6)")
-    async def dice(self, ctx, bet: str, choice: int = None):
+    @app_commands.describe(
+        bet="Amount to bet", choice="Number to bet on (1-6)", rounds="Rounds to play in one go",
+        stop_loss="Stop once you're down this much", take_profit="Stop once you're up this much"
+    )
+    async def dice(self, ctx, bet: str, choice: int = None, rounds: int = 1, stop_loss: int = None, take_profit: int = None):
         """Roll a die and bet on the outcome!"""
         # Get user's cash
         async with get_session() as session:
@@ -271,11 +493,14 @@ class GamblingCommands(commands.Cog):
             choice = random.randint(1, 6)
             await ctx.send(f"No choice provided. I'll choose {choice} for you!")
         
-        # Send initial message
-        message = await ctx.send("🎲 Rolling the die...")
+        # Play many rolls at once if asked
+        if rounds != 1:
+            return await self.play_rounds(
+                ctx, "Dice", bet_amount, rounds, DICE_OUTCOMES, stop_loss, take_profit, str(choice)
+            )
         
-        # Add suspense
-        await asyncio.sleep(1.5)
+        # Send initial message and add suspense, unless the player wants fast results
+        message = await suspense(ctx, "🎲 Rolling the die...")
         
         # Roll the die
         result = random.randint(1, 6)
@@ -304,11 +529,12 @@ class GamblingCommands(commands.Cog):
         # Add bet information
         embed.add_field(name="Bet", value=f"${bet_amount:,}", inline=True)
         
-        # Update the message
-        await message.edit(content=None, embed=embed)
+        # Update the message; in fast mode the result goes out with the bet result instead
+        if message:
+            await self.bot.outbound.edit(message, content=None, embed=embed)
         
         # Process bet result
-        await self.process_bet_result(ctx, bet_amount, "Dice", won, multiplier=multiplier if won else None)
+        await self.process_bet_result(ctx, bet_amount, "Dice", won, multiplier=multiplier if won else None, reveal=None if message else embed)
     
     @commands.hybrid_command(name="rps", aliases=["rockpaperscissors"])
     @app_commands.describe(bet="Amount to bet", choice="Rock, Paper, or Scissors")
@@ -349,11 +575,8 @@ class GamblingCommands(commands.Cog):
             choice = random.choice(["rock", "paper", "scissors"])
             await ctx.send(f"No choice provided. I'll choose {choice} for you!")
         
-        # Send initial message
-        message = await ctx.send(f"Playing Rock, Paper, Scissors...\nYou chose: {RockPaperScissors.get_choice_emoji(choice)} {choice.capitalize()}")
-        
-        # Add suspense
-        await asyncio.sleep(1.5)
+        # Send initial message and add suspense, unless the player wants fast results
+        message = await suspense(ctx, f"Playing Rock, Paper, Scissors...\nYou chose: {RockPaperScissors.get_choice_emoji(choice)} {choice.capitalize()}")
         
         # Bot's choice
         bot_choice = random.choice(["rock", "paper", "scissors"])
@@ -380,24 +603,25 @@ class GamblingCommands(commands.Cog):
                 description=f"**It's a tie!**\nYou both chose **{choice}** {RockPaperScissors.get_choice_emoji(choice)}"
             )
             # In case of tie, return the bet amount
-            await ctx.send("It's a tie! Your bet has been returned.")
+            await ctx.send("It's a tie! Your bet has been returned.", embed=None if message else embed)
             return
         
         # Add bet information
         embed.add_field(name="Bet", value=f"${bet_amount:,}", inline=True)
         
-        # Update the message
-        await message.edit(content=None, embed=embed)
+        # Update the message; in fast mode the result goes out with the bet result instead
+        if message:
+            await self.bot.outbound.edit(message, content=None, embed=embed)
         
         # Process bet result
-        await self.process_bet_result(ctx, bet_amount, "RPS", won)
+        await self.process_bet_result(ctx, bet_amount, "RPS", won, reveal=None if message else embed)
     
     @commands.hybrid_command(name="blackjack", aliases=["bj", "21"])
     @app_commands.describe(bet="Amount to bet")
     async def blackjack(self, ctx, bet: str):
         """Play a game of Blackjack against the dealer!"""
         # Check if already in a game
-        if ctx.author.id in self.games_in_progress:
+        if await self.sessions.is_playing(ctx.author.id):
             return await ctx.send("You are already in a game! Finish it before starting a new one.")
         
         # Get user's cash
@@ -416,71 +640,15 @@ class GamblingCommands(commands.Cog):
         if not valid:
             return await ctx.send(message)
         
-        # Mark user as in game
-        self.games_in_progress[ctx.author.id] = "blackjack"
-        
-        # Create a deck
-        deck = []
-        for suit in CARD_SUITS:
-            for value in CARD_VALUES:
-                deck.append({"suit": suit, "value": value})
-        random.shuffle(deck)
-        
-        # Deal initial cards
-        player_hand = [deck.pop(), deck.pop()]
-        dealer_hand = [deck.pop(), deck.pop()]
-        
-        # Calculate hand values
-        def calculate_hand_value(hand):
-            value = 0
-            aces = 0
-            
-            for card in hand:
-                if card["value"] in ["J", "Q", "K"]:
-                    value += 10
-                elif card["value"] == "A":
-                    aces += 1
-                    value += 11
-                else:
-                    value += int(card["value"])
-            
-            # Adjust for aces
-            while value > 21 and aces > 0:
-                value -= 10
-                aces -= 1
-                
-            return value
-        
-        # Format cards for display
-        def format_card(card, hidden=False):
-            if hidden:
-                return "🂠"
-                
-            value = card["value"]
-            suit = card["suit"]
-            
-            # Get emoji for card
-            if suit == "♥️":
-                color = "red"
-            elif suit == "♦️":
-                color = "red"
-            else:
-                color = "black"
-                
-            return f"{value}{suit}"
-        
-        def format_hand(hand, hide_second=False):
-            formatted = []
-            for i, card in enumerate(hand):
-                if i == 1 and hide_second:
-                    formatted.append(format_card(card, hidden=True))
-                else:
-                    formatted.append(format_card(card))
-            return " ".join(formatted)
+        # Deal initial cards from this channel's shoe
+        shoe = self.get_shoe(ctx.channel.id)
+        shoe.start_hand()
+        player_hand = [shoe.draw(), shoe.draw()]
+        dealer_hand = [shoe.draw(), shoe.draw()]
         
         # Show initial hands
-        player_value = calculate_hand_value(player_hand)
-        dealer_value = calculate_hand_value([dealer_hand[0]])  # Only count visible card
+        player_value = hand_value(player_hand)
+        dealer_value = hand_value(dealer_hand[:1])  # Only count visible card
         
         # Create initial embed
         embed = EmbedBuilder.info(
@@ -489,185 +657,237 @@ class GamblingCommands(commands.Cog):
         )
         
         embed.add_field(name="Bet", value=f"${bet_amount:,}", inline=True)
-        embed.add_field(name="Actions", value="Type **hit** or **stand**", inline=True)
-        
-        game_message = await ctx.send(embed=embed)
-        
-        # Check for natural blackjack
-        if player_value == 21:
-            dealer_full_value = calculate_hand_value(dealer_hand)
-            if dealer_full_value == 21:
-                # Both have blackjack - it's a push (tie)
-                embed = EmbedBuilder.info(
-                    title="Blackjack - Push!",
-                    description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {dealer_full_value})\n\nBoth you and the dealer have Blackjack! It's a push (tie)."
-                )
-                await game_message.edit(embed=embed)
-                del self.games_in_progress[ctx.author.id]
-                return
-            else:
-                # Player has natural blackjack - pays 3:2
-                win_amount = int(bet_amount * 1.5)
-                
-                embed = EmbedBuilder.success(
-                    title="Blackjack - You Win!",
-                    description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {dealer_full_value})\n\nYou got a natural Blackjack! You win ${win_amount:,}!"
-                )
-                
-                await game_message.edit(embed=embed)
-                
-                # Process win with 1.5x multiplier
-                await self.process_bet_result(ctx, bet_amount, "Blackjack", True, multiplier=1.5)
-                del self.games_in_progress[ctx.author.id]
-                return
-        
-        # Game loop
-        def check(message):
-            return (
-                message.author == ctx.author and
-                message.channel == ctx.channel and
-                message.content.lower() in ["hit", "h", "stand", "s"]
-            )
+        embed.add_field(name="Actions", value="Press **Hit** or **Stand**", inline=True)
+        
+        # Hit/Stand buttons are routed back to this game by its session key
+        natural = is_natural(player_hand) or is_natural(dealer_hand)
+        game_id = f"bj:{ctx.message.id}"
+        buttons = RoutedView(game_id, [
+            ("hit", "Hit", discord.ButtonStyle.primary),
+            ("stand", "Stand", discord.ButtonStyle.secondary)
+        ])
+        
+        # Take the player before the hand starts, so two commands can't both deal them in
+        if not await self.sessions.claim(ctx.author.id, game_id):
+            return await ctx.send("You are already in a game! Finish it before starting a new one.")
         
-        game_over = False
-        while not game_over:
-            try:
-                player_action = await self.bot.wait_for("message", check=check, timeout=60.0)
-                
-                action = player_action.content.lower()
+        # Track the hand as a session so it survives a restart and always releases the player
+        state = {"p": player_hand, "d": dealer_hand}
+        async with self.sessions.open(game_id, "blackjack", [ctx.author.id], ctx.channel.id, bet_amount, state) as game:
+            game_message = await ctx.send(embed=embed, view=None if natural else buttons)
+            
+            # Check for natural blackjack on either side
+            if natural:
+                dealer_full_value = hand_value(dealer_hand)
+                outcome = settle(player_hand, dealer_hand)
+                hands = f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {dealer_full_value})"
                 
-                if action in ["hit", "h"]:
-                    # Deal another card to player
-                    player_hand.append(deck.pop())
-                    player_value = calculate_hand_value(player_hand)
-                    
-                    # Update embed
+                if outcome == PUSH:
+                    # Both have blackjack - it's a push (tie)
                     embed = EmbedBuilder.info(
-                        title="Blackjack - Hit",
-                        description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand, hide_second=True)} (Showing: {dealer_value})"
+                        title="Blackjack - Push!",
+                        description=f"{hands}\n\nBoth you and the dealer have Blackjack! It's a push (tie)."
                     )
+                    await self.bot.outbound.edit(game_message, embed=embed)
+                elif outcome == BLACKJACK:
+                    # Player has natural blackjack - pays 3:2
+                    win_amount = int(bet_amount * PAYOUTS[BLACKJACK])
                     
-                    embed.add_field(name="Bet", value=f"${bet_amount:,}", inline=True)
+                    embed = EmbedBuilder.success(
+                        title="Blackjack - You Win!",
+                        description=f"{hands}\n\nYou got a natural Blackjack! You win ${win_amount:,}!"
+                    )
                     
-                    if player_value > 21:
-                        # Player busts
-                        embed = EmbedBuilder.error(
-                            title="Blackjack - Bust!",
-                            description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {calculate_hand_value(dealer_hand)})\n\nYou bust! Dealer wins."
-                        )
-                        await game_message.edit(embed=embed)
-                        
-                        # Process loss
-                        await self.process_bet_result(ctx, bet_amount, "Blackjack", False)
-                        game_over = True
-                    elif player_value == 21:
-                        # Player has 21, automatically stand
-                        embed.add_field(name="Actions", value="You have 21! Standing automatically.", inline=True)
-                        await game_message.edit(embed=embed)
-                        
-                        # Continue to dealer's turn
-                        action = "stand"
-                    else:
-                        embed.add_field(name="Actions", value="Type **hit** or **stand**", inline=True)
-                        await game_message.edit(embed=embed)
-                
-                if action in ["stand", "s"]:
-                    # Dealer's turn
-                    dealer_full_value = calculate_hand_value(dealer_hand)
+                    await self.bot.outbound.edit(game_message, embed=embed)
                     
-                    # Reveal dealer's hand
-                    embed = EmbedBuilder.info(
-                        title="Blackjack - Dealer's Turn",
-                        description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {dealer_full_value})"
+                    # Process win with 1.5x multiplier
+                    await self.process_bet_result(ctx, bet_amount, "Blackjack", True, win_amount=win_amount, multiplier=PAYOUTS[BLACKJACK])
+                else:
+                    # Dealer has natural blackjack
+                    embed = EmbedBuilder.error(
+                        title="Blackjack - Dealer Blackjack",
+                        description=f"{hands}\n\nThe dealer has Blackjack! You lose."
                     )
                     
-                    embed.add_field(name="Bet", value=f"${bet_amount:,}", inline=True)
-                    embed.add_field(name="Status", value="Dealer is playing...", inline=True)
+                    await self.bot.outbound.edit(game_message, embed=embed)
                     
-                    await game_message.edit(embed=embed)
-                    await asyncio.sleep(1)
+                    # Process loss
+                    await self.process_bet_result(ctx, bet_amount, "Blackjack", False)
                     
-                    # Dealer hits until 17 or higher
-                    while dealer_full_value < 17:
-                        dealer_hand.append(deck.pop())
-                        dealer_full_value = calculate_hand_value(dealer_hand)
+                return
+                
+            await game.save(message_id=game_message.id)
+            await self.play_blackjack(game, ctx.channel, game_message)
+    
+    async def play_blackjack(self, game, channel, game_message):
+        """Play out a Blackjack hand from its session state until it is settled"""
+        user_id = game.user_ids[0]
+        bet_amount = game.bet_amount
+        player_hand = game.state["p"]
+        dealer_hand = game.state["d"]
+        player_value = hand_value(player_hand)
+        dealer_value = hand_value(dealer_hand[:1])  # Only count visible card
+        shoe = self.get_shoe(channel.id)
+        fast = self.bot.fast_mode.is_fast(channel.guild.id if channel.guild else None, user_id)
+        
+        # Game loop
+        game_over = False
+        with self.bot.router.components_for(game.key, {user_id}) as clicks:
+            while not game_over:
+                try:
+                    interaction, action = await clicks.get(timeout=60.0)
+                    
+                    # Acknowledge the click; the game message is edited below
+                    await interaction.response.defer()
+                    
+                    if action == "hit":
+                        # Deal another card to player
+                        player_hand.append(shoe.draw())
+                        player_value = hand_value(player_hand)
+                        await game.save()
                         
                         # Update embed
                         embed = EmbedBuilder.info(
-                            title="Blackjack - Dealer's Turn",
-                            description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {dealer_full_value})"
+                            title="Blackjack - Hit",
+                            description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand, hide_second=True)} (Showing: {dealer_value})"
                         )
                         
                         embed.add_field(name="Bet", value=f"${bet_amount:,}", inline=True)
-                        embed.add_field(name="Status", value="Dealer is playing...", inline=True)
                         
-                        await game_message.edit(embed=embed)
-                        await asyncio.sleep(1)
-                    
-                    # Determine winner
-                    if dealer_full_value > 21:
-                        # Dealer busts
-                        embed = EmbedBuilder.success(
-                            title="Blackjack - You Win!",
-                            description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {dealer_full_value})\n\nDealer busts! You win!"
-                        )
-                        
-                        await game_message.edit(embed=embed)
+                        if player_value > 21:
+                            # Player busts
+                            embed = EmbedBuilder.error(
+                                title="Blackjack - Bust!",
+                                description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {hand_value(dealer_hand)})\n\nYou bust! Dealer wins."
+                            )
+                            await self.bot.outbound.edit(game_message, embed=embed, view=None)
+                            
+                            # Process loss
+                            await self.send_bet_result(channel, user_id, bet_amount, "Blackjack", False)
+                            game_over = True
+                        elif player_value == 21:
+                            # Player has 21, automatically stand
+                            embed.add_field(name="Actions", value="You have 21! Standing automatically.", inline=True)
+                            await self.bot.outbound.edit(game_message, embed=embed, view=None)
+                            
+                            # Continue to dealer's turn
+                            action = "stand"
+                        else:
+                            embed.add_field(name="Actions", value="Press **Hit** or **Stand**", inline=True)
+                            await self.bot.outbound.edit(game_message, embed=embed)
+                            
+                    if action == "stand":
+                        # Dealer's turn
+                        dealer_full_value = hand_value(dealer_hand)
                         
-                        # Process win
-                        await self.process_bet_result(ctx, bet_amount, "Blackjack", True)
-                    elif dealer_full_value > player_value:
-                        # Dealer wins
-                        embed = EmbedBuilder.error(
-                            title="Blackjack - Dealer Wins",
-                            description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {dealer_full_value})\n\nDealer has higher value. You lose!"
+                        # Reveal dealer's hand
+                        embed = EmbedBuilder.info(
+                            title="Blackjack - Dealer's Turn",
+                            description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {dealer_full_value})"
                         )
                         
-                        await game_message.edit(embed=embed)
+                        embed.add_field(name="Bet", value=f"${bet_amount:,}", inline=True)
+                        embed.add_field(name="Status", value="Dealer is playing...", inline=True)
                         
-                        # Process loss
-                        await self.process_bet_result(ctx, bet_amount, "Blackjack", False)
-                    elif dealer_full_value < player_value:
-                        # Player wins
-                        embed = EmbedBuilder.success(
-                            title="Blackjack - You Win!",
-                            description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {dealer_full_value})\n\nYou have higher value. You win!"
-                        )
+                        # Fast mode skips straight to the settled hand, saving an edit and a second per step
+                        skipped = 1
+                        if not fast:
+                            await self.bot.outbound.edit(game_message, embed=embed, view=None)
+                            await asyncio.sleep(1)
                         
-                        await game_message.edit(embed=embed)
+                        # Dealer hits until 17 or higher
+                        while dealer_full_value < 17:
+                            dealer_hand.append(shoe.draw())
+                            dealer_full_value = hand_value(dealer_hand)
+                            if fast:
+                                skipped += 1
+                                continue
+                            
+                            # Update embed
+                            embed = EmbedBuilder.info(
+                                title="Blackjack - Dealer's Turn",
+                                description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {dealer_full_value})"
+                            )
+                            
+                            embed.add_field(name="Bet", value=f"${bet_amount:,}", inline=True)
+                            embed.add_field(name="Status", value="Dealer is playing...", inline=True)
+                            
+                            await self.bot.outbound.edit(game_message, embed=embed)
+                            await asyncio.sleep(1)
                         
-                        # Process win
-                        await self.process_bet_result(ctx, bet_amount, "Blackjack", True)
-                    else:
-                        # Push (tie)
-                        embed = EmbedBuilder.info(
-                            title="Blackjack - Push!",
-                            description=f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {dealer_full_value})\n\nIt's a tie! Your bet is returned."
-                        )
+                        if fast:
+                            metrics.incr("fast_mode.plays")
+                            metrics.incr("fast_mode.rest_calls_saved", skipped)
+                            metrics.incr("fast_mode.seconds_saved", skipped)
+                        
+                        # Determine winner
+                        outcome = settle(player_hand, dealer_hand)
+                        hands = f"**Your hand:** {format_hand(player_hand)} (Value: {player_value})\n**Dealer's hand:** {format_hand(dealer_hand)} (Value: {dealer_full_value})"
                         
-                        await game_message.edit(embed=embed)
+                        if outcome == WIN:
+                            if dealer_full_value > 21:
+                                result_text = "Dealer busts! You win!"
+                            else:
+                                result_text = "You have higher value. You win!"
+                                
+                            embed = EmbedBuilder.success(
+                                title="Blackjack - You Win!",
+                                description=f"{hands}\n\n{result_text}"
+                            )
+                            
+                            await self.bot.outbound.edit(game_message, embed=embed, view=None)
+                            
+                            # Process win at 1:1
+                            await self.send_bet_result(channel, user_id, bet_amount, "Blackjack", True, win_amount=int(bet_amount * PAYOUTS[WIN]))
+                        elif outcome == LOSS:
+                            # Dealer wins
+                            embed = EmbedBuilder.error(
+                                title="Blackjack - Dealer Wins",
+                                description=f"{hands}\n\nDealer has higher value. You lose!"
+                            )
+                            
+                            await self.bot.outbound.edit(game_message, embed=embed, view=None)
+                            
+                            # Process loss
+                            await self.send_bet_result(channel, user_id, bet_amount, "Blackjack", False)
+                        else:
+                            # Push (tie)
+                            embed = EmbedBuilder.info(
+                                title="Blackjack - Push!",
+                                description=f"{hands}\n\nIt's a tie! Your bet is returned."
+                            )
+                            
+                            await self.bot.outbound.edit(game_message, embed=embed, view=None)
+                            
+                            # No win/loss for a push
+                            await self.bot.outbound.send(channel, "It's a push (tie)! Your bet has been returned.")
                         
-                        # No win/loss for a push
-                        await ctx.send("It's a push (tie)! Your bet has been returned.")
+                        game_over = True
                     
+                except asyncio.TimeoutError:
+                    # Player took too long
+                    embed = EmbedBuilder.error(
+                        title="Blackjack - Timeout",
+                        description="You took too long to respond! Game cancelled."
+                    )
+                    await self.bot.outbound.edit(game_message, embed=embed, view=None)
                     game_over = True
-                
-            except asyncio.TimeoutError:
-                # Player took too long
-                embed = EmbedBuilder.error(
-                    title="Blackjack - Timeout",
-                    description="You took too long to respond! Game cancelled."
-                )
-                await game_message.edit(embed=embed)
-                game_over = True
-        
-        # Remove from active games
-        del self.games_in_progress[ctx.author.id]
     
-    @commands.hybrid_command(name="roulette", aliases=["r"])
-    @app_commands.describe(bet="Amount to bet", choice="Number, color, or bet type")
-    async def roulette(self, ctx, bet: str, choice: str):
-        """Bet on a roulette wheel spin!"""
+    @commands.hybrid_command(name="bjtable", aliases=["bjt", "table"])
+    @app_commands.describe(bet="Amount to bet each hand")
+    async def bjtable(self, ctx, bet: str):
+        """Sit down at this channel's multiplayer Blackjack table!"""
+        # Check if command is used in a guild
+        if not ctx.guild:
+            return await ctx.send("This command can only be used in a server!")
+            
+        table = self.bj_tables.get(ctx.channel.id)
+        seated = table is not None and (ctx.author.id in table.seats or ctx.author.id in table.waiting)
+        
+        # Check if already in another game
+        if await self.sessions.is_playing(ctx.author.id) and not seated:
+            return await ctx.send("You are already in a game! Finish it before starting a new one.")
+        
         # Get user's cash
         async with get_session() as session:
             user = await session.get(User, ctx.author.id)
@@ -678,163 +898,906 @@ class GamblingCommands(commands.Cog):
         bet_amount = parse_amount(bet, user.cash)
         if not bet_amount:
             return await ctx.send("Please enter a valid bet amount!")
-            
+        
         # Validate bet
         valid, message = self.is_valid_bet(user.cash, bet_amount)
         if not valid:
             return await ctx.send(message)
         
-        # Validate choice
-        choice = choice.lower()
-        
-        # Define valid bets and their payouts
-        red_numbers = [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36]
-        black_numbers = [2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35]
-        
-        # Check bet type
-        if choice in ["red", "r"]:
-            bet_type = "color"
-            bet_value = "red"
-            payout = 2  # 1:1 payout
-        elif choice in ["black", "b"]:
-            bet_type = "color"
-            bet_value = "black"
-            payout = 2  # 1:1 payout
-        elif choice in ["green", "g", "0"]:
-            bet_type = "green"
-            bet_value = 0
-            payout = 36  # 35:1 payout
-        elif choice in ["even", "e"]:
-            bet_type = "even_odd"
-            bet_value = "even"
-            payout = 2  # 1:1 payout
-        elif choice in ["odd", "o"]:
-            bet_type = "even_odd"
-            bet_value = "odd"
-            payout = 2  # 1:1 payout
-        elif choice in ["1-18", "low", "l"]:
-            bet_type = "half"
-            bet_value = "low"
-            payout = 2  # 1:1 payout
-        elif choice in ["19-36", "high", "h"]:
-            bet_type = "half"
-            bet_value = "high"
-            payout = 2  # 1:1 payout
-        elif choice in ["1-12", "first12", "1st12", "first dozen"]:
-            bet_type = "dozen"
-            bet_value = "first"
-            payout = 3  # 2:1 payout
-        elif choice in ["13-24", "second12", "2nd12", "second dozen"]:
-            bet_type = "dozen"
-            bet_value = "second"
-            payout = 3  # 2:1 payout
-        elif choice in ["25-36", "third12", "3rd12", "third dozen"]:
-            bet_type = "dozen"
-            bet_value = "third"
-            payout = 3  # 2:1 payout
+        # Take the player before they sit, so two commands can't seat them in two games
+        if not seated:
+            if not await self.sessions.claim(ctx.author.id, "blackjack_table"):
+                return await ctx.send("You are already in a game! Finish it before starting a new one.")
+            table = self.bj_tables.get(ctx.channel.id)
+        
+        # Open a table for this channel if there isn't one
+        opened = table is None
+        if opened:
+            table = BlackjackTable(self.get_shoe(ctx.channel.id), config.BLACKJACK_TABLE_SEATS)
+            self.bj_tables[ctx.channel.id] = table
+            
+        error = table.sit(ctx.author.id, ctx.author.display_name, bet_amount)
+        if error:
+            if not seated:
+                self.games_in_progress.pop(ctx.author.id, None)
+            return await ctx.send(error)
+            
+        if opened:
+            embed = EmbedBuilder.info(
+                title="Blackjack Table Open",
+                description=f"{ctx.author.display_name} opened a Blackjack table! The first hand is dealt in {config.BLACKJACK_TABLE_JOIN_WINDOW} seconds."
+            )
+            embed.add_field(name="Join", value=f"`{config.DEFAULT_PREFIX}bjtable <bet>`", inline=True)
+            embed.add_field(name="Leave", value=f"`{config.DEFAULT_PREFIX}bjleave`", inline=True)
+            embed.add_field(name="Seats", value=str(table.max_seats), inline=True)
+            await ctx.send(embed=embed)
+            
+            self.bot.loop.create_task(self.run_blackjack_table(ctx.channel, table))
+        elif seated:
+            await ctx.send(f"{ctx.author.display_name}, your bet is now ${bet_amount:,} per hand.")
+        elif table.in_hand:
+            await ctx.send(f"{ctx.author.display_name} sat down with ${bet_amount:,}. You'll be dealt in next hand!")
         else:
-            # Try to parse as a number
-            try:
-                number = int(choice)
-                if 0 <= number <= 36:
-                    bet_type = "number"
-                    bet_value = number
-                    payout = 36  # 35:1 payout
+            await ctx.send(f"{ctx.author.display_name} sat down with ${bet_amount:,}!")
+    
+    @commands.hybrid_command(name="bjleave", aliases=["bjl"])
+    async def bjleave(self, ctx):
+        """Leave this channel's multiplayer Blackjack table"""
+        table = self.bj_tables.get(ctx.channel.id)
+        if not table or not table.leave(ctx.author.id):
+            return await ctx.send("You aren't sitting at a Blackjack table in this channel!")
+            
+        if table.in_hand and ctx.author.id in table.seats:
+            await ctx.send(f"{ctx.author.display_name} will leave the table after this hand.")
+        else:
+            self.games_in_progress.pop(ctx.author.id, None)
+            await ctx.send(f"{ctx.author.display_name} left the table.")
+    
+    def build_table_embed(self, table, results=None, balances=None):
+        """Render the whole table state as a single embed"""
+        if results is None:
+            dealer_value = hand_value(table.dealer[:1])
+            dealer_line = f"{format_hand(table.dealer, hide_second=True)} (Showing: {dealer_value})"
+        else:
+            dealer_line = f"{format_hand(table.dealer)} (Value: {hand_value(table.dealer)})"
+            
+        embed = EmbedBuilder.info(
+            title=f"Blackjack Table - Hand #{table.hands_played}",
+            description=f"**Dealer's hand:** {dealer_line}"
+        )
+        
+        outcomes = {user_id: (net, outcome) for user_id, bet, net, outcome in results or []}
+        
+        for seat in list(table.seats.values()) + [seat for seat in table.waiting.values()]:
+            if not seat.cards:
+                status = "Joining next hand"
+                hand_text = "-"
+            else:
+                hand_text = f"{format_hand(seat.cards)} ({seat.value})"
+                if seat.user_id in outcomes:
+                    net, outcome = outcomes[seat.user_id]
+                    if net > 0:
+                        status = f"{outcome.capitalize()}! +${net:,}"
+                    elif net < 0:
+                        status = f"Loss -${-net:,}"
+                    else:
+                        status = "Push"
+                    if balances and seat.user_id in balances:
+                        status += f" (Balance: ${balances[seat.user_id]:,})"
+                elif seat.value > 21:
+                    status = "Bust"
+                elif seat.state == NATURAL_STATE:
+                    status = "Blackjack!"
+                elif seat.done:
+                    status = "Standing"
+                elif seat.user_id in table.pending:
+                    status = "Action locked in"
                 else:
-                    return await ctx.send("Please choose a valid bet: a number from 0-36, 'red', 'black', 'even', 'odd', '1-18', '19-36', etc.")
-            except ValueError:
-                return await ctx.send("Please choose a valid bet: a number from 0-36, 'red', 'black', 'even', 'odd', '1-18', '19-36', etc.")
+                    status = "Type **hit** or **stand**"
+                    
+            embed.add_field(
+                name=f"{seat.name} (${seat.bet:,})",
+                value=f"{hand_text}\n{status}",
+                inline=True
+            )
+            
+        if results is None:
+            embed.set_footer(text=f"Everyone acts at once - {config.BLACKJACK_TABLE_ACTION_TIMEOUT}s per round. No action means stand.")
+        else:
+            embed.set_footer(text=f"Next hand in {config.BLACKJACK_TABLE_JOIN_WINDOW}s. Use {config.DEFAULT_PREFIX}bjleave to leave.")
+            
+        return embed
+    
+    async def collect_table_actions(self, channel, table):
+        """Collect hit/stand actions until every active seat has acted or time runs out"""
+        def accept(message):
+            return message.content.lower() in ["hit", "h", "stand", "s"]
+            
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + config.BLACKJACK_TABLE_ACTION_TIMEOUT
+        
+        with self.bot.router.replies_from(channel.id, [seat.user_id for seat in table.active_seats], accept) as replies:
+            while not table.round_complete:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                    
+                try:
+                    message = await replies.get(remaining)
+                except asyncio.TimeoutError:
+                    break
+                    
+                action = HIT if message.content.lower() in ["hit", "h"] else STAND
+                table.queue_action(message.author.id, action)
+    
+    async def run_blackjack_table(self, channel, table):
+        """Deal hands at a multiplayer table until everyone has left
+        
+        Every stake is taken before the deal, each action round is rendered with
+        one message edit and each hand is settled for every seat in one database
+        transaction.
+        """
+        hand_key = None  # Stakes for the hand being played are held under this
+        try:
+            await asyncio.sleep(config.BLACKJACK_TABLE_JOIN_WINDOW)
+            
+            while table.seats or table.waiting:
+                # Take the stakes, unseating idle players and anyone who can no longer cover their bet
+                seats = {**table.seats, **table.waiting}
+                stakes = {
+                    user_id: seat.bet for user_id, seat in seats.items()
+                    if seat.missed < config.BLACKJACK_TABLE_MAX_MISSED
+                }
+                hand_key = self.round_key("bjtable", channel.id)
+                held = await self.economy.hold_stakes("Blackjack", stakes, hand_key, channel.id)
+                removed = []
+                for user_id, seat in seats.items():
+                    if user_id not in held:
+                        table.leave(user_id)
+                        self.games_in_progress.pop(user_id, None)
+                        removed.append(seat.name)
+                
+                # Anyone who sat down or changed their bet while the stakes were taken sits this hand out
+                sitting_out = {}
+                for group in (table.seats, table.waiting):
+                    for user_id in [user_id for user_id, seat in group.items() if user_id not in held or seat.bet != stakes[user_id]]:
+                        sitting_out[user_id] = group.pop(user_id)
+                playing = {**table.seats, **table.waiting}
+                returned = [user_id for user_id in held if user_id not in playing]
+                if playing:
+                    table.deal()
+                table.waiting.update(sitting_out)
+                self.games_in_progress.refresh(list(table.seats) + list(table.waiting))
+                
+                if returned:
+                    await self.economy.return_stakes(hand_key, returned)
+                if removed:
+                    await self.bot.outbound.send(channel, f"Removed from the Blackjack table: {', '.join(removed)}")
+                    
+                if not playing:
+                    continue
+                
+                # Play the hand in rounds
+                table_message = await self.bot.outbound.send(channel, embed=self.build_table_embed(table))
+                
+                while table.active_seats:
+                    await self.collect_table_actions(channel, table)
+                    table.apply_actions()
+                    if table.active_seats:
+                        await self.bot.outbound.edit(table_message, embed=self.build_table_embed(table))
+                
+                # Dealer plays and every seat is settled together
+                results = table.finish()
+                balances = await self.economy.settle_bets(
+                    "Blackjack",
+                    [(user_id, bet, net) for user_id, bet, net, outcome in results],
+                    round_key=hand_key
+                )
+                await self.bot.outbound.edit(table_message, embed=self.build_table_embed(table, results, balances))
+                
+                # Release players who left during the hand
+                for user_id, bet, net, outcome in results:
+                    if user_id not in table.seats:
+                        self.games_in_progress.pop(user_id, None)
+                        
+                await asyncio.sleep(config.BLACKJACK_TABLE_JOIN_WINDOW)
+        finally:
+            # Close the table, giving back the stakes of a hand that never finished
+            if hand_key:
+                await self.economy.return_stakes(hand_key)
+            for user_id in list(table.seats) + list(table.waiting):
+                self.games_in_progress.pop(user_id, None)
+            if self.bj_tables.get(channel.id) is table:
+                del self.bj_tables[channel.id]
+                
+        await self.bot.outbound.send(channel, "The Blackjack table has closed.")
+    
+    @commands.hybrid_command(name="roulette", aliases=["r"])
+    @app_commands.describe(
+        bet="Amount to bet",
+        choice="Number, color, or bet type",
+        more_bets="Extra bets on the same spin as 'amount choice' pairs, e.g. 100 red 50 17 25 1/2"
+    )
+    async def roulette(self, ctx, bet: str, choice: str, *, more_bets: str = None):
+        """Bet on a roulette wheel spin! Place several bets on one spin with extra amount/choice pairs."""
+        # Get user's cash
+        async with get_session() as session:
+            user = await session.get(User, ctx.author.id)
+            if not user:
+                user = await self.economy.get_user(ctx.author.id)
         
-        # Send initial message
-        message = await ctx.send("🎡 Spinning the roulette wheel...")
+        # Bets go on the shared table if one is open in this channel
+        table = self.roulette_tables.get(ctx.channel.id)
         
-        # Add suspense
-        await asyncio.sleep(2)
+        # Collect all bets as (amount, choice) pairs
+        tokens = [bet, choice] + (more_bets.split() if more_bets else [])
+        if len(tokens) % 2 != 0:
+            return await ctx.send("Each bet needs an amount and a choice, e.g. `100 red 50 17`.")
+            
+        pairs = list(zip(tokens[0::2], tokens[1::2]))
+        if len(pairs) > config.ROULETTE_MAX_BETS:
+            return await ctx.send(f"You can place at most {config.ROULETTE_MAX_BETS} bets per spin!")
+        
+        # Parse and validate each bet against the cash left after the previous ones
+        bets = []
+        # Stakes already on a table were taken from the balance when they were placed
+        available_cash = user.cash
+        remaining_cash = available_cash
+        for amount_str, choice_str in pairs:
+            bet_key = lookup_bet(choice_str)
+            if bet_key is None:
+                return await ctx.send(
+                    f"`{choice_str}` isn't a valid bet. Choose a number from 0-36, 'red', 'black', 'even', 'odd', "
+                    "'1-18', '19-36', '1-12', 'col1', a split like '1/2', a street like '1/2/3' or a corner like '1/2/4/5'."
+                )
+                
+            bet_amount = parse_amount(amount_str, remaining_cash)
+            if not bet_amount:
+                return await ctx.send("Please enter a valid bet amount!")
+                
+            valid, message = self.is_valid_bet(remaining_cash, bet_amount)
+            if not valid:
+                return await ctx.send(message)
+                
+            bets.append((bet_key, bet_amount))
+            remaining_cash -= bet_amount
+        
+        total_bet = available_cash - remaining_cash
+        
+        if table:
+            # Take the stake as the bets are placed, giving it back if the table won't take them
+            if not await self.economy.hold_stakes("Roulette", {ctx.author.id: total_bet}, table.key, ctx.channel.id):
+                return await ctx.send("You don't have enough cash for those bets!")
+            error = table.add_bets(ctx.author.id, ctx.author.display_name, bets)
+            if error:
+                await self.economy.return_stakes(table.key, [ctx.author.id])
+                return await ctx.send(error)
+                
+            placed = ", ".join(f"{bet_label(bet_key)} ${bet_amount:,}" for bet_key, bet_amount in bets)
+            return await ctx.send(f"🎡 {ctx.author.display_name} placed {placed} on the table spin.")
         
-        # Spin the wheel
-        result = random.randint(0, 36)
+        # Take the stake before the wheel spins, so nothing spent meanwhile can leave the spin unpaid
+        spin_key = self.round_key("roulette", ctx.channel.id)
+        if not await self.economy.hold_stakes("Roulette", {ctx.author.id: total_bet}, spin_key, ctx.channel.id):
+            return await ctx.send("You don't have enough cash for those bets!")
         
-        # Determine result color
-        if result == 0:
-            result_color = "green"
-        elif result in red_numbers:
-            result_color = "red"
-        else:
-            result_color = "black"
-            
-        # Check if player won
-        won = False
-        
-        if bet_type == "color":
-            won = bet_value == result_color
-        elif bet_type == "green":
-            won = result == 0
-        elif bet_type == "number":
-            won = bet_value == result
-        elif bet_type == "even_odd":
-            if result == 0:
-                won = False
-            elif bet_value == "even":
-                won = result % 2 == 0
-            else:  # odd
-                won = result % 2 == 1
-        elif bet_type == "half":
-            if result == 0:
-                won = False
-            elif bet_value == "low":
-                won = 1 <= result <= 18
-            else:  # high
-                won = 19 <= result <= 36
-        elif bet_type == "dozen":
-            if result == 0:
-                won = False
-            elif bet_value == "first":
-                won = 1 <= result <= 12
-            elif bet_value == "second":
-                won = 13 <= result <= 24
-            else:  # third
-                won = 25 <= result <= 36
-        
-        # Format result color for display
-        if result_color == "red":
-            result_display = f"🔴 {result}"
-        elif result_color == "black":
-            result_display = f"⚫ {result}"
-        else:  # green
-            result_display = f"🟢 {result}"
+        try:
+            # Send initial message and add suspense, unless the player wants fast results
+            message = await suspense(ctx, "🎡 Spinning the roulette wheel...", 2, combined=False)
             
+            # Spin the wheel once and resolve every bet by bit test
+            result = spin()
+            resolved, net = resolve(bets, result)
+            
+            # Pay out the whole spin as one ledger entry
+            balances = await self.economy.settle_bets("Roulette", [(ctx.author.id, total_bet, net)], round_key=spin_key)
+        except BaseException:
+            await self.economy.return_stakes(spin_key)
+            raise
+        new_balance = balances.get(ctx.author.id, user.cash + net)
+        
         # Create result embed
-        if won:
-            win_amount = bet_amount * payout - bet_amount
+        if net > 0:
             embed = EmbedBuilder.success(
                 title="Roulette Win!",
-                description=f"The ball landed on **{result_display}**!\nYou bet on **{choice}** and won ${win_amount:,}!"
+                description=f"The ball landed on **{NUMBER_TEXT[result]}**!\nYou won ${net:,}!"
             )
-        else:
+        elif net < 0:
             embed = EmbedBuilder.error(
                 title="Roulette Loss",
-                description=f"The ball landed on **{result_display}**!\nYou bet on **{choice}** and lost ${bet_amount:,}."
+                description=f"The ball landed on **{NUMBER_TEXT[result]}**!\nYou lost ${-net:,}."
+            )
+        else:
+            embed = EmbedBuilder.info(
+                title="Roulette - Break Even",
+                description=f"The ball landed on **{NUMBER_TEXT[result]}**!\nYour wins covered your losses."
             )
         
         # Add bet information
-        embed.add_field(name="Bet", value=f"${bet_amount:,}", inline=True)
+        lines = []
+        for bet_key, bet_amount, bet_net in resolved:
+            if bet_net > 0:
+                lines.append(f"✅ {bet_label(bet_key)}: ${bet_amount:,} → +${bet_net:,} ({bet_odds(bet_key)}:1)")
+            else:
+                lines.append(f"❌ {bet_label(bet_key)}: ${bet_amount:,}")
+        embed.add_field(name="Bets", value="\n".join(lines), inline=False)
+        embed.add_field(name="Total Bet", value=f"${total_bet:,}", inline=True)
+        embed.add_field(name="New Balance", value=f"${new_balance:,}", inline=True)
+        
+        # Update the message, or send the only message in fast mode
+        if message:
+            await self.bot.outbound.edit(message, content=None, embed=embed)
+        else:
+            await ctx.send(embed=embed)
+    
+    @commands.hybrid_command(name="roulettetable", aliases=["rtable", "rt"])
+    async def roulettetable(self, ctx):
+        """Open a shared roulette table where everyone in the channel bets on one spin!"""
+        # Check if command is used in a guild
+        if not ctx.guild:
+            return await ctx.send("This command can only be used in a server!")
+            
+        if ctx.channel.id in self.roulette_tables:
+            return await ctx.send("A roulette table is already taking bets in this channel!")
+            
+        table = RouletteTable(config.ROULETTE_MAX_BETS, self.round_key("roulette", ctx.channel.id))
+        self.roulette_tables[ctx.channel.id] = table
         
-        if won:
-            embed.add_field(name="Payout", value=f"{payout}:1", inline=True)
-            embed.add_field(name="Won", value=f"${win_amount:,}", inline=True)
+        closes_at = discord.utils.utcnow() + timedelta(seconds=config.ROULETTE_TABLE_WINDOW)
+        embed = EmbedBuilder.info(
+            title="Roulette Table Open",
+            description=f"{ctx.author.display_name} opened the roulette table! Betting closes {discord.utils.format_dt(closes_at, style='R')}."
+        )
+        embed.add_field(
+            name="How to Bet",
+            value=f"`{config.DEFAULT_PREFIX}roulette <amount> <choice> [<amount> <choice> ...]`",
+            inline=False
+        )
+        await ctx.send(embed=embed)
+        
+        self.bot.loop.create_task(self.run_roulette_table(ctx.channel, table))
+    
+    async def run_roulette_table(self, channel, table):
+        """Spin once for every bet placed at a table and announce all results together"""
+        try:
+            await asyncio.sleep(config.ROULETTE_TABLE_WINDOW)
+            
+            if not table.bets:
+                table.closed = True
+                return await channel.send("🎡 Nobody placed a bet, so the roulette table has closed.")
+                
+            result, results = table.spin()
+            
+            # Settle every player in one transaction
+            balances = await self.economy.settle_bets(
+                "Roulette",
+                [(user_id, total_bet, net) for user_id, total_bet, net, resolved in results],
+                round_key=table.key
+            )
+            
+            # Build one embed with everyone's results
+            embed = EmbedBuilder.info(
+                title="Roulette Table Results",
+                description=f"The ball landed on **{NUMBER_TEXT[result]}**!\n{table.player_count} player{'s' if table.player_count != 1 else ''} bet on this spin."
+            )
+            
+            lines = []
+            for user_id, total_bet, net, resolved in sorted(results, key=lambda r: r[2], reverse=True):
+                if net > 0:
+                    outcome = f"won ${net:,}"
+                elif net < 0:
+                    outcome = f"lost ${-net:,}"
+                else:
+                    outcome = "broke even"
+                balance = balances.get(user_id)
+                balance_text = f" (Balance: ${balance:,})" if balance is not None else ""
+                lines.append(f"**{table.names[user_id]}** bet ${total_bet:,} and {outcome}{balance_text}")
+            
+            # Pack the lines into as few fields as the embed limits allow
+            field_value = ""
+            fields = 0
+            for line in lines:
+                if len(field_value) + len(line) + 1 > 1024:
+                    embed.add_field(name="Results" if fields == 0 else "\u200b", value=field_value, inline=False)
+                    fields += 1
+                    field_value = ""
+                    if fields >= 24:
+                        break
+                field_value += line + "\n"
+            if field_value and fields < 25:
+                embed.add_field(name="Results" if fields == 0 else "\u200b", value=field_value, inline=False)
+                
+            await self.bot.outbound.send(channel, embed=embed)
+        finally:
+            table.closed = True
+            if self.roulette_tables.get(channel.id) is table:
+                del self.roulette_tables[channel.id]
+            # Give back any stakes the spin didn't settle
+            await self.economy.return_stakes(table.key)
+    
+    @commands.hybrid_command(name="crash", aliases=["rocket"])
+    @app_commands.describe(bet="Amount to bet", auto_cashout="Multiplier to cash out at automatically, e.g. 2x")
+    async def crash(self, ctx, bet: str, auto_cashout: str = None):
+        """Ride the rocket with everyone in the channel and cash out before it crashes!"""
+        # Check if command is used in a guild
+        if not ctx.guild:
+            return await ctx.send("This command can only be used in a server!")
+        
+        # Parse the auto cash out target
+        target = None
+        if auto_cashout:
+            try:
+                target = round(float(auto_cashout.lower().rstrip("x")), 2)
+            except ValueError:
+                return await ctx.send("Auto cash out must be a multiplier like `2x` or `1.5`!")
+            if target <= 1.0:
+                return await ctx.send("Auto cash out must be above 1.00x!")
         
-        # Update the message
-        await message.edit(content=None, embed=embed)
+        # Check if already in another game
+        if await self.sessions.is_playing(ctx.author.id):
+            return await ctx.send("You are already in a game! Finish it before starting a new one.")
         
-        # Process bet result
-        if won:
-            await self.process_bet_result(ctx, bet_amount, "Roulette", True, multiplier=payout-1)
+        # Get user's cash
+        async with get_session() as session:
+            user = await session.get(User, ctx.author.id)
+            if not user:
+                user = await self.economy.get_user(ctx.author.id)
+        
+        # Parse bet amount
+        bet_amount = parse_amount(bet, user.cash)
+        if not bet_amount:
+            return await ctx.send("Please enter a valid bet amount!")
+        
+        # Validate bet
+        valid, message = self.is_valid_bet(user.cash, bet_amount)
+        if not valid:
+            return await ctx.send(message)
+        
+        crash_round = self.crash_rounds.get(ctx.channel.id)
+        if crash_round and crash_round.phase != BETTING:
+            return await ctx.send("The rocket is already flying! Wait for it to crash and start the next round.")
+        
+        # Take the player for the round
+        if not await self.sessions.claim(ctx.author.id, "crash"):
+            return await ctx.send("You are already in a game! Finish it before starting a new one.")
+        
+        # Join the round taking bets in this channel, or open a new one; a round with no bets ends by itself
+        crash_round = self.crash_rounds.get(ctx.channel.id)
+        opened = crash_round is None
+        if opened:
+            point = generate_crash_point(random, config.CRASH_HOUSE_EDGE, config.CRASH_MAX_MULTIPLIER)
+            crash_round = CrashRound(point, config.CRASH_GROWTH, self.round_key("crash", ctx.channel.id))
+            self.crash_rounds[ctx.channel.id] = crash_round
+            self.bot.loop.create_task(self.run_crash_round(ctx.channel, crash_round))
+        
+        # Take the stake as the bet is placed
+        if not await self.economy.hold_stakes("Crash", {ctx.author.id: bet_amount}, crash_round.key, ctx.channel.id):
+            self.games_in_progress.pop(ctx.author.id, None)
+            return await ctx.send("You don't have enough cash for that bet!")
+            
+        error = crash_round.place_bet(ctx.author.id, ctx.author.display_name, bet_amount, target)
+        if error:
+            self.games_in_progress.pop(ctx.author.id, None)
+            await self.economy.return_stakes(crash_round.key, [ctx.author.id])
+            return await ctx.send(error)
+            
+        target_text = f" with auto cash out at {target:.2f}x" if target else ""
+        if not opened:
+            return await ctx.send(f"🚀 {ctx.author.display_name} bet ${bet_amount:,}{target_text}.")
+            
+        launches_at = discord.utils.utcnow() + timedelta(seconds=config.CRASH_BETTING_WINDOW)
+        embed = EmbedBuilder.info(
+            title="🚀 Crash Round Open",
+            description=f"{ctx.author.display_name} bet ${bet_amount:,}{target_text}! The rocket launches {discord.utils.format_dt(launches_at, style='R')}."
+        )
+        embed.add_field(
+            name="How to Play",
+            value=f"Join with `{config.DEFAULT_PREFIX}crash <amount> [auto cash out]`, then `{config.DEFAULT_PREFIX}cashout` before it crashes!",
+            inline=False
+        )
+        await ctx.send(embed=embed)
+    
+    @commands.hybrid_command(name="cashout", aliases=["co"])
+    async def cashout(self, ctx):
+        """Cash out of the crash round in this channel"""
+        crash_round = self.crash_rounds.get(ctx.channel.id)
+        if not crash_round or ctx.author.id not in crash_round.bets:
+            return await ctx.send("You don't have a bet in a crash round here!")
+            
+        multiplier = crash_round.cash_out(ctx.author.id, self.bot.loop.time())
+        if multiplier is None:
+            bet = crash_round.bets[ctx.author.id]
+            if bet.cashed_at is not None:
+                return await ctx.send(f"You already cashed out at {bet.cashed_at:.2f}x!")
+            if crash_round.phase == BETTING:
+                return await ctx.send("The rocket hasn't launched yet!")
+            return await ctx.send("Too late, the rocket already crashed! 💥")
+        
+        # Acknowledge quietly; the round message shows every cash out on its next render
+        if ctx.interaction:
+            await ctx.send(f"💸 Cashed out at {multiplier:.2f}x!", ephemeral=True)
         else:
-            await self.process_bet_result(ctx, bet_amount, "Roulette", False)
+            await ctx.message.add_reaction("💸")
+    
+    def build_crash_embed(self, crash_round, balances=None):
+        """Create the embed for a crash round in its current state"""
+        if crash_round.phase == CRASHED:
+            embed = EmbedBuilder.error(
+                title="💥 Crashed!",
+                description=f"The rocket crashed at **{crash_round.crash_point:.2f}x**!"
+            )
+        else:
+            embed = EmbedBuilder.info(
+                title="🚀 Rocket Flying",
+                description=f"Current multiplier: **{crash_round.multiplier:.2f}x**\nUse `{config.DEFAULT_PREFIX}cashout` before it crashes!"
+            )
+            
+        embed.add_field(name="Players", value=f"{len(crash_round.bets):,}", inline=True)
+        embed.add_field(name="Total Bet", value=f"${crash_round.total_wagered:,}", inline=True)
+        embed.add_field(name="Cashed Out", value=f"{crash_round.cashed_out:,}", inline=True)
+        
+        # Only list the best cash outs so the embed stays small with thousands of players
+        cashed = heapq.nlargest(
+            10,
+            (bet for bet in crash_round.bets.values() if bet.cashed_at is not None),
+            key=lambda bet: (bet.cashed_at, bet.amount)
+        )
+        if cashed:
+            lines = []
+            for bet in cashed:
+                balance = balances.get(bet.user_id) if balances else None
+                balance_text = f" (Balance: ${balance:,})" if balance is not None else ""
+                lines.append(f"**{bet.name}** {bet.cashed_at:.2f}x → +${bet.net:,}{balance_text}")
+            embed.add_field(name="Top Cash Outs", value="\n".join(lines), inline=False)
+            
+        if crash_round.phase == CRASHED:
+            busted = len(crash_round.bets) - crash_round.cashed_out
+            if busted:
+                lost = sum(bet.amount for bet in crash_round.bets.values() if bet.cashed_at is None)
+                embed.add_field(name="Went Down With The Rocket", value=f"{busted:,} player{'s' if busted != 1 else ''} lost ${lost:,}", inline=False)
+                
+        return embed
+    
+    async def run_crash_round(self, channel, crash_round):
+        """Run a crash round: take bets, fly the rocket with throttled renders and settle everyone at once"""
+        try:
+            await asyncio.sleep(config.CRASH_BETTING_WINDOW)
+            if not crash_round.bets:
+                return
+            
+            crash_round.start(self.bot.loop.time())
+            message = await self.bot.outbound.send(channel, embed=self.build_crash_embed(crash_round))
+            
+            # Ticks are cheap and run often; edits are coalesced so only the latest state is
+            # sent, at most once per render interval and never more than one in flight
+            rendered = crash_round.version
+            last_render = self.bot.loop.time()
+            render_task = None
+            while crash_round.tick(self.bot.loop.time()) == RUNNING:
+                now = self.bot.loop.time()
+                if (
+                    crash_round.version != rendered
+                    and now - last_render >= config.CRASH_RENDER_INTERVAL
+                    and (render_task is None or render_task.done())
+                ):
+                    rendered = crash_round.version
+                    last_render = now
+                    render_task = self.bot.outbound.edit(message, embed=self.build_crash_embed(crash_round))
+                await asyncio.sleep(config.CRASH_TICK)
+                
+            if render_task and not render_task.done():
+                await asyncio.gather(render_task, return_exceptions=True)
+            
+            # Settle every player in one transaction
+            balances = await self.economy.settle_bets("Crash", crash_round.results(), round_key=crash_round.key)
+            await self.bot.outbound.edit(message, embed=self.build_crash_embed(crash_round, balances))
+        finally:
+            if crash_round.phase == BETTING:
+                crash_round.phase = CRASHED  # Refuse late bets on a round that never launched
+            if self.crash_rounds.get(channel.id) is crash_round:
+                del self.crash_rounds[channel.id]
+            for user_id in crash_round.bets:
+                self.games_in_progress.pop(user_id, None)
+            # Give back any stakes the round didn't settle
+            await self.economy.return_stakes(crash_round.key)
+    
+    @commands.hybrid_command(name="holdem", aliases=["poker", "texas"])
+    @app_commands.describe(stake="Small bet for a new table (the big blind); leave empty to join the open table")
+    async def holdem(self, ctx, stake: str = None):
+        """Sit down at this channel's fixed-limit Texas Hold'em table!"""
+        # Check if command is used in a guild
+        if not ctx.guild:
+            return await ctx.send("This command can only be used in a server!")
+            
+        table = self.holdem_tables.get(ctx.channel.id)
+        seated = table is not None and table.find(ctx.author.id) is not None
+        
+        # Check if already in another game
+        if await self.sessions.is_playing(ctx.author.id) and not seated:
+            return await ctx.send("You are already in a game! Finish it before starting a new one.")
+        
+        # Get user's cash
+        async with get_session() as session:
+            user = await session.get(User, ctx.author.id)
+            if not user:
+                user = await self.economy.get_user(ctx.author.id)
+        
+        # The stake is only chosen by whoever opens the table
+        opened = table is None
+        if opened:
+            if not stake:
+                return await ctx.send(f"No table is open here. Open one with `{config.DEFAULT_PREFIX}holdem <stake>`!")
+            stake_amount = parse_amount(stake, user.cash)
+            if not stake_amount or stake_amount < 2:
+                return await ctx.send("Please enter a valid stake of at least $2!")
+            table = HoldemTable(stake_amount, config.HOLDEM_MAX_SEATS, config.HOLDEM_MAX_RAISES)
+        
+        # Every player must be able to cover the most they could lose in one hand
+        if user.cash < table.max_loss:
+            return await ctx.send(f"You need at least ${table.max_loss:,} to sit at a ${table.stake:,} table!")
+            
+        # Take the player before they sit, so two commands can't seat them in two games
+        if not seated:
+            if not await self.sessions.claim(ctx.author.id, "holdem_table"):
+                return await ctx.send("You are already in a game! Finish it before starting a new one.")
+            if self.holdem_tables.get(ctx.channel.id) is not (None if opened else table):
+                self.games_in_progress.pop(ctx.author.id, None)
+                return await ctx.send("The Hold'em table here changed while you were joining! Try again.")
+                
+        if opened:
+            self.holdem_tables[ctx.channel.id] = table
+            
+        error = table.sit(ctx.author.id, ctx.author.display_name)
+        if error:
+            if not seated:
+                self.games_in_progress.pop(ctx.author.id, None)
+            return await ctx.send(error)
+            
+        if opened:
+            embed = EmbedBuilder.info(
+                title="Hold'em Table Open",
+                description=f"{ctx.author.display_name} opened a ${table.stake:,}/${table.stake * 2:,} fixed-limit Hold'em table! The first hand is dealt in {config.HOLDEM_HAND_DELAY} seconds."
+            )
+            embed.add_field(name="Join", value=f"`{config.DEFAULT_PREFIX}holdem`", inline=True)
+            embed.add_field(name="Leave", value=f"`{config.DEFAULT_PREFIX}holdemleave`", inline=True)
+            embed.add_field(name="Your Cards", value=f"`{config.DEFAULT_PREFIX}holdemcards`", inline=True)
+            embed.add_field(name="Seats", value=str(table.max_seats), inline=True)
+            embed.add_field(name="Minimum Balance", value=f"${table.max_loss:,}", inline=True)
+            await ctx.send(embed=embed)
+            
+            self.bot.loop.create_task(self.run_holdem_table(ctx.channel, table))
+        elif seated:
+            await ctx.send(f"{ctx.author.display_name}, you're already at this table.")
+        elif table.in_hand:
+            await ctx.send(f"{ctx.author.display_name} sat down. You'll be dealt in next hand!")
+        else:
+            await ctx.send(f"{ctx.author.display_name} sat down at the table!")
+    
+    @commands.hybrid_command(name="holdemleave", aliases=["pleave"])
+    async def holdemleave(self, ctx):
+        """Leave this channel's Hold'em table"""
+        table = self.holdem_tables.get(ctx.channel.id)
+        if not table or not table.leave(ctx.author.id):
+            return await ctx.send("You aren't sitting at a Hold'em table in this channel!")
+            
+        if table.in_hand and table.find(ctx.author.id):
+            await ctx.send(f"{ctx.author.display_name} folded and will leave the table after this hand.")
+        else:
+            self.games_in_progress.pop(ctx.author.id, None)
+            await ctx.send(f"{ctx.author.display_name} left the table.")
+    
+    @commands.hybrid_command(name="holdemcards", aliases=["mycards", "hole"])
+    async def holdemcards(self, ctx):
+        """Privately show your hole cards at this channel's Hold'em table"""
+        table = self.holdem_tables.get(ctx.channel.id)
+        seat = table.find(ctx.author.id) if table else None
+        if not seat or not table.in_hand or not seat.cards or seat not in table.seats:
+            return await ctx.send("You aren't in a Hold'em hand in this channel!")
+            
+        text = f"Your hole cards: {format_cards(seat.cards)}"
+        if ctx.interaction:
+            return await ctx.send(text, ephemeral=True)
+        try:
+            await ctx.author.send(text)
+        except discord.HTTPException:
+            await ctx.send(f"I couldn't DM you, {ctx.author.display_name}. Use `/holdemcards` to see your cards privately.")
+    
+    async def send_hole_cards(self, table):
+        """DM every seat its hole cards for the new hand"""
+        async def send(seat):
+            user = self.bot.get_user(seat.user_id)
+            if user:
+                try:
+                    await user.send(f"Hand #{table.hands_played}: your hole cards are {format_cards(seat.cards)}")
+                except discord.HTTPException:
+                    pass
+                    
+        await asyncio.gather(*(send(seat) for seat in table.seats))
+    
+    def build_holdem_embed(self, table, results=None, balances=None):
+        """Render a Hold'em table as a single embed"""
+        board = format_cards(table.board) if table.board else "-"
+        pot = sum(total_bet for user_id, total_bet, net, won in results) if results else table.pot
+        embed = EmbedBuilder.info(
+            title=f"Hold'em Table - Hand #{table.hands_played}",
+            description=f"**Board:** {board}\n**Pot:** ${pot:,} | **{STREET_NAMES[table.street]}**"
+        )
+        
+        outcomes = {user_id: (net, won) for user_id, total_bet, net, won in results or []}
+        current = table.current_seat
+        
+        for index, seat in enumerate(table.seats):
+            marker = " 🔘" if index == table.button else ""
+            if seat.user_id in outcomes:
+                net, won = outcomes[seat.user_id]
+                hand_text = "Folded" if seat.folded else table.describe(seat) if seat.strength is not None else "No showdown"
+                status = f"Won +${net:,}" if net > 0 else f"Lost -${-net:,}" if net < 0 else "Even"
+                if balances and seat.user_id in balances:
+                    status += f" (Balance: ${balances[seat.user_id]:,})"
+                value = f"{hand_text}\n{status}"
+            elif seat.folded:
+                value = "Folded"
+            elif seat is current:
+                actions = "/".join(f"**{action}**" for action in table.legal_actions())
+                value = f"In ${seat.total_bet:,}\n▶ Type {actions}"
+            else:
+                value = f"In ${seat.total_bet:,}"
+            embed.add_field(name=f"{seat.name}{marker}", value=value, inline=True)
+            
+        for seat in table.waiting:
+            embed.add_field(name=seat.name, value="Joining next hand", inline=True)
+            
+        if results is None:
+            embed.set_footer(text=f"${table.stake:,}/${table.stake * 2:,} fixed limit - {config.HOLDEM_ACTION_TIMEOUT}s to act. Use {config.DEFAULT_PREFIX}holdemcards to see your cards.")
+        else:
+            embed.set_footer(text=f"Next hand in {config.HOLDEM_HAND_DELAY}s. Use {config.DEFAULT_PREFIX}holdemleave to leave.")
+        return embed
+    
+    async def run_holdem_table(self, channel, table):
+        """Deal Hold'em hands until the table empties
+        
+        Every action is rendered with one message edit. Blinds and bets are held
+        from balances as they're posted and each hand is settled for every seat
+        in one database transaction.
+        """
+        actions = {
+            "fold": FOLD, "f": FOLD,
+            "check": CHECK, "x": CHECK,
+            "call": CALL, "c": CALL,
+            "raise": RAISE, "bet": RAISE, "r": RAISE
+        }
+        
+        def accept(message):
+            seat = table.current_seat
+            return (
+                seat is not None and
+                message.author.id == seat.user_id and
+                actions.get(message.content.lower()) in table.legal_actions()
+            )
+            
+        hand_key = None
+        try:
+            await asyncio.sleep(config.HOLDEM_HAND_DELAY)
+            
+            while table.seats or table.waiting:
+                # Unseat idle players and anyone who can no longer cover a hand
+                seats = table.seats + table.waiting
+                balances = await self.economy.get_balances([seat.user_id for seat in seats])
+                removed = []
+                for seat in seats:
+                    if balances[seat.user_id] < table.max_loss or seat.missed >= config.HOLDEM_MAX_MISSED:
+                        table.leave(seat.user_id)
+                        self.games_in_progress.pop(seat.user_id, None)
+                        removed.append(seat.name)
+                        
+                if removed:
+                    await self.bot.outbound.send(channel, f"Removed from the Hold'em table: {', '.join(removed)}")
+                self.games_in_progress.refresh([seat.user_id for seat in table.seats + table.waiting])
+                
+                # Take the blinds before dealing, and again if the seating changed while we waited
+                blinds = dict(table.blinds())
+                if blinds:
+                    hand_key = self.round_key("holdem", channel.id)
+                    held = await self.economy.hold_stakes("Holdem", blinds, hand_key, channel.id)
+                    if len(held) != len(blinds) or dict(table.blinds()) != blinds:
+                        await self.economy.return_stakes(hand_key)
+                        hand_key = None
+                        short = [seat for seat in table.seats + table.waiting if seat.user_id in blinds and seat.user_id not in held]
+                        for seat in short:
+                            table.leave(seat.user_id)
+                            self.games_in_progress.pop(seat.user_id, None)
+                        if short:
+                            await self.bot.outbound.send(channel, f"Removed from the Hold'em table (couldn't cover the blinds): {', '.join(seat.name for seat in short)}")
+                        continue
+                    
+                if not table.deal():
+                    if not table.seats:
+                        break
+                    await self.bot.outbound.send(channel, f"Waiting for another player... Join with `{config.DEFAULT_PREFIX}holdem`!")
+                    await asyncio.sleep(config.HOLDEM_ACTION_TIMEOUT)
+                    if len(table.seats) + len(table.waiting) < 2:
+                        break
+                    continue
+                    
+                await self.send_hole_cards(table)
+                table_message = await self.bot.outbound.send(channel, embed=self.build_holdem_embed(table))
+                
+                # Play the hand one action at a time
+                with self.bot.router.replies_from(channel.id, [seat.user_id for seat in table.seats], accept) as replies:
+                    while not table.hand_over:
+                        seat = table.current_seat
+                        try:
+                            message = await replies.get(config.HOLDEM_ACTION_TIMEOUT)
+                            
+                            # Replies queue up, so one typed twice may arrive after the turn has moved on
+                            seat = table.current_seat
+                            action = actions[message.content.lower()]
+                            if seat is None or message.author.id != seat.user_id or action not in table.legal_actions():
+                                continue
+                            seat.missed = 0
+                            
+                            # Take the chips before they go in; a player who spent their cash mid-hand folds
+                            cost = table.cost(action)
+                            if cost:
+                                held = await self.economy.hold_stakes("Holdem", {seat.user_id: cost}, hand_key, channel.id)
+                                if table.current_seat is not seat:
+                                    # They left and folded while we waited; settlement hands the stake back
+                                    continue
+                                if not held:
+                                    await self.bot.outbound.send(channel, f"{seat.name} can't cover the {action} and folds.")
+                                    action = FOLD
+                            table.act(seat.user_id, action)
+                        except asyncio.TimeoutError:
+                            # The player may have left and folded while we waited
+                            if table.current_seat is not seat:
+                                continue
+                            seat.missed += 1
+                            table.act(seat.user_id, CHECK if CHECK in table.legal_actions() else FOLD)
+                            
+                        if not table.hand_over:
+                            await self.bot.outbound.edit(table_message, embed=self.build_holdem_embed(table))
+                
+                # Showdown and settle every seat together
+                results = table.finish()
+                try:
+                    balances = await self.economy.settle_bets(
+                        "Holdem",
+                        [(user_id, total_bet, net) for user_id, total_bet, net, won in results],
+                        round_key=hand_key
+                    )
+                except Exception as e:
+                    # Call the hand off rather than let one seat close the table
+                    logging.error(f"Hold'em hand {hand_key} couldn't be settled: {e}")
+                    await self.economy.return_stakes(hand_key)
+                    results = [(user_id, total_bet, 0, False) for user_id, total_bet, net, won in results]
+                    balances = None
+                    await self.bot.outbound.send(channel, "That hand couldn't be settled, so every bet was returned.")
+                hand_key = None
+                await self.bot.outbound.edit(table_message, embed=self.build_holdem_embed(table, results, balances))
+                
+                # Release players who left during the hand
+                for user_id, total_bet, net, won in results:
+                    if not table.find(user_id):
+                        self.games_in_progress.pop(user_id, None)
+                        
+                await asyncio.sleep(config.HOLDEM_HAND_DELAY)
+        finally:
+            # Close the table, returning the bets of a hand that never finished
+            for seat in table.seats + table.waiting:
+                self.games_in_progress.pop(seat.user_id, None)
+            if self.holdem_tables.get(channel.id) is table:
+                del self.holdem_tables[channel.id]
+            if hand_key:
+                await self.economy.return_stakes(hand_key)
+                
+        await self.bot.outbound.send(channel, "The Hold'em table has closed.")
     
     @commands.hybrid_command(name="highlow", aliases=["hl", "hilo"])
-    @app_commands.describe(bet="Amount to bet", choice="Higher, Lower, or Same")
-    async def highlow(self, ctx, bet: str, choice: str):
+    @app_commands.describe(
+        bet="Amount to bet", choice="Higher, Lower, or Same", rounds="Rounds to play in one go",
+        stop_loss="Stop once you're down this much", take_profit="Stop once you're up this much"
+    )
+    async def highlow(self, ctx, bet: str, choice: str, rounds: int = 1, stop_loss: int = None, take_profit: int = None):
         """Guess if the next card will be higher, lower, or the same!"""
         # Get user's cash
         async with get_session() as session:
@@ -867,6 +1830,13 @@ class GamblingCommands(commands.Cog):
         else:
             choice = "same"
         
+        # Play many guesses at once if asked
+        if rounds != 1:
+            return await self.play_rounds(
+                ctx, "HighLow", bet_amount, rounds, highlow_outcomes(choice),
+                stop_loss, take_profit, choice.capitalize()
+            )
+        
         # Create a deck
         card_values = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
         value_map = {card: idx for idx, card in enumerate(card_values)}
@@ -883,10 +1853,8 @@ class GamblingCommands(commands.Cog):
         embed.add_field(name="Your Choice", value=choice.capitalize(), inline=True)
         embed.add_field(name="Bet", value=f"${bet_amount:,}", inline=True)
         
-        message = await ctx.send(embed=embed)
-        
-        # Add suspense
-        await asyncio.sleep(1.5)
+        # Show the first card and add suspense, unless the player wants fast results
+        message = await suspense(ctx, embed=embed)
         
         # Deal second card
         second_card = {"value": random.choice(card_values), "suit": random.choice(CARD_SUITS)}
@@ -927,21 +1895,23 @@ class GamblingCommands(commands.Cog):
         if won:
             embed.add_field(name="Payout", value=f"{payout}:1", inline=True)
         
-        # Update the message
-        await message.edit(embed=embed)
+        # Update the message; in fast mode the result goes out with the bet result instead
+        if message:
+            await self.bot.outbound.edit(message, embed=embed)
         
         # Process bet result
+        reveal = None if message else embed
         if won:
-            await self.process_bet_result(ctx, bet_amount, "HighLow", True, multiplier=payout-1)
+            await self.process_bet_result(ctx, bet_amount, "HighLow", True, multiplier=payout-1, reveal=reveal)
         else:
-            await self.process_bet_result(ctx, bet_amount, "HighLow", False)
+            await self.process_bet_result(ctx, bet_amount, "HighLow", False, reveal=reveal)
     
     @commands.hybrid_command(name="connect4", aliases=["c4"])
     @app_commands.describe(opponent="The opponent to play against", bet="Amount to bet")
     async def connect4(self, ctx, opponent: discord.Member, bet: str = "0"):
         """Play Connect 4 against another user with an optional bet!"""
         # Check if already in a game
-        if ctx.author.id in self.games_in_progress:
+        if await self.sessions.is_playing(ctx.author.id):
             return await ctx.send("You are already in a game! Finish it before starting a new one.")
             
         # Validate opponent
@@ -951,7 +1921,7 @@ class GamblingCommands(commands.Cog):
         if opponent.id == ctx.author.id:
             return await ctx.send("You can't play against yourself!")
             
-        if opponent.id in self.games_in_progress:
+        if await self.sessions.is_playing(opponent.id):
             return await ctx.send(f"{opponent.display_name} is already in a game!")
         
         # Get user cash
@@ -991,44 +1961,38 @@ class GamblingCommands(commands.Cog):
                 description=f"{opponent.mention}, {ctx.author.display_name} has challenged you to a friendly game of Connect 4!\nDo you accept the challenge?"
             )
             
-        challenge_message = await ctx.send(embed=embed)
-        
-        # Add reaction buttons
-        await challenge_message.add_reaction("✅")  # Accept
-        await challenge_message.add_reaction("❌")  # Decline
+        # Add accept/decline buttons that only the challenged player can press
+        game_id = f"c4:{ctx.message.id}"
+        challenge_buttons = RoutedView(game_id, [
+            ("accept", "Accept", discord.ButtonStyle.success),
+            ("decline", "Decline", discord.ButtonStyle.danger)
+        ])
+        challenge_message = await ctx.send(embed=embed, view=challenge_buttons)
         
         # Wait for response
-        def check(reaction, user):
-            return (
-                user.id == opponent.id and
-                reaction.message.id == challenge_message.id and
-                str(reaction.emoji) in ["✅", "❌"]
-            )
-            
         try:
-            reaction, user = await self.bot.wait_for("reaction_add", timeout=60.0, check=check)
+            with self.bot.router.components_for(game_id, {opponent.id}) as clicks:
+                interaction, action = await clicks.get(timeout=60.0)
             
-            if str(reaction.emoji) == "❌":
-                await challenge_message.edit(
+            if action == "decline":
+                await interaction.response.edit_message(
                     embed=EmbedBuilder.error(
                         title="Challenge Declined",
                         description=f"{opponent.display_name} has declined the Connect 4 challenge."
-                    )
+                    ),
+                    view=None
                 )
                 return
                 
             # Challenge accepted, start the game
-            await challenge_message.edit(
+            await interaction.response.edit_message(
                 embed=EmbedBuilder.success(
                     title="Challenge Accepted",
                     description=f"Setting up Connect 4 game between {ctx.author.display_name} and {opponent.display_name}..."
-                )
+                ),
+                view=None
             )
             
-            # Mark players as in game
-            self.games_in_progress[ctx.author.id] = "connect4"
-            self.games_in_progress[opponent.id] = "connect4"
-            
             # Initialize the game
             board = [[" " for _ in range(7)] for _ in range(6)]
             players = [ctx.author, opponent]
@@ -1112,106 +2076,121 @@ class GamblingCommands(commands.Cog):
                     description=description
                 )
                 
-                embed.add_field(name="How to Play", value="Type a number 1-7 to drop your piece in that column.", inline=False)
+                embed.add_field(name="How to Play", value="Press a column button 1-7 to drop your piece in that column.", inline=False)
                 
                 return embed
             
-            # Send initial game board
-            game_message = await ctx.send(embed=create_game_embed())
+            # Create column buttons, disabling full columns
+            def create_game_view():
+                full = [str(column + 1) for column in range(7) if board[0][column] != " "]
+                return RoutedView(
+                    game_id,
+                    [(str(column), str(column), discord.ButtonStyle.secondary) for column in range(1, 8)],
+                    disabled=full
+                )
             
-            # Game loop
-            game_over = False
-            while not game_over:
-                # Wait for player's move
-                def move_check(message):
-                    return (
-                        message.author.id == players[current_player].id and
-                        message.channel == ctx.channel and
-                        message.content.isdigit() and
-                        1 <= int(message.content) <= 7
-                    )
+            # Compact snapshot of the board for the session store
+            def snapshot():
+                rows = ["".join("." if cell == " " else str(symbols.index(cell)) for cell in row) for row in board]
+                return {"b": rows, "t": current_player}
+            
+            # Track the game as a session so both players are always released
+            async with self.sessions.open(game_id, "connect4", [ctx.author.id, opponent.id], ctx.channel.id, bet_amount, snapshot()) as game:
+                # Send initial game board
+                game_message = await ctx.send(embed=create_game_embed(), view=create_game_view())
+                await game.save(message_id=game_message.id)
                 
-                try:
-                    move_message = await self.bot.wait_for("message", check=move_check, timeout=60.0)
-                    
-                    # Parse move
-                    column = int(move_message.content)
-                    
-                    # Make move
-                    if make_move(column, symbols[current_player]):
-                        # Check for win
-                        if check_win(symbols[current_player]):
-                            # Create win embed
-                            win_embed = EmbedBuilder.success(
-                                title=f"{players[current_player].display_name} Wins!",
-                                description=f"{format_board()}\n\n{players[current_player].mention} ({symbols[current_player]}) has won the game!"
-                            )
+                # Game loop
+                game_over = False
+                with self.bot.router.components_for(game_id, {ctx.author.id, opponent.id}) as clicks:
+                    while not game_over:
+                        try:
+                            # Wait for player's move
+                            interaction, action = await clicks.get(timeout=60.0)
                             
-                            if bet_amount > 0:
-                                win_embed.add_field(name="Bet", value=f"${bet_amount:,} has been transferred.", inline=False)
+                            if interaction.user.id != players[current_player].id:
+                                await interaction.response.send_message("It's not your turn!", ephemeral=True)
+                                continue
+                            
+                            # Parse move
+                            column = int(action)
+                            
+                            # Make move
+                            if make_move(column, symbols[current_player]):
+                                # Acknowledge the click; the board is edited below
+                                await interaction.response.defer()
                                 
-                                # Process bet
-                                winner_id = players[current_player].id
-                                loser_id = players[1 - current_player].id
+                                # Check for win
+                                if check_win(symbols[current_player]):
+                                    # Create win embed
+                                    win_embed = EmbedBuilder.success(
+                                        title=f"{players[current_player].display_name} Wins!",
+                                        description=f"{format_board()}\n\n{players[current_player].mention} ({symbols[current_player]}) has won the game!"
+                                    )
+                                    
+                                    if bet_amount > 0:
+                                        win_embed.add_field(name="Bet", value=f"${bet_amount:,} has been transferred.", inline=False)
+                                        
+                                        # Process bet
+                                        winner_id = players[current_player].id
+                                        loser_id = players[1 - current_player].id
+                                        
+                                        await self.economy.remove_cash(loser_id, bet_amount, f"Connect4 loss to {winner_id}")
+                                        await self.economy.add_cash(winner_id, bet_amount, f"Connect4 win against {loser_id}")
+                                        
+                                        # Update game stats
+                                        await self.update_game_stats(winner_id, "Connect4", bet_amount, True)
+                                        await self.update_game_stats(loser_id, "Connect4", bet_amount, False)
+                                        
+                                    await self.bot.outbound.edit(game_message, embed=win_embed, view=None)
+                                    game_over = True
                                 
-                                await self.economy.remove_cash(loser_id, bet_amount, f"Connect4 loss to {winner_id}")
-                                await self.economy.add_cash(winner_id, bet_amount, f"Connect4 win against {loser_id}")
+                                # Check for tie
+                                elif is_board_full():
+                                    # Create tie embed
+                                    tie_embed = EmbedBuilder.info(
+                                        title="Connect 4 - Tie Game!",
+                                        description=f"{format_board()}\n\nThe game is a tie! Board is full."
+                                    )
+                                    
+                                    if bet_amount > 0:
+                                        tie_embed.add_field(name="Bet", value=f"${bet_amount:,} has been returned to both players.", inline=False)
+                                        
+                                    await self.bot.outbound.edit(game_message, embed=tie_embed, view=None)
+                                    game_over = True
+                                    
+                                else:
+                                    # Switch players
+                                    current_player = 1 - current_player
+                                    await game.save(snapshot())
+                                    
+                                    # Update game board
+                                    await self.bot.outbound.edit(game_message, embed=create_game_embed(), view=create_game_view())
+                            else:
+                                # Invalid move
+                                await interaction.response.send_message("That column is full! Choose another column.", ephemeral=True)
                                 
-                                # Update game stats
-                                await self.update_game_stats(winner_id, "Connect4", bet_amount, True)
-                                await self.update_game_stats(loser_id, "Connect4", bet_amount, False)
-                            
-                            await game_message.edit(embed=win_embed)
-                            game_over = True
-                            
-                        # Check for tie
-                        elif is_board_full():
-                            # Create tie embed
-                            tie_embed = EmbedBuilder.info(
-                                title="Connect 4 - Tie Game!",
-                                description=f"{format_board()}\n\nThe game is a tie! Board is full."
+                        except asyncio.TimeoutError:
+                            # Player took too long
+                            timeout_embed = EmbedBuilder.error(
+                                title="Connect 4 - Timeout",
+                                description=f"{players[current_player].mention} took too long to make a move! Game cancelled."
                             )
                             
                             if bet_amount > 0:
-                                tie_embed.add_field(name="Bet", value=f"${bet_amount:,} has been returned to both players.", inline=False)
+                                timeout_embed.add_field(name="Bet", value=f"${bet_amount:,} has been returned to both players.", inline=False)
                             
-                            await game_message.edit(embed=tie_embed)
+                            await self.bot.outbound.edit(game_message, embed=timeout_embed, view=None)
                             game_over = True
-                            
-                        else:
-                            # Switch players
-                            current_player = 1 - current_player
-                            
-                            # Update game board
-                            await game_message.edit(embed=create_game_embed())
-                    else:
-                        # Invalid move
-                        await ctx.send(f"{players[current_player].mention} That column is full! Choose another column.", delete_after=5)
-                
-                except asyncio.TimeoutError:
-                    # Player took too long
-                    timeout_embed = EmbedBuilder.error(
-                        title="Connect 4 - Timeout",
-                        description=f"{players[current_player].mention} took too long to make a move! Game cancelled."
-                    )
-                    
-                    if bet_amount > 0:
-                        timeout_embed.add_field(name="Bet", value=f"${bet_amount:,} has been returned to both players.", inline=False)
-                    
-                    await game_message.edit(embed=timeout_embed)
-                    game_over = True
-            
-            # Remove players from active games
-            del self.games_in_progress[ctx.author.id]
-            del self.games_in_progress[opponent.id]
             
         except asyncio.TimeoutError:
             # Challenge timed out
-            await challenge_message.edit(
+            await self.bot.outbound.edit(challenge_message,
                 embed=EmbedBuilder.error(
                     title="Challenge Expired",
                     description=f"{opponent.display_name} did not respond to the Connect 4 challenge in time."
-                )
+                ),
+                view=None
             )
     
     @commands.hybrid_command(name="lotto", aliases=["lottery", "ticket", "tickets"])
@@ -1228,14 +2207,13 @@ class GamblingCommands(commands.Cog):
                 if not user:
                     user = await self.economy.get_user(ctx.author.id)
                     
-                # Get ticket count for user
-                # This would come from a proper lottery system
-                tickets_owned = getattr(user, "lottery_tickets", 0)
-                
-                # Get total pot and other lottery stats
-                # This would come from a proper lottery system
-                total_pot = 5000000  # Example placeholder
-                total_tickets = 1000  # Example placeholder
+                # Ticket counts and the pot live in shared state so every cluster sees the same lottery
+                counts = await self.bot.state.get_many([
+                    f"lottery:tickets:{ctx.author.id}", "lottery:tickets", "lottery:pot"
+                ])
+                tickets_owned = counts[f"lottery:tickets:{ctx.author.id}"] or 0
+                total_pot = counts["lottery:pot"] or 0
+                total_tickets = counts["lottery:tickets"] or 0
                 next_draw = "Saturday at 11:00am UTC"  # Example placeholder
                 
                 embed = EmbedBuilder.info(
@@ -1264,7 +2242,8 @@ class GamblingCommands(commands.Cog):
                 user = await self.economy.get_user(ctx.author.id)
                 
             # Get current tickets
-            tickets_owned = getattr(user, "lottery_tickets", 0)
+            ticket_key = f"lottery:tickets:{ctx.author.id}"
+            tickets_owned = await self.bot.state.get(ticket_key) or 0
             
             # Calculate max tickets user can buy
             max_more_tickets = min(MAX_TICKETS - tickets_owned, user.cash // TICKET_PRICE)
@@ -1287,18 +2266,21 @@ class GamblingCommands(commands.Cog):
                 else:
                     return await ctx.send("You need to buy at least 1 ticket!")
             
+            # Reserve the tickets under the cap first, in case another cluster sold some meanwhile
+            tickets_owned = await self.bot.state.incr(ticket_key, tickets, limit=MAX_TICKETS)
+            if tickets_owned is None:
+                return await ctx.send(f"You can't hold more than {MAX_TICKETS} tickets!")
+            
             # Calculate total cost
             total_cost = tickets * TICKET_PRICE
             
-            # Update user's cash and tickets
+            # Update user's cash
             user.cash -= total_cost
-            
-            # In a real system, you'd update the lottery tickets in a separate table
-            # For this example, we'll add it as a property to the user
-            user.lottery_tickets = tickets_owned + tickets
-            
             await session.commit()
             
+            await self.bot.state.incr("lottery:tickets", tickets)
+            await self.bot.state.incr("lottery:pot", total_cost)
+            
             # Create success embed
             embed = EmbedBuilder.success(
                 title="Lottery Tickets Purchased",
@@ -1306,7 +2288,7 @@ class GamblingCommands(commands.Cog):
             )
             
             embed.add_field(name="Cost", value=f"${total_cost:,}", inline=True)
-            embed.add_field(name="Your Tickets", value=str(user.lottery_tickets), inline=True)
+            embed.add_field(name="Your Tickets", value=str(tickets_owned), inline=True)
             embed.add_field(name="New Balance", value=f"${user.cash:,}", inline=True)
             
             await ctx.send(embed=embed)
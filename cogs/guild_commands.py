@@ -5,12 +5,14 @@ import asyncio
 from utils.embeds import EmbedBuilder
 from database.models import GuildConfig
 from database.database import get_session
+from utils.fastmode import GUILD
 
 class GuildCommands(commands.Cog):
     """Commands related to guild configuration and management"""
     
     def __init__(self, bot):
         self.bot = bot
+        self.updates_embed = self.build_updates_embed()  # Only changes when the bot is updated
     
     @commands.hybrid_command(name="config")
     @app_commands.describe(show="Show the current guild configuration")
@@ -24,82 +26,84 @@ class GuildCommands(commands.Cog):
         if not ctx.author.guild_permissions.administrator and ctx.author.id != ctx.guild.owner_id:
             return await ctx.send("You need to be a server administrator to use this command!")
             
-        # Get guild config
-        async with get_session() as session:
-            guild_config = await session.get(GuildConfig, ctx.guild.id)
-            
-            if not guild_config:
+        # Get guild config from the cache, creating the default row the first time
+        guild_config = self.bot.guild_configs.get(ctx.guild.id)
+        if guild_config is None:
+            async with get_session() as session:
                 # Create default config
-                guild_config = GuildConfig(
+                row = GuildConfig(
                     guild_id=ctx.guild.id,
                     prefix="$",
                     admin_ids=[ctx.guild.owner_id],
                     force_commands=False
                 )
-                session.add(guild_config)
+                session.add(row)
                 await session.commit()
-                
-            # Create config embed
-            embed = EmbedBuilder.info(
-                title=f"Configuration for {ctx.guild.name}",
-                description="Current server settings:"
-            )
+            guild_config = self.bot.guild_configs.store(row)
             
-            # Add config values
-            embed.add_field(name="Prefix", value=guild_config.prefix, inline=True)
+        # Create config embed
+        embed = EmbedBuilder.info(
+            title=f"Configuration for {ctx.guild.name}",
+            description="Current server settings:"
+        )
+        
+        # Add config values
+        embed.add_field(name="Prefix", value=guild_config.prefix, inline=True)
+        
+        # Add channel restrictions
+        if guild_config.channel_ids:
+            channel_mentions = []
+            for channel_id in guild_config.channel_ids:
+                channel = ctx.guild.get_channel(channel_id)
+                if channel:
+                    channel_mentions.append(channel.mention)
+                else:
+                    channel_mentions.append(f"Unknown ({channel_id})")
+            embed.add_field(name="Restricted Channels", value=", ".join(channel_mentions), inline=False)
+        else:
+            embed.add_field(name="Restricted Channels", value="None (Bot responds in all channels)", inline=False)
             
-            # Add channel restrictions
-            if guild_config.channel_ids:
-                channel_mentions = []
-                for channel_id in guild_config.channel_ids:
-                    channel = ctx.guild.get_channel(channel_id)
-                    if channel:
-                        channel_mentions.append(channel.mention)
-                    else:
-                        channel_mentions.append(f"Unknown ({channel_id})")
-                embed.add_field(name="Restricted Channels", value=", ".join(channel_mentions), inline=False)
+        # Add admin IDs
+        admin_mentions = []
+        for admin_id in guild_config.admin_ids:
+            member = ctx.guild.get_member(admin_id)
+            if member:
+                admin_mentions.append(member.mention)
             else:
-                embed.add_field(name="Restricted Channels", value="None (Bot responds in all channels)", inline=False)
-                
-            # Add admin IDs
-            admin_mentions = []
-            for admin_id in guild_config.admin_ids:
-                member = ctx.guild.get_member(admin_id)
-                if member:
-                    admin_mentions.append(member.mention)
-                else:
-                    admin_mentions.append(f"Unknown ({admin_id})")
-            embed.add_field(name="Config Admins", value=", ".join(admin_mentions), inline=False)
+                admin_mentions.append(f"Unknown ({admin_id})")
+        embed.add_field(name="Config Admins", value=", ".join(admin_mentions), inline=False)
+        
+        # Add other settings
+        embed.add_field(name="Force Commands", value=str(guild_config.force_commands), inline=True)
+        embed.add_field(name="Fast Mode", value=str(self.bot.fast_mode.guilds.get(ctx.guild.id, False)), inline=True)
+        
+        if guild_config.cash_name:
+            embed.add_field(name="Cash Name", value=guild_config.cash_name, inline=True)
             
-            # Add other settings
-            embed.add_field(name="Force Commands", value=str(guild_config.force_commands), inline=True)
+        if guild_config.cashmoji:
+            embed.add_field(name="Cash Emoji", value=guild_config.cashmoji, inline=True)
             
-            if guild_config.cash_name:
-                embed.add_field(name="Cash Name", value=guild_config.cash_name, inline=True)
-                
-            if guild_config.cashmoji:
-                embed.add_field(name="Cash Emoji", value=guild_config.cashmoji, inline=True)
-                
-            if guild_config.crypto_name:
-                embed.add_field(name="Crypto Name", value=guild_config.crypto_name, inline=True)
-                
-            if guild_config.cryptomoji:
-                embed.add_field(name="Crypto Emoji", value=guild_config.cryptomoji, inline=True)
-                
-            # Add help text
-            embed.add_field(
-                name="How to Configure",
-                value=(
-                    f"Use `/config channel` to set channel restrictions\n"
-                    f"Use `/config admin_ids add @user` to add config admins\n"
-                    f"Use `/config admin_ids delete @user` to remove config admins\n"
-                    f"Use `/config cashmoji emoji` to set cash emoji (donators only)\n"
-                    f"Use `/config cash_name name` to set cash name (donators only)\n"
-                ),
-                inline=False
-            )
+        if guild_config.crypto_name:
+            embed.add_field(name="Crypto Name", value=guild_config.crypto_name, inline=True)
             
-            await ctx.send(embed=embed)
+        if guild_config.cryptomoji:
+            embed.add_field(name="Crypto Emoji", value=guild_config.cryptomoji, inline=True)
+        
+        # Add help text
+        embed.add_field(
+            name="How to Configure",
+            value=(
+                f"Use `/config channel` to set channel restrictions\n"
+                f"Use `/config admin_ids add @user` to add config admins\n"
+                f"Use `/config admin_ids delete @user` to remove config admins\n"
+                f"Use `/config_fastmode on` to skip game animations by default\n"
+                f"Use `/config cashmoji emoji` to set cash emoji (donators only)\n"
+                f"Use `/config cash_name name` to set cash name (donators only)\n"
+            ),
+            inline=False
+        )
+        
+        await ctx.send(embed=embed)
     
     @commands.hybrid_command(name="config_channel")
     @app_commands.describe(
@@ -146,6 +150,7 @@ class GuildCommands(commands.Cog):
             if not channel_ids:
                 guild_config.channel_ids = []
                 await session.commit()
+                self.bot.guild_configs.store(guild_config)
                 
                 embed = EmbedBuilder.success(
                     title="Channels Updated",
@@ -156,6 +161,7 @@ class GuildCommands(commands.Cog):
                 
             guild_config.channel_ids = channel_ids
             await session.commit()
+            self.bot.guild_configs.store(guild_config)
             
             # Create success embed
             embed = EmbedBuilder.success(
@@ -204,9 +210,10 @@ class GuildCommands(commands.Cog):
             if user.id in guild_config.admin_ids:
                 return await ctx.send(f"{user.mention} is already a config admin!")
                 
-            # Add user to admin IDs
-            guild_config.admin_ids.append(user.id)
+            # Add user to admin IDs (assign a new list so the JSON column is marked as changed)
+            guild_config.admin_ids = guild_config.admin_ids + [user.id]
             await session.commit()
+            self.bot.guild_configs.store(guild_config)
             
             # Create success embed
             embed = EmbedBuilder.success(
@@ -243,9 +250,10 @@ class GuildCommands(commands.Cog):
             if user.id == ctx.guild.owner_id:
                 return await ctx.send("You cannot remove the server owner from config admins!")
                 
-            # Remove user from admin IDs
-            guild_config.admin_ids.remove(user.id)
+            # Remove user from admin IDs (assign a new list so the JSON column is marked as changed)
+            guild_config.admin_ids = [admin_id for admin_id in guild_config.admin_ids if admin_id != user.id]
             await session.commit()
+            self.bot.guild_configs.store(guild_config)
             
             # Create success embed
             embed = EmbedBuilder.success(
@@ -255,9 +263,45 @@ class GuildCommands(commands.Cog):
             
             await ctx.send(embed=embed)
     
+    @commands.hybrid_command(name="config_fastmode")
+    @app_commands.describe(setting="On or Off")
+    async def config_fastmode(self, ctx, setting: str):
+        """Make games skip their animations by default in this server"""
+        # Check if command is used in a guild
+        if not ctx.guild:
+            return await ctx.send("This command can only be used in a server!")
+        
+        # Check if user has appropriate permissions
+        if not ctx.author.guild_permissions.administrator and ctx.author.id != ctx.guild.owner_id:
+            return await ctx.send("You need to be a server administrator to use this command!")
+            
+        setting = setting.lower()
+        if setting not in ["on", "off"]:
+            return await ctx.send("Please choose either 'on' or 'off'!")
+            
+        enabled = setting == "on"
+        await self.bot.fast_mode.set(GUILD, ctx.guild.id, enabled)
+        
+        # Create success embed
+        embed = EmbedBuilder.success(
+            title="Fast Mode Updated",
+            description=(
+                "Games in this server will now skip their animations by default."
+                if enabled else
+                "Games in this server will now play their animations by default."
+            )
+        )
+        embed.add_field(name="Players", value="Anyone can still choose for themselves with `/fastmode`.", inline=False)
+        
+        await ctx.send(embed=embed)
+    
     @commands.hybrid_command(name="updates", aliases=["announcements", "announce"])
     async def updates(self, ctx):
         """Shows the latest updates for the bot, changed every time the bot is updated"""
+        await ctx.send(embed=EmbedBuilder.stamp(self.updates_embed))
+    
+    def build_updates_embed(self):
+        """Create the bot updates embed"""
         embed = EmbedBuilder.info(
             title="Latest Bot Updates",
             description="Here are the most recent changes and improvements to the bot:"
@@ -278,7 +322,7 @@ class GuildCommands(commands.Cog):
         
         # Add any future updates here
         
-        await ctx.send(embed=embed)
+        return embed
 
 async def setup(bot):
     await bot.add_cog(GuildCommands(bot))
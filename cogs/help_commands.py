@@ -2,83 +2,57 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import asyncio
+import os
+import logging
 from utils.embeds import EmbedBuilder
 import config
-from utils.helpers import create_paginated_embed
+from utils.helpers import create_paginated_embed, RoutedView
+from utils.metrics import metrics, Timing
+from utils.help_index import CommandIndex
+from utils.cooldowns import cooldown
+from utils.sessions import busy_users
+from sqlalchemy import select, func
+from database.database import get_read_session, engines
+from database.pool import pool_stats
+from database.export import export_user, export_path, prune_exports
+from database.models import User
 
 class HelpCommands(commands.Cog):
     """Commands related to help and information"""
     
     def __init__(self, bot):
         self.bot = bot
+        self.index = None
+        self.help_embeds = {}  # Command name -> prebuilt help embed
+        self.general_help_embed = None
+        
+        # These never change, so build them once and only refresh the timestamp when sending
+        self.invite_embed = self.build_invite_embed()
+        self.support_embed = self.build_support_embed()
+        self.donate_embed = self.build_donate_embed()
     
-    @commands.hybrid_command(name="help", aliases=["h", "wtf"])
-    @app_commands.describe(command_name="The command to look up. Start typing to search for a command")
-    async def help(self, ctx, *, command_name: str = None):
-        """Show the help for all the commands available in the bot"""
-        if command_name:
-            await self.show_command_help(ctx, command_name)
-        else:
-            await self.show_general_help(ctx)
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Index every command once all cogs are loaded"""
+        self.build_index()
     
-    async def show_command_help(self, ctx, command_name):
-        """Show help for a specific command"""
-        # Clean command name
-        command_name = command_name.lower().strip()
-        
-        # Find the command
-        command = self.bot.get_command(command_name)
-        if command is None:
-            # Check aliases
-            for cmd in self.bot.commands:
-                if cmd.aliases and command_name in [alias.lower() for alias in cmd.aliases]:
-                    command = cmd
-                    break
+    def build_index(self):
+        """Build the command index and every help embed from the loaded commands"""
+        self.index = CommandIndex(self.bot.commands, config.DEFAULT_PREFIX)
         
-        if command is None:
-            return await ctx.send(f"Command `{command_name}` not found. Use `{config.DEFAULT_PREFIX}help` to see all commands.")
-            
-        # Create embed for command
-        embed = EmbedBuilder.info(
-            title=f"Help: {command.name}",
-            description=command.help or "No description available."
-        )
-        
-        # Add usage info
-        usage = f"{config.DEFAULT_PREFIX}{command.name}"
-        if command.signature:
-            usage += f" {command.signature}"
-        embed.add_field(name="Usage", value=f"`{usage}`", inline=False)
-        
-        # Add aliases if any
-        if command.aliases:
-            aliases = ", ".join([f"{config.DEFAULT_PREFIX}{alias}" for alias in command.aliases])
-            embed.add_field(name="Aliases", value=aliases, inline=False)
-        
-        # Add cooldown if any
-        if command._buckets and command._buckets._cooldown:
-            cooldown = command._buckets._cooldown
-            embed.add_field(
-                name="Cooldown",
-                value=f"{cooldown.rate} use(s) every {cooldown.per:.0f} seconds",
-                inline=False
+        self.help_embeds = {}
+        for entry in set(self.index.entries.values()):
+            # Create embed for command
+            embed = EmbedBuilder.info(
+                title=f"Help: {entry.name}",
+                description=entry.description
             )
-        
-        await ctx.send(embed=embed)
-    
-    async def show_general_help(self, ctx):
-        """Show general help with command categories"""
-        # Group commands by cogs
-        command_categories = {}
-        for command in self.bot.commands:
-            if command.hidden:
-                continue
-                
-            category = command.cog.qualified_name if command.cog else "No Category"
-            if category not in command_categories:
-                command_categories[category] = []
-                
-            command_categories[category].append(command)
+            embed.add_field(name="Usage", value=f"`{entry.usage}`", inline=False)
+            if entry.aliases:
+                embed.add_field(name="Aliases", value=entry.aliases, inline=False)
+            if entry.cooldown:
+                embed.add_field(name="Cooldown", value=entry.cooldown, inline=False)
+            self.help_embeds[entry.name] = embed
         
         # Create main help embed
         main_embed = EmbedBuilder.info(
@@ -87,10 +61,10 @@ class HelpCommands(commands.Cog):
         )
         
         # Add categories overview
-        for category, commands in command_categories.items():
+        for category, names in self.index.categories.items():
             main_embed.add_field(
                 name=category,
-                value=", ".join([f"`{cmd.name}`" for cmd in commands]),
+                value=", ".join([f"`{name}`" for name in names]),
                 inline=False
             )
         
@@ -104,12 +78,56 @@ class HelpCommands(commands.Cog):
             ),
             inline=False
         )
-        
-        await ctx.send(embed=main_embed)
+        self.general_help_embed = main_embed
+    
+    @commands.hybrid_command(name="help", aliases=["h", "wtf"])
+    @app_commands.describe(command_name="The command to look up. Start typing to search for a command")
+    async def help(self, ctx, *, command_name: str = None):
+        """Show the help for all the commands available in the bot"""
+        if self.index is None:
+            self.build_index()
+            
+        if command_name:
+            await self.show_command_help(ctx, command_name)
+        else:
+            await self.show_general_help(ctx)
+    
+    @help.autocomplete("command_name")
+    async def help_autocomplete(self, interaction, current):
+        """Suggest command names as the user types"""
+        if self.index is None:
+            self.build_index()
+            
+        current = current.lower().strip()
+        names = [name for names in self.index.categories.values() for name in names]
+        matches = [name for name in names if name.startswith(current)]
+        if current and len(matches) < 25:
+            matches += [name for name in self.index.suggest(current, 25 - len(matches)) if name not in matches]
+        return [app_commands.Choice(name=name, value=name) for name in matches[:25]]
+    
+    async def show_command_help(self, ctx, command_name):
+        """Show help for a specific command"""
+        entry = self.index.lookup(command_name)
+        if entry is None:
+            message = f"Command `{command_name.lower().strip()}` not found."
+            suggestions = self.index.suggest(command_name)
+            if suggestions:
+                message += f" Did you mean {', '.join(f'`{name}`' for name in suggestions)}?"
+            return await ctx.send(f"{message} Use `{config.DEFAULT_PREFIX}help` to see all commands.")
+            
+        await ctx.send(embed=EmbedBuilder.stamp(self.help_embeds[entry.name]))
+    
+    async def show_general_help(self, ctx):
+        """Show general help with command categories"""
+        await ctx.send(embed=EmbedBuilder.stamp(self.general_help_embed))
     
     @commands.hybrid_command(name="invite")
     async def invite(self, ctx):
         """Shares the details of how to add the bot"""
+        await ctx.send(embed=EmbedBuilder.stamp(self.invite_embed))
+    
+    def build_invite_embed(self):
+        """Create the invite embed"""
         embed = EmbedBuilder.info(
             title="Invite Rocket Gambling Bot",
             description="Add the bot to your own server!"
@@ -127,7 +145,7 @@ class HelpCommands(commands.Cog):
             inline=False
         )
         
-        await ctx.send(embed=embed)
+        return embed
     
     @commands.hybrid_command(name="stats", aliases=["ping", "status", "about", "info", "owner"])
     async def stats(self, ctx):
@@ -145,9 +163,15 @@ class HelpCommands(commands.Cog):
             description="Here are some statistics about the bot:"
         )
         
+        # Count registered players; read-only, so served by the read replica
+        # With partitioning each partition returns its own count, so add them up
+        async with get_read_session() as session:
+            player_count = sum((await session.execute(select(func.count()).select_from(User))).scalars())
+        
         # Add stats
         embed.add_field(name="Servers", value=f"{guild_count:,}", inline=True)
         embed.add_field(name="Users", value=f"{member_count:,}", inline=True)
+        embed.add_field(name="Players", value=f"{player_count:,}", inline=True)
         embed.add_field(name="Ping", value=f"{ping}ms", inline=True)
         
         # Add uptime (would need to track this separately)
@@ -168,9 +192,73 @@ class HelpCommands(commands.Cog):
         
         await ctx.send(embed=embed)
     
+    @commands.command(name="metrics", hidden=True)
+    @commands.is_owner()
+    async def show_metrics(self, ctx):
+        """Show the bot's internal counters and timings"""
+        hours = metrics.uptime / 3600
+        embed = EmbedBuilder.info(
+            title="Bot Metrics",
+            description=f"Collected over the last {hours:,.1f} hours"
+        )
+        
+        for group, values in metrics.groups().items():
+            lines = []
+            for name, value in values:
+                if isinstance(value, Timing):
+                    lines.append(f"{name}: {value.count:,} × {value.average * 1000:,.1f}ms (max {value.worst * 1000:,.1f}ms)")
+                elif isinstance(value, float):
+                    lines.append(f"{name}: {value:,.1f}")
+                else:
+                    lines.append(f"{name}: {value:,}")
+            embed.add_field(name=group.replace("_", " ").title(), value="\n".join(lines)[:1024], inline=False)
+            
+        if not embed.fields:
+            embed.add_field(name="Nothing Yet", value="No metrics have been recorded since startup.", inline=False)
+            
+        outbound = self.bot.outbound.stats()
+        embed.add_field(
+            name="Outbound Queue",
+            value=(
+                f"{outbound['pending']:,} waiting in {outbound['channels']:,} channels\n"
+                f"{outbound['sent']:,} sent, {outbound['failed']:,} failed, {outbound['dropped']:,} dropped\n"
+                f"{outbound['coalesced']:,} edits coalesced, {outbound['merged']:,} sends merged"
+            ),
+            inline=False
+        )
+        
+        pools = pool_stats(engines())
+        if pools:
+            embed.add_field(
+                name="Database Pools",
+                value="\n".join(
+                    f"{name}: {pool['in_use']}/{pool['size']} in use, {pool['idle']} idle, {pool['overflow']} overflow"
+                    for name, pool in pools.items()
+                ),
+                inline=False
+            )
+            
+        gateway = self.bot.prefixes.stats()
+        commands_run = metrics.counters.get("gateway.commands", 0)
+        embed.add_field(
+            name="Messages",
+            value=(
+                f"{gateway['messages']:,} seen ({gateway['messages_per_second']:,.2f}/s), "
+                f"{gateway['rejected']:,} turned away on the first character\n"
+                f"{commands_run:,} prefix commands dispatched ({commands_run / max(metrics.uptime, 1):,.2f}/s)"
+            ),
+            inline=False
+        )
+            
+        await ctx.send(embed=embed)
+    
     @commands.hybrid_command(name="support")
     async def support(self, ctx):
         """Shares a link to the support server"""
+        await ctx.send(embed=EmbedBuilder.stamp(self.support_embed))
+    
+    def build_support_embed(self):
+        """Create the support server embed"""
         embed = EmbedBuilder.info(
             title="Support Server",
             description="Need help with the bot? Join our support server!"
@@ -182,11 +270,15 @@ class HelpCommands(commands.Cog):
             inline=False
         )
         
-        await ctx.send(embed=embed)
+        return embed
     
     @commands.hybrid_command(name="donate")
     async def donate(self, ctx):
         """Shares a link to donate to the bot"""
+        await ctx.send(embed=EmbedBuilder.stamp(self.donate_embed))
+    
+    def build_donate_embed(self):
+        """Create the donation embed"""
         embed = EmbedBuilder.info(
             title="Support the Bot",
             description="Donate to help keep the bot running and unlock special perks!"
@@ -212,11 +304,61 @@ class HelpCommands(commands.Cog):
             inline=False
         )
         
-        await ctx.send(embed=embed)
+        return embed
+    
+    @commands.hybrid_command(name="export_my_data")
+    @cooldown("export")
+    async def export_my_data(self, ctx):
+        """Get a copy of everything the bot stores about you, sent to your DMs"""
+        await ctx.defer()
+        
+        # Kept exports only wait so long for the owner to hand them over
+        pruned = await asyncio.to_thread(prune_exports)
+        if pruned:
+            logging.info(f"Removed {pruned:,} expired exports")
+            
+        path = export_path(ctx.author.id)
+        keep = False
+        try:
+            counts = await export_user(ctx.author.id, path)
+            size = os.path.getsize(path)
+            
+            # Too big to attach: keep it on disk for the owner to hand over
+            if size > config.EXPORT_ATTACHMENT_LIMIT:
+                keep = True
+                logging.info(f"Export for {ctx.author.id} kept at {path} ({size:,} bytes) for {config.EXPORT_KEEP_DAYS} days")
+                return await ctx.send(embed=EmbedBuilder.info(
+                    title="Export Ready",
+                    description=(
+                        f"Your export is {size / 1024 / 1024:,.1f} MB, too large to send here. Ask in the support server "
+                        f"within {config.EXPORT_KEEP_DAYS} days and it will be delivered to you."
+                    )
+                ))
+                
+            try:
+                await ctx.author.send(
+                    embed=EmbedBuilder.success(
+                        title="Your Data",
+                        description=f"{sum(counts.values()):,} records as gzipped NDJSON, one per line."
+                    ),
+                    file=discord.File(path, filename=f"rocketbot-{ctx.author.id}.ndjson.gz")
+                )
+            except discord.Forbidden:
+                return await ctx.send("I couldn't DM you your export. Allow direct messages from server members and try again.")
+        finally:
+            # A failed export leaves a partial file behind, which is no use to anyone
+            if not keep and os.path.exists(path):
+                os.remove(path)
+                
+        await ctx.send(embed=EmbedBuilder.success(title="Export Sent", description="Check your DMs for your data."))
     
     @commands.hybrid_command(name="delete_my_data")
     async def delete_my_data(self, ctx):
         """The command used to clear all of your data from the bot. Use this if you want to start from scratch"""
+        # A game in progress would settle against the deleted account and bring it back
+        if await busy_users(self.bot.state, [ctx.author.id]):
+            return await ctx.send("You're in a game right now! Finish it, then run this again.")
+        
         # Create confirmation message
         embed = EmbedBuilder.warning(
             title="Delete Your Data",
@@ -236,39 +378,48 @@ class HelpCommands(commands.Cog):
         
         embed.add_field(
             name="Confirmation Required",
-            value="To confirm, type `yes, delete my data` within 30 seconds.",
+            value="To confirm, press **Delete My Data** within 30 seconds.",
             inline=False
         )
         
-        await ctx.send(embed=embed)
+        session_key = f"erase:{ctx.message.id}"
+        buttons = RoutedView(session_key, [
+            ("confirm", "Delete My Data", discord.ButtonStyle.danger),
+            ("cancel", "Cancel", discord.ButtonStyle.secondary)
+        ])
+        message = await ctx.send(embed=embed, view=buttons)
         
         # Wait for confirmation
-        def check(message):
-            return message.author == ctx.author and message.content.lower() == "yes, delete my data"
-            
         try:
-            await self.bot.wait_for("message", check=check, timeout=30.0)
+            with self.bot.router.components_for(session_key, {ctx.author.id}) as clicks:
+                interaction, action = await clicks.get(timeout=30.0)
+                
+            if action == "cancel":
+                cancel_embed = EmbedBuilder.error(
+                    title="Deletion Cancelled",
+                    description="Data deletion was cancelled. Nothing was deleted."
+                )
+                return await interaction.response.edit_message(embed=cancel_embed, view=None)
             
-            # If confirmed, delete data
-            from database.database import get_session
-            from database.models import User, MiningStats, Inventory
+            # Erase in the background, showing progress on the confirmation message
+            job = self.bot.erasures.start([ctx.author.id], requested_by=ctx.author.id)
+            progress_embed = EmbedBuilder.info(
+                title="Deleting Your Data",
+                description="Your data is being deleted. This message will update when it's done."
+            )
+            await interaction.response.edit_message(embed=progress_embed, view=None)
+            await self.watch_erasure(message, job, "Deleting Your Data")
             
-            async with get_session() as session:
-                # Delete all user data
-                user = await session.get(User, ctx.author.id)
-                if user:
-                    await session.delete(user)
-                    
-                mining_stats = await session.get(MiningStats, ctx.author.id)
-                if mining_stats:
-                    await session.delete(mining_stats)
-                    
-                inventory = await session.get(Inventory, ctx.author.id)
-                if inventory:
-                    await session.delete(inventory)
-                    
-                # Commit changes
-                await session.commit()
+            if job.status == "failed":
+                return await message.edit(embed=EmbedBuilder.error(
+                    title="Deletion Failed",
+                    description="Something went wrong part way through. Run the command again to finish deleting your data."
+                ))
+            if job.skipped:
+                return await message.edit(embed=EmbedBuilder.error(
+                    title="Deletion Cancelled",
+                    description="You started a game before your data could be deleted. Nothing was deleted; finish the game and run the command again."
+                ))
                 
             # Send success message
             success_embed = EmbedBuilder.success(
@@ -285,7 +436,47 @@ class HelpCommands(commands.Cog):
                 description="Data deletion was cancelled due to timeout."
             )
             
-            await ctx.send(embed=cancel_embed)
+            await message.edit(embed=cancel_embed, view=None)
+    
+    async def watch_erasure(self, message, job, title):
+        """Edit a message with an erasure job's progress until it finishes"""
+        while not job.done:
+            await asyncio.wait({job.task}, timeout=config.ERASURE_PROGRESS_INTERVAL)
+            if not job.done:
+                await message.edit(embed=EmbedBuilder.info(title=title, description=job.summary()))
+    
+    @commands.command(name="erase_users", hidden=True)
+    @commands.is_owner()
+    async def erase_users(self, ctx, *user_ids: int):
+        """Erase every row belonging to the given user IDs in the background"""
+        if not user_ids:
+            return await ctx.send("Give the IDs of the users to erase, separated by spaces.")
+            
+        job = self.bot.erasures.start(user_ids, requested_by=ctx.author.id)
+        title = f"Erasure Job {job.id}"
+        message = await ctx.send(embed=EmbedBuilder.info(title=title, description=job.summary()))
+        await self.watch_erasure(message, job, title)
+        
+        if job.status == "done":
+            embed = EmbedBuilder.success(title=title, description=job.summary())
+        else:
+            embed = EmbedBuilder.error(title=title, description=job.summary())
+        for table, rows in sorted(job.deleted.items()):
+            embed.add_field(name=table, value=f"{rows:,}", inline=True)
+        await message.edit(embed=embed)
+    
+    @commands.command(name="erasure", hidden=True)
+    @commands.is_owner()
+    async def erasure_status(self, ctx, job_id: str):
+        """Show the progress of an erasure job"""
+        job = self.bot.erasures.get(job_id)
+        if job is None:
+            return await ctx.send(f"No erasure job {job_id} is known to this process.")
+            
+        embed = EmbedBuilder.info(title=f"Erasure Job {job.id} ({job.status})", description=job.summary())
+        for table, rows in sorted(job.deleted.items()):
+            embed.add_field(name=table, value=f"{rows:,}", inline=True)
+        await ctx.send(embed=embed)
 
 async def setup(bot):
     await bot.add_cog(HelpCommands(bot))
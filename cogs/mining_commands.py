@@ -9,7 +9,9 @@ from utils.embeds import EmbedBuilder
 from utils.economy import EconomyManager
 from utils.helpers import parse_amount, get_mentioned_user, format_number
 from database.models import User, MiningStats, Inventory
-from database.database import get_session
+from database.database import get_session, get_read_session
+from database.read_models import load_mine, empty_inventory
+from database.loaders import USER_WITH_MINE
 
 class MiningCommands(commands.Cog):
     """Commands related to the mining mini-game"""
@@ -18,6 +20,13 @@ class MiningCommands(commands.Cog):
         self.bot = bot
         self.economy = EconomyManager(bot)
     
+    async def create_inventory(self, user_id):
+        """Give a miner an empty inventory on the primary and return the view of it"""
+        async with get_session() as session:
+            session.add(Inventory(user_id=user_id))
+            await session.commit()
+        return empty_inventory()
+    
     @commands.hybrid_command(name="start_mine", aliases=["startMine", "start"])
     async def start_mine(self, ctx, *, name: str = None):
         """Start your mining career! Takes an optional name"""
@@ -27,12 +36,12 @@ class MiningCommands(commands.Cog):
             
         # Check if user already has a mine
         async with get_session() as session:
-            user = await session.get(User, ctx.author.id)
+            user = await session.get(User, ctx.author.id, options=USER_WITH_MINE)
             if not user:
-                user = await self.economy.get_user(ctx.author.id)
+                await self.economy.get_user(ctx.author.id)
                 
             # Check if mining stats already exist
-            mining_stats = await session.get(MiningStats, ctx.author.id)
+            mining_stats = user.mining_stats if user else None
             
             if mining_stats:
                 # Update name if mine already exists
@@ -79,9 +88,9 @@ class MiningCommands(commands.Cog):
     @commands.hybrid_command(name="mine", aliases=["m"])
     async def mine(self, ctx):
         """Shows the information about your mine and the mine shop."""
-        # Check if user has started mining
-        async with get_session() as session:
-            mining_stats = await session.get(MiningStats, ctx.author.id)
+        # Check if user has started mining; the mine and inventory come back in one read
+        async with get_read_session() as session:
+            mining_stats, inventory = await load_mine(session, ctx.author.id)
             
             if not mining_stats:
                 embed = EmbedBuilder.error(
@@ -90,13 +99,8 @@ class MiningCommands(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
                 
-            # Get user inventory
-            inventory = await session.get(Inventory, ctx.author.id)
             if not inventory:
-                # Create empty inventory
-                inventory = Inventory(user_id=ctx.author.id)
-                session.add(inventory)
-                await session.commit()
+                inventory = await self.create_inventory(ctx.author.id)
             
             # Create mine info embed
             embed = EmbedBuilder.info(
@@ -142,7 +146,9 @@ class MiningCommands(commands.Cog):
         """Dig in the mines to collect coal, ores and unprocessed materials (UM)!"""
         # Check if user has started mining
         async with get_session() as session:
-            mining_stats = await session.get(MiningStats, ctx.author.id)
+            # The mine and inventory are joined into the one user query
+            user = await session.get(User, ctx.author.id, options=USER_WITH_MINE)
+            mining_stats = user.mining_stats if user else None
             
             if not mining_stats:
                 embed = EmbedBuilder.error(
@@ -151,8 +157,7 @@ class MiningCommands(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
                 
-            # Get user inventory
-            inventory = await session.get(Inventory, ctx.author.id)
+            inventory = user.inventory
             if not inventory:
                 # Create empty inventory
                 inventory = Inventory(user_id=ctx.author.id)
@@ -248,7 +253,9 @@ class MiningCommands(commands.Cog):
         """Process all your unprocessed materials (UM) to find diamonds, emeralds, lapis and redstone!"""
         # Check if user has started mining
         async with get_session() as session:
-            mining_stats = await session.get(MiningStats, ctx.author.id)
+            # The mine and inventory are joined into the one user query
+            user = await session.get(User, ctx.author.id, options=USER_WITH_MINE)
+            mining_stats = user.mining_stats if user else None
             
             if not mining_stats:
                 embed = EmbedBuilder.error(
@@ -265,8 +272,7 @@ class MiningCommands(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
                 
-            # Get user inventory
-            inventory = await session.get(Inventory, ctx.author.id)
+            inventory = user.inventory
             if not inventory:
                 # Create empty inventory
                 inventory = Inventory(user_id=ctx.author.id)
@@ -335,9 +341,9 @@ class MiningCommands(commands.Cog):
     @commands.hybrid_command(name="inventory", aliases=["inv", "i"])
     async def inventory(self, ctx):
         """Shows your mining inventory"""
-        # Check if user has started mining
-        async with get_session() as session:
-            mining_stats = await session.get(MiningStats, ctx.author.id)
+        # Check if user has started mining; read-only, so served by the read replica
+        async with get_read_session() as session:
+            mining_stats, inventory = await load_mine(session, ctx.author.id)
             
             if not mining_stats:
                 embed = EmbedBuilder.error(
@@ -346,13 +352,8 @@ class MiningCommands(commands.Cog):
                 )
                 return await ctx.send(embed=embed)
                 
-            # Get user inventory
-            inventory = await session.get(Inventory, ctx.author.id)
             if not inventory:
-                # Create empty inventory
-                inventory = Inventory(user_id=ctx.author.id)
-                session.add(inventory)
-                await session.commit()
+                inventory = await self.create_inventory(ctx.author.id)
             
             # Create inventory embed
             embed = EmbedBuilder.info(
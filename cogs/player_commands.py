@@ -3,14 +3,18 @@ from discord import app_commands
 from discord.ext import commands
 import random
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
 import config
 from utils.cooldowns import cooldown
 from utils.embeds import EmbedBuilder
 from utils.economy import EconomyManager
-from utils.helpers import parse_amount, get_mentioned_user, format_number
+from utils.fastmode import suspense, USER
+from utils.helpers import parse_amount, get_mentioned_user, format_number, RoutedView
+from utils.metrics import metrics
 from database.models import User, Transaction
-from database.database import get_session
+from database.database import get_session, get_read_session
+from database.read_models import load_history
+from sqlalchemy import text
 
 class PlayerCommands(commands.Cog):
     """Commands related to player economy and profile management"""
@@ -18,138 +22,152 @@ class PlayerCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.economy = EconomyManager(bot)
+        self.vote_embed = self.build_vote_embed()  # Static part of the vote embed, built once
     
     #
     # PROFILE AND BALANCE COMMANDS
     #
     
     @commands.hybrid_command(name="profile", aliases=["me", "bal", "balance", "my"])
-    @app_commands.describe(page="The sub-page to show")
+    @app_commands.describe(page="The page to show: overview, games, mining or activity")
     async def profile(self, ctx, page: str = None):
         """Show your player stats including cash, top scores and experience"""
-        user_id = ctx.author.id
-        
-        async with get_session() as session:
-            user_db = await session.get(User, user_id)
-            if not user_db:
-                user_db = await self.economy.get_user(user_id)
-            
-            # Get sub-page
-            valid_pages = ["score", "stats", "mine", "achievements", "inventory"]
-            if page and page.lower() in valid_pages:
-                page = page.lower()
-            else:
-                page = None
-            
-            # Generate appropriate embed based on page
-            if page == "score" or page == "stats":
-                # Get top game scores
-                scores = {}  # Replace with actual score fetching
-                embed = EmbedBuilder.profile(
-                    ctx.author, 
-                    user_db.cash,
-                    user_db.level,
-                    user_db.experience,
-                    scores
-                )
-                embed.title = f"{ctx.author.name}'s Game Stats"
-                
-            elif page == "mine":
-                # Show mining stats
-                embed = EmbedBuilder.info(
-                    title=f"{ctx.author.name}'s Mine",
-                    description="Your mining operation stats",
-                    thumbnail=ctx.author.avatar.url if ctx.author.avatar else None
-                )
-                # Add mining stats fields here
-                
-            elif page == "achievements" or page == "inventory":
-                # Show achievements or inventory
-                embed = EmbedBuilder.info(
-                    title=f"{ctx.author.name}'s {page.capitalize()}",
-                    description=f"Your {page}",
-                    thumbnail=ctx.author.avatar.url if ctx.author.avatar else None
-                )
-                # Add achievement or inventory fields here
-                
-            else:
-                # Default profile page
-                embed = EmbedBuilder.profile(
-                    ctx.author, 
-                    user_db.cash,
-                    user_db.level,
-                    user_db.experience
-                )
-                
-                # Add additional profile details
-                embed.add_field(name="Mining Level", value=user_db.mining_level, inline=True)
-                embed.add_field(name="Commands Used", value=user_db.commands_used, inline=True)
-                embed.add_field(name="Games Played", value=user_db.games_played, inline=True)
-            
-            await ctx.send(embed=embed)
+        await self.send_profile(ctx, ctx.author, page)
     
     @commands.hybrid_command(name="lookup", aliases=["find"])
-    @app_commands.describe(user="The user to look up", page="The sub-page to show")
+    @app_commands.describe(user="The user to look up", page="The page to show: overview, games, mining or activity")
     async def lookup(self, ctx, user: discord.Member, page: str = None):
         """Show the stats for a given player including cash, top scores and experience"""
         if not user:
             return await ctx.send("User not found.")
             
-        user_id = user.id
+        await self.send_profile(ctx, user, page)
+    
+    async def send_profile(self, ctx, member, page):
+        """Send one of a member's profile pages, creating their account first if they have none"""
+        embed = await self.bot.profiles.render(member, page)
+        if embed is None:
+            await self.economy.get_user(member.id)
+            embed = await self.bot.profiles.render(member, page)
+            
+        await ctx.send(embed=embed)
+    
+    @commands.hybrid_command(name="fastmode", aliases=["fast", "quick"])
+    @app_commands.describe(setting="On or Off. Leave blank to toggle")
+    async def fastmode(self, ctx, setting: str = None):
+        """Skip game animations and get every result in a single message"""
+        guild_id = ctx.guild.id if ctx.guild else None
+        
+        # Toggle if no setting was given
+        if setting is None:
+            enabled = not self.bot.fast_mode.is_fast(guild_id, ctx.author.id)
+        elif setting.lower() in ["on", "true", "yes", "enable"]:
+            enabled = True
+        elif setting.lower() in ["off", "false", "no", "disable"]:
+            enabled = False
+        else:
+            return await ctx.send("Please choose either 'on' or 'off'!")
+            
+        await self.bot.fast_mode.set(USER, ctx.author.id, enabled)
         
-        async with get_session() as session:
-            user_db = await session.get(User, user_id)
-            if not user_db:
-                user_db = await self.economy.get_user(user_id)
+        if enabled:
+            embed = EmbedBuilder.success(
+                title="Fast Mode On",
+                description="Your games will skip their animations and send results straight away."
+            )
+        else:
+            embed = EmbedBuilder.info(
+                title="Fast Mode Off",
+                description="Your games will play their animations again."
+            )
             
-            # Similar to profile command, but for another user
-            # Generate appropriate embed based on page
-            if page and page.lower() in ["score", "stats"]:
-                # Get top game scores
-                scores = {}  # Replace with actual score fetching
-                embed = EmbedBuilder.profile(
-                    user, 
-                    user_db.cash,
-                    user_db.level,
-                    user_db.experience,
-                    scores
-                )
-                embed.title = f"{user.name}'s Game Stats"
-                
-            elif page and page.lower() == "mine":
-                # Show mining stats
-                embed = EmbedBuilder.info(
-                    title=f"{user.name}'s Mine",
-                    description="Mining operation stats",
-                    thumbnail=user.avatar.url if user.avatar else None
-                )
-                # Add mining stats fields here
-                
-            elif page and page.lower() in ["achievements", "inventory"]:
-                # Show achievements or inventory
-                page = page.lower()
-                embed = EmbedBuilder.info(
-                    title=f"{user.name}'s {page.capitalize()}",
-                    description=f"Their {page}",
-                    thumbnail=user.avatar.url if user.avatar else None
-                )
-                # Add achievement or inventory fields here
-                
-            else:
-                # Default profile page
-                embed = EmbedBuilder.profile(
-                    user, 
-                    user_db.cash,
-                    user_db.level,
-                    user_db.experience
-                )
-                
-                # Add additional profile details
-                embed.add_field(name="Mining Level", value=user_db.mining_level, inline=True)
-                embed.add_field(name="Commands Used", value=user_db.commands_used, inline=True)
-                embed.add_field(name="Games Played", value=user_db.games_played, inline=True)
+        await ctx.send(embed=embed)
+    
+    @commands.hybrid_command(name="history", aliases=["ledger", "transactions"])
+    @app_commands.describe(
+        search="Only show entries whose reason starts with this, like a game name",
+        before="Start from this day (YYYY-MM-DD) and go back",
+        since="Stop at this day (YYYY-MM-DD)"
+    )
+    async def history(self, ctx, search: str = None, before: str = None, since: str = None):
+        """Browse your cash history, newest first"""
+        try:
+            # Starting before a day is a seek to the end of it; nothing is skipped row by row
+            start = (datetime.strptime(before, "%Y-%m-%d") + timedelta(days=1), 0) if before else None
+            since = datetime.strptime(since, "%Y-%m-%d") if since else None
+        except ValueError:
+            return await ctx.send("Dates must look like 2024-01-31.")
+        
+        # Where each page visited so far starts; older pages are only fetched when asked for
+        starts = [start]
+        number = 0
+        session_key = f"history:{ctx.message.id}"
+        
+        async def show_page():
+            with metrics.timer("history.page"):
+                async with get_read_session() as session:
+                    rows, more = await load_history(
+                        session, ctx.author.id, after=starts[number], reason=search, since=since, limit=config.HISTORY_PAGE_SIZE
+                    )
+            if more and number + 1 == len(starts):
+                starts.append((rows[-1].timestamp, rows[-1].id))
+            disabled = set()
+            if number == 0:
+                disabled.update(("newest", "newer"))
+            if not more:
+                disabled.add("older")
+            view = RoutedView(session_key, [
+                ("newest", "⏮️", discord.ButtonStyle.secondary),
+                ("newer", "⬅️", discord.ButtonStyle.secondary),
+                ("older", "➡️", discord.ButtonStyle.secondary),
+                ("close", "❌", discord.ButtonStyle.danger)
+            ], disabled=disabled)
+            return self.build_history_page(ctx.author, rows, number, search, before, since), view
             
-            await ctx.send(embed=embed)
+        with self.bot.router.components_for(session_key, {ctx.author.id}) as clicks:
+            embed, view = await show_page()
+            message = await ctx.send(embed=embed, view=view)
+            
+            while True:
+                try:
+                    interaction, action = await clicks.get(config.HISTORY_TIMEOUT)
+                except asyncio.TimeoutError:
+                    await message.edit(view=None)
+                    break
+                    
+                if action == "close":
+                    await interaction.response.edit_message(view=None)
+                    break
+                elif action == "newest":
+                    number = 0
+                elif action == "newer":
+                    number = max(number - 1, 0)
+                elif action == "older" and number + 1 < len(starts):
+                    number += 1
+                    
+                embed, view = await show_page()
+                await interaction.response.edit_message(embed=embed, view=view)
+    
+    def build_history_page(self, member, rows, number, search, before, since):
+        """Embed for one page of a member's cash history"""
+        filters = []
+        if search:
+            filters.append(f"matching **{search}**")
+        if before:
+            filters.append(f"from {before} back")
+        if since:
+            filters.append(f"since {since:%Y-%m-%d}")
+            
+        lines = [
+            f"`{row.timestamp:%Y-%m-%d %H:%M}` {'+' if row.type == 'credit' else '-'}${row.amount:,} {row.reason or ''}"
+            for row in rows
+        ]
+        embed = EmbedBuilder.info(
+            title=f"{member.name}'s History",
+            description="\n".join(lines) if lines else "No transactions found.",
+            footer=f"Page {number + 1}" + (f" | {', '.join(filters)}" if filters else "")
+        )
+        return embed
     
     #
     # ECONOMY COMMANDS
@@ -309,6 +327,7 @@ class PlayerCommands(commands.Cog):
         show_detailed = detailed in ["detailed", "d"]
         
         # Get all cooldowns for the user
+        await self.bot.cooldowns.refresh(ctx.author.id)
         user_cooldowns = self.bot.cooldowns.get_all_cooldowns(ctx.author.id, show_detailed)
         
         # Create and send the embed
@@ -380,19 +399,23 @@ class PlayerCommands(commands.Cog):
             description=f"{'Global' if is_global else 'Server'} rankings for {leaderboard}"
         )
         
-        # Get leaderboard data (simple implementation for now)
-        async with get_session() as session:
+        # Get leaderboard data (simple implementation for now); read-only, so served by the read replica
+        async with get_read_session() as session:
             if leaderboard.lower() == "cash":
-                query = """
-                SELECT id, cash FROM user
-                ORDER BY cash DESC
-                LIMIT 10
-                """
-                # TODO: Filter by guild if not global
-                
-                # Execute the query
-                result = await session.execute(query)
-                entries = result.all()
+                # Every cluster shares one cached copy, so the query runs at most once per TTL
+                entries = await self.bot.state.get("leaderboard:cash")
+                if entries is None:
+                    query = """
+                    SELECT id, cash FROM user
+                    ORDER BY cash DESC
+                    LIMIT 10
+                    """
+                    # TODO: Filter by guild if not global
+                    
+                    # Execute the query; partitions each return their own top ten, so merge them
+                    result = await session.execute(text(query))
+                    entries = sorted((list(row) for row in result.all()), key=lambda entry: entry[1], reverse=True)[:10]
+                    await self.bot.state.set("leaderboard:cash", entries, ttl=config.LEADERBOARD_CACHE_TTL)
                 
                 # Add entries to embed
                 for i, (user_id, cash) in enumerate(entries, 1):
@@ -414,7 +437,30 @@ class PlayerCommands(commands.Cog):
         # Check for detailed option
         show_detailed = detailed in ["detailed", "d"]
         
-        # Create vote info embed
+        # Start from a copy of the prebuilt vote info embed
+        embed = EmbedBuilder.stamp(self.vote_embed.copy())
+        
+        # Add voting cooldown info
+        if hasattr(self.bot, "cooldowns"):
+            vote_cooldown = self.bot.cooldowns.get_cooldown_remaining(ctx.author.id, "vote")
+            if vote_cooldown > 0:
+                if show_detailed:
+                    from datetime import datetime
+                    # Format as timestamp
+                    dt = datetime.fromtimestamp(time.time() + vote_cooldown)
+                    cooldown_text = discord.utils.format_dt(dt, style='R')
+                else:
+                    # Format as relative time
+                    cooldown_text = self.bot.cooldowns.format_cooldown_time(vote_cooldown)
+                    
+                embed.add_field(name="Cooldown", value=f"You can vote again in {cooldown_text}", inline=False)
+            else:
+                embed.add_field(name="Cooldown", value="You can vote now!", inline=False)
+                
+        await ctx.send(embed=embed)
+    
+    def build_vote_embed(self):
+        """Create the vote info embed, without the per-user cooldown"""
         embed = EmbedBuilder.info(
             title="Vote for Rewards",
             description="Vote for the bot on these sites to get rewards!"
@@ -453,24 +499,7 @@ class PlayerCommands(commands.Cog):
             inline=False
         )
         
-        # Add voting cooldown info
-        if hasattr(self.bot, "cooldowns"):
-            vote_cooldown = self.bot.cooldowns.get_cooldown_remaining(ctx.author.id, "vote")
-            if vote_cooldown > 0:
-                if show_detailed:
-                    from datetime import datetime
-                    # Format as timestamp
-                    dt = datetime.fromtimestamp(time.time() + vote_cooldown)
-                    cooldown_text = discord.utils.format_dt(dt, style='R')
-                else:
-                    # Format as relative time
-                    cooldown_text = self.bot.cooldowns.format_cooldown_time(vote_cooldown)
-                    
-                embed.add_field(name="Cooldown", value=f"You can vote again in {cooldown_text}", inline=False)
-            else:
-                embed.add_field(name="Cooldown", value="You can vote now!", inline=False)
-        
-        await ctx.send(embed=embed)
+        return embed
     
     @commands.hybrid_command(name="spin", aliases=["randomItem"])
     @cooldown("spin")
@@ -506,12 +535,8 @@ class PlayerCommands(commands.Cog):
         # Spin the wheel
         result = random.choice(weighted_items)
         
-        # Send spinning animation
-        message = await ctx.send("Spinning the wheel... 🎡")
-        
-        # Add suspense with typing indicator
-        await ctx.typing()
-        await asyncio.sleep(2)
+        # Send spinning animation with a typing indicator, unless the player wants fast results
+        message = await suspense(ctx, "Spinning the wheel... 🎡", 2, typing=True, combined=False)
         
         # Create result embed
         rarity_colors = {
@@ -531,8 +556,11 @@ class PlayerCommands(commands.Cog):
         embed.add_field(name="Rarity", value=result["rarity"].capitalize(), inline=True)
         embed.add_field(name="Value", value=f"${result['value']:,}", inline=True)
         
-        # Update the message
-        await message.edit(content=None, embed=embed)
+        # Update the message, or send the only message in fast mode
+        if message:
+            await message.edit(content=None, embed=embed)
+        else:
+            await ctx.send(embed=embed)
         
         # TODO: Add the item to the user's inventory
         # For now, just give them the cash value
@@ -32,6 +32,7 @@ VOTE_COOLDOWN = 43200  # 12 hours
 SPIN_COOLDOWN = 7200  # 2 hours
 GIFT_COOLDOWN = 43200  # 12 hours
 DIG_COOLDOWN = 300  # 5 minutes
+EXPORT_COOLDOWN = 3600  # 1 hour
 PROCESS_COOLDOWN = 1800  # 30 minutes
 
 # Mining Configuration
@@ -41,9 +42,84 @@ MINING_COST_MULTIPLIER = 1.5
 # Game Configuration
 MAX_BET = 1000000
 MIN_BET = 10
+AUTOPLAY_MAX_ROUNDS = 1000  # Most rounds a single command can play in one batch
+
+# Blackjack Configuration
+BLACKJACK_DECKS = 6  # Decks per table shoe
+BLACKJACK_PENETRATION = 0.75  # Share of the shoe dealt before reshuffling
+BLACKJACK_TABLE_SEATS = 7  # Max players at a multiplayer table
+BLACKJACK_TABLE_JOIN_WINDOW = 15  # Seconds between hands for players to join or leave
+BLACKJACK_TABLE_ACTION_TIMEOUT = 20  # Seconds per action round before players auto-stand
+BLACKJACK_TABLE_MAX_MISSED = 2  # Timed-out rounds in a row before a player is unseated
+
+# Roulette Configuration
+ROULETTE_MAX_BETS = 20  # Max bets on a single spin
+ROULETTE_TABLE_WINDOW = 30  # Seconds a shared roulette table takes bets before spinning
+
+# Hold'em Configuration
+HOLDEM_MAX_SEATS = 9  # Max players at a Hold'em table
+HOLDEM_MAX_RAISES = 3  # Raises allowed per betting round after the opening bet
+HOLDEM_HAND_DELAY = 10  # Seconds between hands for players to join or leave
+HOLDEM_ACTION_TIMEOUT = 30  # Seconds a player has to act before checking or folding
+HOLDEM_MAX_MISSED = 2  # Timed-out turns in a row before a player is unseated
+
+# Crash Configuration
+CRASH_BETTING_WINDOW = 15  # Seconds a crash round takes bets before launch
+CRASH_HOUSE_EDGE = 0.01  # Expected share of every bet kept by the house
+CRASH_GROWTH = 0.06  # Multiplier growth rate per second (2x after ~11.5s)
+CRASH_MAX_MULTIPLIER = 1000.0  # Hard cap on the crash point
+CRASH_TICK = 0.1  # Seconds between round updates
+CRASH_RENDER_INTERVAL = 1.5  # Minimum seconds between message edits for a round
+
+# Game Session Configuration
+GAME_SESSION_TTL = 600  # Seconds without a move before an in-flight game is expired
+GAME_SESSION_SWEEP_INTERVAL = 60  # Seconds between sweeps for expired game sessions
+
+# Outbound Message Configuration
+OUTBOUND_SENDS_PER_WINDOW = 5  # Messages sent to one channel per rate limit window
+OUTBOUND_EDITS_PER_WINDOW = 5  # Message edits in one channel per rate limit window
+OUTBOUND_WINDOW = 5.0  # Seconds in a per-channel rate limit window
+OUTBOUND_MERGE_LIMIT = 10  # Most embeds merged into one message (Discord's limit)
+
+# Sharding Configuration
+AUTO_SHARD = os.getenv("AUTO_SHARD", "0") == "1"  # Run main.py as a single AutoShardedBot process
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))  # Total shards; 0 uses Discord's recommended count
+CLUSTER_COUNT = int(os.getenv("CLUSTER_COUNT", "2"))  # Processes launcher.py spreads the shards across
+CLUSTER_HEARTBEAT_INTERVAL = 30  # Seconds between each cluster's status reports
+CLUSTER_RESTART_DELAY = 10  # Seconds before the launcher restarts a cluster that exited
+LEADERBOARD_CACHE_TTL = 60  # Seconds a leaderboard is shared between clusters before it is queried again
+PROFILE_CACHE_TTL = 300  # Seconds a rendered profile page is kept; a write to the user drops it sooner
+
+# Shared State Configuration
+STATE_URL = os.getenv("STATE_URL", "memory://")  # memory:// for one process, or redis://host:port/db
+STATE_SERVER_HOST = os.getenv("STATE_SERVER_HOST", "127.0.0.1")  # Where launcher.py stands in for Redis when STATE_URL is memory://
+STATE_SERVER_PORT = int(os.getenv("STATE_SERVER_PORT", "6390"))
 
 # Database Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///database/rocketbot.db")
+DATABASE_PARTITIONS = int(os.getenv("DATABASE_PARTITIONS", "1"))  # SQLite files user-keyed tables are hashed across
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")  # Replica for read-only commands; unset uses a read-only pool on the SQLite file
+REPLICA_LAG_INTERVAL = 30  # Seconds between checks of how stale replica reads are
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "5"))  # Pooled connections per SQLite file (one writer at a time regardless)
+SQLITE_MAX_OVERFLOW = int(os.getenv("SQLITE_MAX_OVERFLOW", "5"))  # Extra connections a SQLite pool may open under load
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))  # Pooled connections for server databases
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))  # Extra connections a server database pool may open under load
+DB_POOL_TIMEOUT = 30  # Seconds a checkout waits for a connection before failing
+DB_POOL_RECYCLE = 300  # Seconds before a pooled connection is replaced
+DB_LIVENESS_INTERVAL = int(os.getenv("DB_LIVENESS_INTERVAL", "30"))  # Seconds between background pings; 0 pings on every checkout instead
+DB_SLOW_CHECKOUT = 0.1  # Seconds a checkout can wait before it is logged as slow
+DEV_MODE = os.getenv("ENV") == "development"  # Count statements per command and log likely N+1 queries
+N_PLUS_ONE_THRESHOLD = 3  # Runs of the same statement in one command before it is logged as an N+1
+ERASURE_USER_BATCH = 500  # Users erased per set of DELETEs
+ERASURE_CHUNK_SIZE = 5000  # Ledger rows deleted per transaction when erasing users
+ERASURE_JOBS_KEPT = 20  # Finished erasure jobs kept for status checks
+ERASURE_PROGRESS_INTERVAL = 3  # Seconds between progress updates on an erasure's message
+EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")  # Where data exports are written
+EXPORT_BATCH_SIZE = 1000  # Ledger rows fetched per batch from the server-side cursor when exporting
+EXPORT_ATTACHMENT_LIMIT = 8 * 1024 * 1024  # Largest export sent as a Discord attachment; bigger ones are kept on disk
+EXPORT_KEEP_DAYS = 7  # How long an export too large to attach stays on disk for the owner to hand over
+HISTORY_PAGE_SIZE = 10  # Ledger entries per page of the history command
+HISTORY_TIMEOUT = 120  # Seconds the history buttons keep working after the last click
 
 # Discord Configuration
 ACTIVITY_TYPE = "playing"
@@ -1,13 +1,18 @@
 import os
+import time
 import asyncio
 import logging
+from datetime import datetime
+from itertools import chain
 from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.future import select
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import text, event
 import config
-from database.models import Base
+from database.models import Base, User, ReplicaHeartbeat
+from database.pool import engine_options
+from utils.metrics import metrics
 
 # Get database URL from config
 DATABASE_URL = config.DATABASE_URL
@@ -21,13 +26,8 @@ if DATABASE_URL.startswith("sqlite"):
     db_path = DATABASE_URL.replace("sqlite+aiosqlite:///", "")
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
-# Create async engine
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=False,  # Set to True for debugging
-    pool_pre_ping=True,
-    pool_recycle=300
-)
+# Create async engine, with pool sizing for the backend
+engine = create_async_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 
 # Create session factory
 async_session = async_sessionmaker(
@@ -36,10 +36,73 @@ async_session = async_sessionmaker(
     class_=AsyncSession
 )
 
+# Reads go to a replica when one is configured, otherwise to a read-only pool on the SQLite file
+READ_DATABASE_URL = config.READ_DATABASE_URL
+if READ_DATABASE_URL:
+    READ_DATABASE_URL = READ_DATABASE_URL.replace("sqlite:///", "sqlite+aiosqlite:///")
+elif DATABASE_URL.startswith("sqlite"):
+    READ_DATABASE_URL = f"sqlite+aiosqlite:///file:{db_path}?mode=ro&uri=true"
+    
+    # WAL lets the read pool run alongside the writer instead of waiting for it
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enable_wal(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+read_engine = engine
+read_session = async_session
+if READ_DATABASE_URL:
+    read_engine = create_async_engine(READ_DATABASE_URL, **engine_options(READ_DATABASE_URL))
+    read_session = async_sessionmaker(
+        read_engine,
+        expire_on_commit=False,
+        class_=AsyncSession
+    )
+
+# Spread user-keyed tables across several files when configured; one file is the default
+partitions = None
+if config.DATABASE_PARTITIONS > 1:
+    from database.partitions import Partitions
+    partitions = Partitions(DATABASE_URL, engine, config.DATABASE_PARTITIONS)
+    async_session = partitions.sharded_sessionmaker()
+    read_session = async_session  # Partitions have no read pools of their own yet
+
+# Called after each commit with the IDs of the users whose rows it changed, e.g. to drop cached pages
+write_listeners = []
+
+def mark_written(session, user_ids):
+    """Record users whose rows a bulk statement changed; ORM objects are picked up on flush"""
+    session = getattr(session, "sync_session", session)
+    session.info.setdefault("written_users", set()).update(user_ids)
+
+@event.listens_for(Session, "after_flush")
+def _track_written_users(session, flush_context):
+    """Note the user behind every object a flush wrote"""
+    for instance in chain(session.new, session.dirty, session.deleted):
+        user_id = instance.id if isinstance(instance, User) else getattr(instance, "user_id", None)
+        if user_id is not None:
+            mark_written(session, (user_id,))
+
+@event.listens_for(Session, "after_commit")
+def _announce_written_users(session):
+    """Tell the write listeners which users a commit changed"""
+    user_ids = session.info.pop("written_users", None)
+    if user_ids:
+        for listener in write_listeners:
+            listener(user_ids)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_written_users(session):
+    """Nothing a rolled back transaction wrote needs announcing"""
+    session.info.pop("written_users", None)
+
 @asynccontextmanager
 async def get_session():
     """Context manager for database sessions"""
     session = async_session()
+    metrics.incr("database.write_sessions")
+    start = time.perf_counter()
     try:
         yield session
     except Exception as e:
@@ -48,12 +111,89 @@ async def get_session():
         raise
     finally:
         await session.close()
+        metrics.observe("database.write_session", time.perf_counter() - start)
+
+@asynccontextmanager
+async def get_read_session():
+    """Context manager for sessions that only read, served by the replica or read-only pool
+    
+    Reads here may trail the latest writes by the replica's lag, so anything
+    that reads a value to change it must use get_session instead.
+    """
+    session = read_session()
+    metrics.incr("database.read_sessions")
+    start = time.perf_counter()
+    try:
+        yield session
+    except Exception as e:
+        await session.rollback()
+        logging.error(f"Database read error: {e}")
+        raise
+    finally:
+        await session.close()
+        metrics.observe("database.read_session", time.perf_counter() - start)
+
+async def track_replica_lag(interval):
+    """Write a heartbeat to the primary and see how old the newest one the read side has is"""
+    while True:
+        try:
+            async with get_session() as session:
+                heartbeat = await session.get(ReplicaHeartbeat, 1)
+                if heartbeat is None:
+                    heartbeat = ReplicaHeartbeat(id=1)
+                    session.add(heartbeat)
+                heartbeat.written_at = datetime.utcnow()
+                await session.commit()
+                
+            async with get_read_session() as session:
+                replica = await session.get(ReplicaHeartbeat, 1)
+            if replica is not None and replica.written_at is not None:
+                metrics.observe("database.replica_staleness", max((datetime.utcnow() - replica.written_at).total_seconds(), 0))
+        except Exception as e:
+            logging.warning(f"Replica lag check failed: {e}")
+        await asyncio.sleep(interval)
+
+def engines():
+    """Every engine the bot uses, by name"""
+    named = {"primary": engine}
+    if read_engine is not engine:
+        named["read"] = read_engine
+    if partitions is not None:
+        for index, partition_engine in enumerate(partitions.engines[1:], 1):
+            named[f"partition {index}"] = partition_engine
+    return named
+
+def user_sessions(user_ids):
+    """Session factories paired with the users whose rows each one holds
+    
+    Bulk writes to user-keyed tables go through these, one transaction per
+    partition. Without partitioning it is just get_session with every user.
+    """
+    if partitions is None:
+        return [(get_session, list(user_ids))]
+    return [
+        (lambda index=index: partitions.session(index), ids)
+        for index, ids in partitions.group(user_ids)
+    ]
+
+def all_sessions():
+    """Session factories for every database partition, for work that isn't about particular users"""
+    if partitions is None:
+        return [get_session]
+    return [lambda index=index: partitions.session(index) for index in range(partitions.count)]
+
+def create_indexes(sync_conn, tables=None):
+    """Add declared indexes that are missing; create_all only makes them along with a new table"""
+    for table in tables or Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
 
 async def init_db():
     """Initialize the database and create tables"""
     async with engine.begin() as conn:
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_indexes)
         
         # Check connection
         try:
@@ -64,6 +204,9 @@ async def init_db():
             logging.error(f"Database connection failed: {e}")
             raise
     
+    if partitions is not None:
+        await partitions.init()
+        
     logging.info("Database initialized")
 
 async def verify_db():
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import time
+import uuid
+from sqlalchemy import select, delete
+import config
+from database.database import get_session, user_sessions, mark_written
+from database.models import (
+    User, Transaction, GameStats, MiningStats, MiningUnit, Inventory, Boost, UserGoal, FastModeSetting,
+    GameSession, HeldStake
+)
+from utils.fastmode import USER
+from utils.metrics import metrics
+from utils.sessions import busy_users
+
+# Tables outside the partitions, cleared through the main database first
+MAIN_TABLES = (
+    (Boost, Boost.user_id),
+    (UserGoal, UserGoal.user_id),
+)
+
+# Partitioned tables in foreign key order, children before the rows they point at
+PARTITION_TABLES = (
+    (HeldStake, HeldStake.user_id),
+    (MiningUnit, MiningUnit.user_id),
+    (MiningStats, MiningStats.user_id),
+    (Inventory, Inventory.user_id),
+    (GameStats, GameStats.user_id),
+    (User, User.id),
+)
+
+def _batches(values, size):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+class ErasureJob:
+    """Progress of erasing a set of users, shared between the job and whoever is watching it"""
+
+    def __init__(self, user_ids, requested_by=None):
+        self.id = uuid.uuid4().hex[:8]
+        self.user_ids = sorted(set(user_ids))
+        self.requested_by = requested_by
+        self.status = "queued"  # queued, running, done or failed
+        self.erased = 0  # Users fully erased
+        self.skipped = []  # Users left alone because they were in a game
+        self.deleted = {}  # Table name -> rows deleted
+        self.error = None
+        self.started = None
+        self.finished = None
+        self.task = None
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed")
+
+    def count(self, table, rows):
+        if rows > 0:
+            self.deleted[table] = self.deleted.get(table, 0) + rows
+
+    def summary(self):
+        """One line of progress for a status message"""
+        rows = sum(self.deleted.values())
+        text = f"{self.erased:,}/{len(self.user_ids):,} users erased, {rows:,} rows deleted"
+        if self.skipped:
+            text += f", {len(self.skipped):,} skipped while in a game"
+        if self.finished:
+            text += f" in {self.finished - self.started:,.1f}s"
+        if self.error:
+            text += f" (failed: {self.error})"
+        return text
+
+async def erase_users(job, state=None):
+    """Delete every row belonging to a job's users with set-based DELETEs, in foreign key order
+
+    Users in a game right now are skipped, since settling the game would
+    create them again; stakes and saved games left behind by a game that is
+    no longer running are deleted with everything else. Each batch of users
+    has its ledger deleted first, a chunk of rows per transaction so SQLite's
+    single writer is never held for long. Then its remaining rows go in one
+    transaction, ending with the user rows. A batch that fails part way
+    leaves its users in place, so running the job again picks up where it
+    stopped.
+    """
+    for batch in _batches(job.user_ids, config.ERASURE_USER_BATCH):
+        if state is not None:
+            busy = set(await busy_users(state, batch))
+            if busy:
+                job.skipped.extend(busy)
+                batch = [user_id for user_id in batch if user_id not in busy]
+                if not batch:
+                    continue
+        
+        # Boosts, goals and saved games live in the main database whatever the partitioning
+        async with get_session() as session:
+            for model, column in MAIN_TABLES:
+                result = await session.execute(delete(model).where(column.in_(batch)))
+                job.count(model.__tablename__, result.rowcount)
+            result = await session.execute(
+                delete(FastModeSetting).where(FastModeSetting.scope == USER, FastModeSetting.target_id.in_(batch))
+            )
+            job.count(FastModeSetting.__tablename__, result.rowcount)
+            
+            # Player lists are JSON, so find the saved games to drop here; there are only ever a few
+            erasing = set(batch)
+            result = await session.execute(select(GameSession.id, GameSession.player_ids))
+            stale = [key for key, player_ids in result.all() if erasing.intersection(player_ids or [])]
+            if stale:
+                result = await session.execute(delete(GameSession).where(GameSession.id.in_(stale)))
+                job.count(GameSession.__tablename__, result.rowcount)
+            await session.commit()
+
+        for session_factory, user_ids in user_sessions(batch):
+            async with session_factory() as session:
+                # The ledger can run to many thousands of rows, so delete it a chunk at a time
+                while True:
+                    chunk = (
+                        select(Transaction.id)
+                        .where(Transaction.user_id.in_(user_ids))
+                        .limit(config.ERASURE_CHUNK_SIZE)
+                        .scalar_subquery()
+                    )
+                    result = await session.execute(delete(Transaction).where(Transaction.id.in_(chunk)))
+                    await session.commit()
+                    job.count(Transaction.__tablename__, result.rowcount)
+                    if result.rowcount < config.ERASURE_CHUNK_SIZE:
+                        break
+                    await asyncio.sleep(0)  # Let commands queued behind the writer through
+
+                for model, column in PARTITION_TABLES:
+                    result = await session.execute(delete(model).where(column.in_(user_ids)))
+                    job.count(model.__tablename__, result.rowcount)
+                mark_written(session, user_ids)
+                await session.commit()
+        job.erased += len(batch)
+
+class ErasureJobs:
+    """Erasure jobs running in the background, kept so their progress can be checked"""
+
+    def __init__(self, on_erased=None, state=None):
+        self.jobs = {}  # job id -> ErasureJob
+        self.on_erased = on_erased  # Called with the user IDs of each finished job
+        self.state = state  # Shared state, to leave players in a game alone
+
+    def start(self, user_ids, requested_by=None):
+        """Queue users for erasure and return the job tracking it"""
+        job = ErasureJob(user_ids, requested_by)
+        # Only the most recent finished jobs are kept for status checks
+        finished = [old.id for old in self.jobs.values() if old.done]
+        for job_id in finished[:-config.ERASURE_JOBS_KEPT]:
+            del self.jobs[job_id]
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self.run(job))
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    async def run(self, job):
+        job.status = "running"
+        job.started = time.monotonic()
+        try:
+            await erase_users(job, self.state)
+            job.status = "done"
+            metrics.incr("erasure.users", job.erased)
+            if self.on_erased:
+                skipped = set(job.skipped)
+                self.on_erased([user_id for user_id in job.user_ids if user_id not in skipped])
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            metrics.incr("erasure.failures")
+            logging.error(f"Erasure job {job.id} failed after {job.summary()}")
+        finally:
+            job.finished = time.monotonic()
+            metrics.observe("erasure.job", job.finished - job.started)
+            logging.info(f"Erasure job {job.id} {job.status}: {job.summary()}")
@@ -0,0 +1,113 @@
+import asyncio
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+from sqlalchemy import select
+import config
+from database import database
+from database.database import get_read_session
+from database.models import (
+    User, Transaction, GameStats, MiningStats, MiningUnit, Inventory, Boost, UserGoal, FastModeSetting
+)
+from utils.fastmode import USER
+
+# Everything written about a user before their ledger, as (record type, table, filter)
+EXPORT_TABLES = (
+    ("user", User.__table__, lambda user_id: User.id == user_id),
+    ("mining_stats", MiningStats.__table__, lambda user_id: MiningStats.user_id == user_id),
+    ("mining_unit", MiningUnit.__table__, lambda user_id: MiningUnit.user_id == user_id),
+    ("inventory", Inventory.__table__, lambda user_id: Inventory.user_id == user_id),
+    ("game_stats", GameStats.__table__, lambda user_id: GameStats.user_id == user_id),
+    ("boost", Boost.__table__, lambda user_id: Boost.user_id == user_id),
+    ("user_goal", UserGoal.__table__, lambda user_id: UserGoal.user_id == user_id),
+    ("fast_mode_setting", FastModeSetting.__table__, lambda user_id: (FastModeSetting.scope == USER) & (FastModeSetting.target_id == user_id)),
+)
+
+def _default(value):
+    """JSON for the column types the standard encoder doesn't know"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def _line(record, mapping):
+    return json.dumps({"record": record, **mapping}, default=_default, separators=(",", ":")) + "\n"
+
+def _write(out, record, rows):
+    """Encode and compress a batch of rows; run in a worker thread so the event loop keeps going"""
+    out.writelines(_line(record, row) for row in rows)
+
+def _ledger_session(user_id):
+    """A session on the database holding a user's ledger, which streaming needs to be a plain one"""
+    if database.partitions is None:
+        return get_read_session()
+    return database.partitions.session(database.partitions.partition_for(user_id))
+
+async def export_user(user_id, path):
+    """Write everything stored about a user to path as gzipped NDJSON, one row per line
+
+    The ledger is read through a server-side cursor in batches of
+    EXPORT_BATCH_SIZE and written as it arrives, so memory stays flat however
+    long a user's history is. Encoding, compression and file writes happen in
+    a worker thread. Returns the rows written per record type.
+    """
+    counts = {}
+    out = await asyncio.to_thread(gzip.open, path, "wt", encoding="utf-8")
+    try:
+        await asyncio.to_thread(_write, out, "export", [{"user_id": user_id, "exported_at": datetime.utcnow()}])
+        async with get_read_session() as session:
+            for record, table, where in EXPORT_TABLES:
+                result = await session.execute(select(table).where(where(user_id)))
+                rows = result.mappings().all()
+                if rows:
+                    await asyncio.to_thread(_write, out, record, rows)
+                    counts[record] = counts.get(record, 0) + len(rows)
+
+        async with _ledger_session(user_id) as session:
+            ledger = Transaction.__table__
+            result = await session.stream(
+                select(ledger)
+                .where(ledger.c.user_id == user_id)
+                .order_by(ledger.c.timestamp, ledger.c.id)
+                .execution_options(yield_per=config.EXPORT_BATCH_SIZE)
+            )
+            async for rows in result.mappings().partitions():
+                await asyncio.to_thread(_write, out, "transaction", rows)
+                counts["transaction"] = counts.get("transaction", 0) + len(rows)
+    finally:
+        await asyncio.to_thread(out.close)
+    return counts
+
+def export_path(user_id):
+    """Where an export for a user is written"""
+    os.makedirs(config.EXPORT_DIR, exist_ok=True)
+    return os.path.join(config.EXPORT_DIR, f"{user_id}-{datetime.utcnow():%Y%m%d%H%M%S}.ndjson.gz")
+
+def prune_exports(max_age=None):
+    """Delete exports older than max_age seconds (EXPORT_KEEP_DAYS by default), returning how many went"""
+    if max_age is None:
+        max_age = config.EXPORT_KEEP_DAYS * 86400
+    if not os.path.isdir(config.EXPORT_DIR):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(config.EXPORT_DIR):
+        if entry.is_file() and entry.name.endswith(".ndjson.gz") and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+if __name__ == "__main__":
+    # Owner CLI: python -m database.export <user id> [output path]
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m database.export <user id> [output path]")
+        sys.exit(1)
+    user_id = int(sys.argv[1])
+    path = sys.argv[2] if len(sys.argv) > 2 else export_path(user_id)
+    counts = asyncio.run(export_user(user_id, path))
+    print(f"Wrote {sum(counts.values()):,} rows to {path} ({os.path.getsize(path):,} bytes)")
+    for record, rows in counts.items():
+        print(f"  {record}: {rows:,}")
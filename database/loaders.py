@@ -0,0 +1,20 @@
+from sqlalchemy.orm import joinedload, selectinload
+from database.models import User, MiningStats
+
+# Every relationship is declared lazy="raise_on_sql", so reaching one that wasn't
+# loaded fails loudly instead of running a query per object (or failing under
+# asyncio with no greenlet to run it in). Each way the models are read picks its
+# strategy here: one-to-one rows are joined into the same SELECT, collections
+# come from one extra "WHERE ... IN" query however many parents there are.
+
+# A miner with their mine and inventory in one SELECT, for dig, process and start_mine
+USER_WITH_MINE = (joinedload(User.mining_stats), joinedload(User.inventory))
+
+# A user with their record at every game
+USER_WITH_GAME_STATS = (selectinload(User.stats),)
+
+# A user with their active boosts
+USER_WITH_BOOSTS = (selectinload(User.boosts),)
+
+# A mine with all of its mining units
+MINE_WITH_UNITS = (selectinload(MiningStats.mining_units),)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Table, DateTime, Text, ARRAY, JSON, PrimaryKeyConstraint
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Table, DateTime, Text, ARRAY, JSON, PrimaryKeyConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -25,12 +25,12 @@ class User(Base):
     mining_level = Column(Integer, default=1)
     lottery_tickets = Column(Integer, default=0)
     
-    # Relationships
-    stats = relationship("GameStats", back_populates="user")
-    mining_stats = relationship("MiningStats", uselist=False, back_populates="user")
-    inventory = relationship("Inventory", uselist=False, back_populates="user")
-    transactions = relationship("Transaction", back_populates="user")
-    boosts = relationship("Boost", back_populates="user")
+    # Relationships; nothing loads implicitly (see database/loaders.py for the options to use)
+    stats = relationship("GameStats", back_populates="user", lazy="raise_on_sql")
+    mining_stats = relationship("MiningStats", uselist=False, back_populates="user", lazy="raise_on_sql")
+    inventory = relationship("Inventory", uselist=False, back_populates="user", lazy="raise_on_sql")
+    transactions = relationship("Transaction", back_populates="user", lazy="write_only", passive_deletes=True)  # Too many to load; query with user.transactions.select()
+    boosts = relationship("Boost", back_populates="user", lazy="raise_on_sql")
 
 class Transaction(Base):
     """Model representing a cash transaction"""
@@ -44,7 +44,12 @@ class Transaction(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    user = relationship("User", back_populates="transactions")
+    user = relationship("User", back_populates="transactions", lazy="raise_on_sql")
+    
+    # Keyset pages of a user's history are read straight from this index, newest first
+    __table_args__ = (
+        Index("ix_transaction_history", "user_id", "timestamp", "id", "type", "amount", "reason"),
+    )
 
 class GameStats(Base):
     """Model representing a user's stats for a specific game"""
@@ -60,7 +65,7 @@ class GameStats(Base):
     last_played = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    user = relationship("User", back_populates="stats")
+    user = relationship("User", back_populates="stats", lazy="raise_on_sql")
     
     # Composite primary key
     __table_args__ = (
@@ -82,8 +87,8 @@ class MiningStats(Base):
     last_process = Column(DateTime)
     
     # Relationships
-    user = relationship("User", back_populates="mining_stats")
-    mining_units = relationship("MiningUnit", back_populates="mining_stats")
+    user = relationship("User", back_populates="mining_stats", lazy="raise_on_sql")
+    mining_units = relationship("MiningUnit", back_populates="mining_stats", lazy="raise_on_sql")
 
 class MiningUnit(Base):
     """Model representing a mining unit that generates resources"""
@@ -98,7 +103,7 @@ class MiningUnit(Base):
     last_collected = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    mining_stats = relationship("MiningStats", back_populates="mining_units")
+    mining_stats = relationship("MiningStats", back_populates="mining_units", lazy="raise_on_sql")
 
 class Inventory(Base):
     """Model representing a user's inventory"""
@@ -128,7 +133,7 @@ class Inventory(Base):
     items = Column(JSON, default=dict)
     
     # Relationships
-    user = relationship("User", back_populates="inventory")
+    user = relationship("User", back_populates="inventory", lazy="raise_on_sql")
 
 class Boost(Base):
     """Model representing a temporary boost"""
@@ -143,7 +148,7 @@ class Boost(Base):
     is_active = Column(Boolean, default=True)
     
     # Relationships
-    user = relationship("User", back_populates="boosts")
+    user = relationship("User", back_populates="boosts", lazy="raise_on_sql")
 
 class GuildConfig(Base):
     """Model representing a Discord guild's configuration"""
@@ -192,3 +197,72 @@ class UserGoal(Base):
     __table_args__ = (
         PrimaryKeyConstraint('user_id', 'goal_id', name='pk_user_goal'),
     )
+
+class GameSession(Base):
+    """Model representing an in-flight game that should survive a restart"""
+    __tablename__ = "game_session"
+    
+    id = Column(String(64), primary_key=True)  # Session key, e.g. "bj:<message id>"
+    game_name = Column(String(32), nullable=False)
+    channel_id = Column(Integer, nullable=False)
+    message_id = Column(Integer)  # Message carrying the game's buttons
+    player_ids = Column(JSON, default=list)  # Discord user IDs locked into the game
+    bet_amount = Column(Integer, default=0)
+    state = Column(Text)  # Compact JSON snapshot of the game state
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+class HeldStake(Base):
+    """Model representing a stake taken from a player for a bet that hasn't been settled yet"""
+    __tablename__ = "held_stake"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    round_key = Column(String(64), nullable=False)  # The round the stake rides on, e.g. "crash:<uuid>"
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    game_name = Column(String(32), nullable=False)
+    channel_id = Column(Integer)
+    amount = Column(Integer, nullable=False)
+    owner = Column(Integer)  # Cluster running the round, None for a single process
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_held_stake_round", "round_key", "user_id"),
+    )
+
+class FastModeSetting(Base):
+    """Model representing a guild's or user's choice to skip game animations"""
+    __tablename__ = "fast_mode_setting"
+    
+    scope = Column(String(8), primary_key=True)  # guild or user
+    target_id = Column(Integer, primary_key=True)  # Discord guild or user ID
+    enabled = Column(Boolean, default=True)
+    last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Composite primary key
+    __table_args__ = (
+        PrimaryKeyConstraint('scope', 'target_id', name='pk_fast_mode_setting'),
+    )
+
+class PartitionTransfer(Base):
+    """Model recording one side of a cash transfer between two database partitions"""
+    __tablename__ = "partition_transfer"
+    
+    id = Column(String(36), primary_key=True)  # Transfer ID shared by both sides
+    role = Column(String(8), primary_key=True)  # outgoing (sender's partition) or incoming (receiver's)
+    sender_id = Column(Integer, nullable=False)
+    receiver_id = Column(Integer, nullable=False)
+    amount = Column(Integer, nullable=False)  # Taken from the sender
+    final_amount = Column(Integer, nullable=False)  # Given to the receiver after tax
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Composite primary key
+    __table_args__ = (
+        PrimaryKeyConstraint('id', 'role', name='pk_partition_transfer'),
+    )
+
+class ReplicaHeartbeat(Base):
+    """Model holding a timestamp written to the primary to measure how far the read replica trails it"""
+    __tablename__ = "replica_heartbeat"
+    
+    id = Column(Integer, primary_key=True)
+    written_at = Column(DateTime, default=datetime.utcnow)
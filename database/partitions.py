@@ -0,0 +1,358 @@
+import hashlib
+import logging
+import os
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, update, delete, Table
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.sql import visitors, operators
+import config
+from database.models import Base, User, Transaction, PartitionTransfer
+from database.pool import engine_options
+
+# Tables keyed by user that are spread across partitions; everything else stays in partition 0
+PARTITIONED_TABLES = ("user", "inventory", "mining_stats", "mining_unit", "game_stats", "transaction", "held_stake", "partition_transfer")
+
+# The column each partitioned table is routed by
+PARTITION_KEYS = {"user": "id", "partition_transfer": None}
+
+MAIN = "0"
+
+def partition_for(user_id, count):
+    """The partition a user's rows live in
+
+    Discord IDs are timestamps in their high bits and counters in their low
+    ones, so they are hashed rather than taken modulo the count.
+    """
+    if count == 1:
+        return 0
+    digest = hashlib.blake2b(int(user_id).to_bytes(8, "big", signed=True), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+def partition_url(url, index):
+    """Partition 0 is the main database; the others sit beside it as <name>.p<index>.db"""
+    if index == 0:
+        return url
+    base, extension = os.path.splitext(url)
+    return f"{base}.p{index}{extension or '.db'}"
+
+def _partition_column(table):
+    """The column a partitioned table is routed by"""
+    key = PARTITION_KEYS.get(table.name, "user_id")
+    return table.c[key] if key else None
+
+class Partitions:
+    """User-keyed tables hash-partitioned across several SQLite files, each with its own engine and writer
+
+    Sessions come from a sharded session factory, so session.get, session.add
+    and selects that name user IDs are routed to the right file without the
+    caller knowing. Bulk inserts must pick a partition explicitly through
+    session(index), and cash moving between two partitions goes through
+    transfer_cash's two-phase protocol.
+    """
+
+    def __init__(self, url, main_engine, count):
+        self.count = count
+        self.engines = [main_engine]
+        for index in range(1, count):
+            partition = partition_url(url, index)
+            self.engines.append(create_async_engine(partition, **engine_options(partition)))
+        self.sessionmakers = [
+            async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+            for engine in self.engines
+        ]
+        self.tables = [Base.metadata.tables[name] for name in PARTITIONED_TABLES]
+
+    def partition_for(self, user_id):
+        return partition_for(user_id, self.count)
+
+    def sharded_sessionmaker(self):
+        """A session factory that routes each statement to the partitions it touches"""
+        return async_sessionmaker(
+            sync_session_class=ShardedSession,
+            expire_on_commit=False,
+            shards={str(index): engine.sync_engine for index, engine in enumerate(self.engines)},
+            shard_chooser=self._shard_chooser,
+            identity_chooser=self._identity_chooser,
+            execute_chooser=self._execute_chooser
+        )
+
+    def _shard_chooser(self, mapper, instance, clause=None):
+        """Where a new or changed object is written"""
+        table = mapper.local_table if mapper is not None else None
+        if table is None or table.name not in PARTITIONED_TABLES or instance is None:
+            return MAIN
+        if table.name == "partition_transfer":
+            raise ValueError("Partition transfers must be written through Partitions.session")
+        column = _partition_column(table)
+        return str(self.partition_for(getattr(instance, column.key)))
+
+    def _identity_chooser(self, mapper, primary_key, *, lazy_loaded_from, execution_options, bind_arguments, **kw):
+        """Where session.get looks for a primary key"""
+        if lazy_loaded_from is not None:
+            return [lazy_loaded_from.identity_token]
+        table = mapper.local_table
+        if table.name not in PARTITIONED_TABLES:
+            return [MAIN]
+        column = _partition_column(table)
+        if column is not None and column in table.primary_key.columns.values():
+            user_id = primary_key[list(table.primary_key.columns).index(column)]
+            return [str(self.partition_for(user_id))]
+        return [str(index) for index in range(self.count)]
+
+    def _execute_chooser(self, context):
+        """Which partitions a statement runs against"""
+        statement = context.statement
+        if getattr(statement, "is_insert", False):
+            table = statement.table
+            if table.name in PARTITIONED_TABLES:
+                raise ValueError(f"Bulk inserts into {table.name} must go through Partitions.session")
+            return [MAIN]
+
+        tables = set()
+        if getattr(statement, "is_dml", False):
+            tables.add(statement.table)
+        elif hasattr(statement, "get_final_froms"):
+            for from_clause in statement.get_final_froms():
+                tables.update(element for element in visitors.iterate(from_clause) if isinstance(element, Table))
+        if not tables:
+            # Raw SQL and anything else whose tables can't be read may need any partition;
+            # callers merge the rows, like for any statement that isn't narrowed to some users
+            return [str(index) for index in range(self.count)]
+        partitioned = [table for table in tables if table.name in PARTITIONED_TABLES]
+        if not partitioned:
+            return [MAIN]
+
+        # Narrow to the users the WHERE clause names; otherwise every partition answers
+        parameters = context.parameters if isinstance(context.parameters, dict) else {}
+        user_ids = self._named_users(statement, partitioned, parameters)
+        if user_ids is None:
+            return [str(index) for index in range(self.count)]
+        return sorted({str(self.partition_for(user_id)) for user_id in user_ids})
+
+    def _named_users(self, statement, tables, parameters):
+        """User IDs from "key = x" or "key IN (...)" comparisons, or None if the statement isn't limited to some
+        
+        Values come from the statement itself or, for prebuilt statements with
+        bindparam placeholders, from the parameters passed to execute.
+        """
+        whereclause = getattr(statement, "whereclause", None)
+        if whereclause is None:
+            return None
+        columns = {_partition_column(table) for table in tables}
+        columns.discard(None)
+        user_ids = set()
+        found = False
+
+        def visit_binary(binary):
+            nonlocal found
+            if binary.left not in columns:
+                return
+            right = binary.right
+            value = getattr(right, "value", None)
+            if value is None and getattr(right, "key", None) in parameters:
+                value = parameters[right.key]
+            elif value is not None:
+                value = right.effective_value
+            if value is None:
+                return
+            if binary.operator == operators.eq:
+                user_ids.add(value)
+                found = True
+            elif binary.operator == operators.in_op:
+                user_ids.update(value)
+                found = True
+
+        visitors.traverse(whereclause, {}, {"binary": visit_binary})
+        # An OR could reach users the comparisons don't name, so only trust pure AND filters
+        if not found or any(getattr(element, "operator", None) == operators.or_ for element in visitors.iterate(whereclause)):
+            return None
+        return user_ids
+
+    @asynccontextmanager
+    async def session(self, index):
+        """A plain session on one partition"""
+        session = self.sessionmakers[index]()
+        try:
+            yield session
+        except Exception as e:
+            await session.rollback()
+            logging.error(f"Database error in partition {index}: {e}")
+            raise
+        finally:
+            await session.close()
+
+    def group(self, user_ids):
+        """Split user IDs by partition, as (index, [user IDs]) pairs"""
+        grouped = {}
+        for user_id in user_ids:
+            grouped.setdefault(self.partition_for(user_id), []).append(user_id)
+        return sorted(grouped.items())
+
+    async def init(self):
+        """Create the user-keyed tables in every partition and finish any interrupted transfers"""
+        from database.database import create_indexes
+        for index, engine in enumerate(self.engines):
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all, tables=self.tables)
+                await conn.run_sync(create_indexes, self.tables)
+        recovered = await self.recover_transfers()
+        if recovered:
+            logging.warning(f"Completed {recovered} interrupted cross-partition transfers")
+        logging.info(f"Database partitioned across {self.count} files")
+
+    async def transfer_cash(self, sender_id, receiver_id, amount, final_amount):
+        """Move cash between users in different partitions with a small two-phase protocol
+
+        1. Prepare: the sender's partition debits them and logs an outgoing
+           record in the same transaction. Nothing has happened if this fails.
+        2. Apply: the receiver's partition credits them and writes an incoming
+           record, which makes the step safe to repeat.
+        3. Complete: the outgoing record is deleted.
+
+        Once prepared, a transfer always goes through: recover_transfers
+        re-applies any outgoing record left behind by a crash. Returns the new
+        balances, or None if the sender can't afford it.
+        """
+        from database.database import mark_written  # database.database imports this module
+        transfer_id = str(uuid.uuid4())
+        sender_partition = self.partition_for(sender_id)
+
+        # 1. Prepare
+        async with self.session(sender_partition) as session:
+            result = await session.execute(
+                update(User)
+                .where(User.id == sender_id, User.cash >= amount)
+                .values(cash=User.cash - amount)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                await session.rollback()
+                return None
+            await session.execute(insert(Transaction).values(
+                user_id=sender_id, amount=amount, type="debit", reason=f"Transfer to {receiver_id}"
+            ))
+            await session.execute(insert(PartitionTransfer).values(
+                id=transfer_id, role="outgoing", sender_id=sender_id, receiver_id=receiver_id,
+                amount=amount, final_amount=final_amount
+            ))
+            sender_balance = (await session.execute(select(User.cash).where(User.id == sender_id))).scalar_one()
+            mark_written(session, (sender_id,))
+            await session.commit()
+
+        # 2. Apply, then 3. complete
+        receiver_balance = await self._apply(transfer_id, sender_id, receiver_id, amount, final_amount)
+        await self._complete(sender_partition, transfer_id)
+        return {"sender_balance": sender_balance, "receiver_balance": receiver_balance}
+
+    async def _apply(self, transfer_id, sender_id, receiver_id, amount, final_amount):
+        """Credit the receiver once, however many times this runs for a transfer"""
+        from database.database import mark_written
+        async with self.session(self.partition_for(receiver_id)) as session:
+            applied = await session.get(PartitionTransfer, (transfer_id, "incoming"))
+            if applied is None:
+                if await session.get(User, receiver_id) is None:
+                    await session.execute(insert(User).values(
+                        id=receiver_id, cash=config.STARTING_CASH, level=1, experience=0
+                    ))
+                await session.execute(
+                    update(User)
+                    .where(User.id == receiver_id)
+                    .values(cash=User.cash + final_amount)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.execute(insert(Transaction).values(
+                    user_id=receiver_id, amount=final_amount, type="credit", reason=f"Transfer from {sender_id}"
+                ))
+                await session.execute(insert(PartitionTransfer).values(
+                    id=transfer_id, role="incoming", sender_id=sender_id, receiver_id=receiver_id,
+                    amount=amount, final_amount=final_amount
+                ))
+            balance = (await session.execute(select(User.cash).where(User.id == receiver_id))).scalar_one()
+            mark_written(session, (receiver_id,))
+            await session.commit()
+            return balance
+
+    async def _complete(self, sender_partition, transfer_id):
+        async with self.session(sender_partition) as session:
+            await session.execute(
+                delete(PartitionTransfer)
+                .where(PartitionTransfer.id == transfer_id, PartitionTransfer.role == "outgoing")
+            )
+            await session.commit()
+
+    async def recover_transfers(self):
+        """Finish transfers that were prepared but never completed, and drop old incoming records"""
+        recovered = 0
+        for index in range(self.count):
+            async with self.session(index) as session:
+                result = await session.execute(select(PartitionTransfer).where(PartitionTransfer.role == "outgoing"))
+                outgoing = result.scalars().all()
+                await session.execute(
+                    delete(PartitionTransfer)
+                    .where(PartitionTransfer.role == "incoming", PartitionTransfer.created_at < datetime.utcnow() - timedelta(days=1))
+                )
+                await session.commit()
+
+            for transfer in outgoing:
+                await self._apply(transfer.id, transfer.sender_id, transfer.receiver_id, transfer.amount, transfer.final_amount)
+                await self._complete(index, transfer.id)
+                recovered += 1
+        return recovered
+
+def benchmark(partition_counts=(1, 2, 4, 8), writes=4000):
+    """Write throughput as partitions are added, each written by its own thread like aiosqlite's
+
+    Each write is a small transaction like a settled bet: a balance update and a
+    ledger row. Uses the standard library's sqlite3 so it runs anywhere.
+    """
+    import sqlite3
+    import tempfile
+    import threading
+    import time
+
+    results = {}
+    for count in partition_counts:
+        directory = tempfile.mkdtemp()
+        paths = [os.path.join(directory, f"bench.p{index}.db") for index in range(count)]
+        for path in paths:
+            connection = sqlite3.connect(path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE user (id INTEGER PRIMARY KEY, cash INTEGER NOT NULL)")
+            connection.execute("CREATE TABLE ledger (id INTEGER PRIMARY KEY, user_id INTEGER, amount INTEGER)")
+            connection.commit()
+            connection.close()
+
+        # Route every user to its partition up front
+        user_ids = [(1 << 40) + i * 7919 for i in range(1000)]
+        queues = [[] for _ in range(count)]
+        for i in range(writes):
+            user_id = user_ids[i % len(user_ids)]
+            queues[partition_for(user_id, count)].append(user_id)
+
+        def writer(path, queue):
+            connection = sqlite3.connect(path)
+            for user_id in queue:
+                connection.execute("INSERT INTO user VALUES (?, 1000) ON CONFLICT(id) DO UPDATE SET cash = cash + 10", (user_id,))
+                connection.execute("INSERT INTO ledger (user_id, amount) VALUES (?, 10)", (user_id,))
+                connection.commit()
+            connection.close()
+
+        threads = [threading.Thread(target=writer, args=(path, queue)) for path, queue in zip(paths, queues)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        results[count] = writes / elapsed
+    return results
+
+if __name__ == "__main__":
+    results = benchmark()
+    base = results[min(results)]
+    print(f"{os.cpu_count()} cores")
+    for count, rate in results.items():
+        print(f"{count} partition{'s' if count != 1 else ''}: {rate:,.0f} writes/s ({rate / base:.1f}x)")
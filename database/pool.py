@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import time
+from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+import config
+from utils.metrics import metrics
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """A queue pool that records how long each checkout waited and logs the slow ones"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        connection = super()._do_get()
+        waited = time.perf_counter() - start
+        metrics.observe("pool.checkout_wait", waited)
+        if waited >= config.DB_SLOW_CHECKOUT:
+            metrics.incr("pool.slow_checkouts")
+            logging.warning(
+                f"Slow database checkout: waited {waited * 1000:.0f}ms with "
+                f"{self.checkedout()} in use and {max(self.overflow(), 0)} overflow"
+            )
+        return connection
+
+def engine_options(url):
+    """Pool settings for a database URL, sized for its backend
+
+    SQLite has a single writer, so a few connections are plenty; server
+    databases get a larger pool. With a liveness interval set, a background
+    check replaces the ping SQLAlchemy would otherwise send on every checkout.
+    """
+    options = {
+        "echo": False,
+        "pool_pre_ping": config.DB_LIVENESS_INTERVAL <= 0,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_timeout": config.DB_POOL_TIMEOUT
+    }
+    if ":memory:" in url or "mode=memory" in url:
+        return {"echo": False}
+    if url.startswith("sqlite"):
+        options.update(pool_size=config.SQLITE_POOL_SIZE, max_overflow=config.SQLITE_MAX_OVERFLOW)
+    else:
+        options.update(pool_size=config.DB_POOL_SIZE, max_overflow=config.DB_MAX_OVERFLOW)
+    options["poolclass"] = InstrumentedPool
+    return options
+
+def pool_stats(engines):
+    """Size, in-use and overflow connections for each named engine's pool"""
+    stats = {}
+    for name, engine in engines.items():
+        pool = engine.sync_engine.pool
+        if not isinstance(pool, InstrumentedPool):
+            continue
+        stats[name] = {
+            "size": pool.size(),
+            "in_use": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0)
+        }
+    return stats
+
+async def check_liveness(engines, interval):
+    """Ping each database every interval and drop its pooled connections if the ping fails
+
+    Stale connections are then replaced on their next checkout, which is what
+    pool_pre_ping did at the cost of a round trip every time.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        for name, engine in engines.items():
+            start = time.perf_counter()
+            try:
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+                metrics.observe("pool.liveness_ping", time.perf_counter() - start)
+            except Exception as e:
+                metrics.incr("pool.liveness_failures")
+                logging.warning(f"Database {name} failed its liveness check, resetting its pool: {e}")
+                await engine.dispose()
@@ -0,0 +1,354 @@
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+from sqlalchemy import select, bindparam, func, desc, tuple_
+from database.models import User, MiningStats, MiningUnit, Inventory, GameStats, Transaction
+
+# Plain tables, so the selects below skip ORM entity loading entirely
+users = User.__table__
+mining = MiningStats.__table__
+units = MiningUnit.__table__
+inventories = Inventory.__table__
+game_stats = GameStats.__table__
+transactions = Transaction.__table__
+
+class MineView(NamedTuple):
+    """A user's mine, as shown by the mine and inventory commands"""
+    mine_name: str
+    mining_level: int
+    mine_depth: int
+    gems_found: int
+    ores_mined: int
+    unprocessed_materials: int
+
+class InventoryView(NamedTuple):
+    """A user's mining resources and crafted packs"""
+    coal: int
+    iron: int
+    gold: int
+    diamond: int
+    emerald: int
+    redstone: int
+    lapis: int
+    tech_packs: int
+    utility_packs: int
+    production_packs: int
+
+class ProfileView(NamedTuple):
+    """Everything a profile page shows, with the mine and inventory left as None for users without them"""
+    id: int
+    cash: int
+    experience: int
+    level: int
+    games_played: int
+    commands_used: int
+    mining_level: int
+    mine: Optional[MineView]
+    inventory: Optional[InventoryView]
+
+class GameStatsView(NamedTuple):
+    """A user's record at one game"""
+    game_name: str
+    games_played: int
+    games_won: int
+    total_bet: int
+    total_won: int
+    highest_win: int
+
+class MiningPageView(NamedTuple):
+    """A user's mine with their inventory and the totals of their mining units"""
+    mine: MineView
+    inventory: Optional[InventoryView]
+    unit_types: int
+    units: int
+    production: float
+
+class ActivityView(NamedTuple):
+    """A day's credits or debits for one user"""
+    day: str
+    type: str
+    count: int
+    total: int
+
+class HistoryRow(NamedTuple):
+    """One ledger entry on a history page"""
+    id: int
+    timestamp: datetime
+    amount: int
+    type: str
+    reason: Optional[str]
+
+USER_COLUMNS = [users.c[name] for name in ProfileView._fields[:7]]
+MINE_COLUMNS = [mining.c[name] for name in MineView._fields]
+INVENTORY_COLUMNS = [inventories.c[name] for name in InventoryView._fields]
+
+# Built once with bound parameters, so every call reuses the engine's cached compiled form
+PROFILE_QUERY = (
+    select(*USER_COLUMNS, mining.c.user_id, *MINE_COLUMNS, inventories.c.user_id, *INVENTORY_COLUMNS)
+    .select_from(
+        users
+        .outerjoin(mining, mining.c.user_id == users.c.id)
+        .outerjoin(inventories, inventories.c.user_id == users.c.id)
+    )
+    .where(users.c.id == bindparam("user_id"))
+)
+MINE_QUERY = (
+    select(*MINE_COLUMNS, inventories.c.user_id, *INVENTORY_COLUMNS)
+    .select_from(mining.outerjoin(inventories, inventories.c.user_id == mining.c.user_id))
+    .where(mining.c.user_id == bindparam("user_id"))
+)
+
+GAME_STATS_QUERY = (
+    select(*[game_stats.c[name] for name in GameStatsView._fields])
+    .where(game_stats.c.user_id == bindparam("user_id"))
+    .order_by(game_stats.c.games_played.desc())
+)
+MINING_PAGE_QUERY = (
+    select(
+        *MINE_COLUMNS, inventories.c.user_id, *INVENTORY_COLUMNS,
+        func.count(units.c.id),
+        func.coalesce(func.sum(units.c.quantity), 0),
+        func.coalesce(func.sum(units.c.quantity * units.c.production_rate), 0.0)
+    )
+    .select_from(
+        mining
+        .outerjoin(inventories, inventories.c.user_id == mining.c.user_id)
+        .outerjoin(units, units.c.user_id == mining.c.user_id)
+    )
+    .where(mining.c.user_id == bindparam("user_id"))
+    .group_by(mining.c.user_id, inventories.c.user_id)
+)
+ACTIVITY_QUERY = (
+    select(
+        func.date(transactions.c.timestamp).label("day"),
+        transactions.c.type,
+        func.count(),
+        func.sum(transactions.c.amount)
+    )
+    .where(transactions.c.user_id == bindparam("user_id"), transactions.c.timestamp >= bindparam("since"))
+    .group_by("day", transactions.c.type)
+    .order_by(desc("day"), transactions.c.type)
+)
+
+# History statements by which filters they use, built the first time each combination is asked for
+_history_queries = {}
+
+def _history_query(after, reason, since):
+    """A page of the ledger, newest first, read from ix_transaction_history alone"""
+    key = (after, reason, since)
+    query = _history_queries.get(key)
+    if query is None:
+        query = (
+            select(*[transactions.c[name] for name in HistoryRow._fields])
+            .where(transactions.c.user_id == bindparam("user_id"))
+        )
+        if after:
+            # Seek past the last row shown rather than counting rows to skip, so every page costs the same
+            query = query.where(
+                tuple_(transactions.c.timestamp, transactions.c.id) < tuple_(
+                    bindparam("after_time", type_=transactions.c.timestamp.type),
+                    bindparam("after_id", type_=transactions.c.id.type)
+                )
+            )
+        if reason:
+            query = query.where(transactions.c.reason.ilike(bindparam("reason"), escape="\\"))
+        if since:
+            query = query.where(transactions.c.timestamp >= bindparam("since"))
+        query = query.order_by(transactions.c.timestamp.desc(), transactions.c.id.desc()).limit(bindparam("limit"))
+        _history_queries[key] = query
+    return query
+
+_MINE_START = len(USER_COLUMNS) + 1
+_INVENTORY_START = _MINE_START + len(MINE_COLUMNS) + 1
+
+async def load_profile(session, user_id):
+    """A user with their mine and inventory in one query, or None if they have no account"""
+    row = (await session.execute(PROFILE_QUERY, {"user_id": user_id})).first()
+    if row is None:
+        return None
+    mine = None
+    if row[_MINE_START - 1] is not None:
+        mine = MineView._make(row[_MINE_START:_INVENTORY_START - 1])
+    inventory = None
+    if row[_INVENTORY_START - 1] is not None:
+        inventory = InventoryView._make(row[_INVENTORY_START:])
+    return ProfileView(*row[:_MINE_START - 1], mine, inventory)
+
+async def load_mine(session, user_id):
+    """A user's mine and inventory in one query, as (mine, inventory); mine is None if they haven't started one"""
+    row = (await session.execute(MINE_QUERY, {"user_id": user_id})).first()
+    if row is None:
+        return None, None
+    split = len(MINE_COLUMNS)
+    inventory = InventoryView._make(row[split + 1:]) if row[split] is not None else None
+    return MineView._make(row[:split]), inventory
+
+async def load_game_stats(session, user_id):
+    """A user's record at every game they've played, most played first"""
+    result = await session.execute(GAME_STATS_QUERY, {"user_id": user_id})
+    return [GameStatsView._make(row) for row in result]
+
+async def load_mining_page(session, user_id):
+    """A user's mine, inventory and mining unit totals in one grouped query, or None without a mine"""
+    row = (await session.execute(MINING_PAGE_QUERY, {"user_id": user_id})).first()
+    if row is None:
+        return None
+    split = len(MINE_COLUMNS)
+    totals = split + 1 + len(INVENTORY_COLUMNS)
+    inventory = InventoryView._make(row[split + 1:totals]) if row[split] is not None else None
+    return MiningPageView(MineView._make(row[:split]), inventory, *row[totals:])
+
+async def load_activity(session, user_id, days=7):
+    """A user's credits and debits per day over the last few days, newest first"""
+    since = datetime.utcnow() - timedelta(days=days)
+    result = await session.execute(ACTIVITY_QUERY, {"user_id": user_id, "since": since})
+    return [ActivityView(str(day), type, count, total or 0) for day, type, count, total in result]
+
+async def load_history(session, user_id, after=None, reason=None, since=None, limit=10):
+    """One page of a user's ledger, newest first, and whether there are older entries
+
+    after is the (timestamp, id) of the last entry on the previous page; reason
+    keeps entries whose reason starts with it, and since drops older entries.
+    """
+    parameters = {"user_id": user_id, "limit": limit + 1}
+    if after:
+        parameters["after_time"], parameters["after_id"] = after
+    if reason:
+        parameters["reason"] = reason.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    if since:
+        parameters["since"] = since
+    result = await session.execute(_history_query(bool(after), bool(reason), bool(since)), parameters)
+    rows = [HistoryRow._make(row) for row in result]
+    return rows[:limit], len(rows) > limit
+
+def empty_inventory():
+    """The inventory a user has before they've mined anything"""
+    return InventoryView(*([0] * len(InventoryView._fields)))
+
+async def benchmark(users_count=500, rounds=5):
+    """Profile loads through the ORM against the Core read model, for latency and allocations
+
+    The ORM path is what the commands did before: three session.get calls
+    building tracked User, MiningStats and Inventory objects.
+    """
+    import os
+    import tempfile
+    import time
+    import tracemalloc
+    from sqlalchemy import insert
+    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+    from database.models import Base
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        user_ids = [(1 << 40) + i * 7919 for i in range(users_count)]
+        await conn.execute(insert(users), [{"id": user_id, "cash": 1000} for user_id in user_ids])
+        await conn.execute(insert(mining), [{"user_id": user_id, "mine_name": "Bench Mine"} for user_id in user_ids])
+        await conn.execute(insert(inventories), [{"user_id": user_id} for user_id in user_ids])
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def orm(session, user_id):
+        user = await session.get(User, user_id)
+        await session.get(MiningStats, user_id)
+        await session.get(Inventory, user_id)
+        return user.cash
+
+    async def core(session, user_id):
+        return (await load_profile(session, user_id)).cash
+
+    results = {}
+    for name, load in (("orm", orm), ("core", core)):
+        # Warm the compiled cache and the connection pool first
+        async with factory() as session:
+            await load(session, user_ids[0])
+        best = None
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for user_id in user_ids:
+                # A fresh session per load, as each command gets
+                async with factory() as session:
+                    await load(session, user_id)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        # Peak memory above the baseline while each load runs, its working set of allocations
+        tracemalloc.start()
+        peaks = 0
+        for user_id in user_ids:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            async with factory() as session:
+                await load(session, user_id)
+            peaks += tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+        results[name] = {"latency": best / len(user_ids), "allocated": peaks / len(user_ids)}
+    await engine.dispose()
+    return results
+
+def history_benchmark(rows=1_000_000, page=10, pages=(1, 10, 100, 1000, 10000)):
+    """Time history pages deep into a long ledger, by keyset seek and by OFFSET
+
+    Uses the standard library's sqlite3 with the table and covering index the
+    models declare, so it shows the query plan SQLite picks as well.
+    """
+    import os
+    import sqlite3
+    import tempfile
+    import time
+    from sqlalchemy.schema import CreateTable, CreateIndex
+    from sqlalchemy.dialects import sqlite
+
+    connection = sqlite3.connect(os.path.join(tempfile.mkdtemp(), "history.db"))
+    dialect = sqlite.dialect()
+    # SQLite doesn't enforce foreign keys by default, so the ledger can stand alone
+    connection.execute(str(CreateTable(transactions).compile(dialect=dialect)))
+    for index in transactions.indexes:
+        connection.execute(str(CreateIndex(index).compile(dialect=dialect)))
+    start = datetime(2020, 1, 1)
+    connection.executemany(
+        'INSERT INTO "transaction" (user_id, amount, type, reason, timestamp) VALUES (?, ?, ?, ?, ?)',
+        ((1, 10, "credit", "Blackjack win", (start + timedelta(seconds=i * 30)).isoformat(" ")) for i in range(rows))
+    )
+    connection.commit()
+
+    columns = ", ".join(HistoryRow._fields)
+    first = f'SELECT {columns} FROM "transaction" WHERE user_id = ? ORDER BY timestamp DESC, id DESC LIMIT ?'
+    seek = f'SELECT {columns} FROM "transaction" WHERE user_id = ? AND (timestamp, id) < (?, ?) ORDER BY timestamp DESC, id DESC LIMIT ?'
+    offset = first + " OFFSET ?"
+    plan = connection.execute("EXPLAIN QUERY PLAN " + seek, (1, "2021", 1, page)).fetchall()
+
+    keyset = {}
+    after = None
+    for number in range(1, max(pages) + 1):
+        began = time.perf_counter()
+        if after is None:
+            result = connection.execute(first, (1, page)).fetchall()
+        else:
+            result = connection.execute(seek, (1, *after, page)).fetchall()
+        if number in pages:
+            keyset[number] = time.perf_counter() - began
+        after = (result[-1][1], result[-1][0])
+
+    skipped = {}
+    for number in pages:
+        began = time.perf_counter()
+        connection.execute(offset, (1, page, (number - 1) * page)).fetchall()
+        skipped[number] = time.perf_counter() - began
+    connection.close()
+    return {"plan": plan[0][-1], "keyset": keyset, "offset": skipped}
+
+if __name__ == "__main__":
+    import asyncio
+    import sys
+
+    if "history" in sys.argv:
+        results = history_benchmark()
+        print(results["plan"])
+        for number in results["keyset"]:
+            print(f"page {number:,}: keyset {results['keyset'][number] * 1e6:,.0f}µs, offset {results['offset'][number] * 1e6:,.0f}µs")
+    else:
+        results = asyncio.run(benchmark())
+        for name, result in results.items():
+            print(f"{name}: {result['latency'] * 1e6:.0f}µs per profile, {result['allocated'] / 1024:.1f}KiB allocated")
+        print(f"core is {results['orm']['latency'] / results['core']['latency']:.1f}x faster")
@@ -0,0 +1,63 @@
+import logging
+import traceback
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import config
+from utils.metrics import metrics
+
+# The statement log of the command running in the current task, if any
+current = ContextVar("statement_log", default=None)
+
+class StatementLog:
+    """Statements one command ran, with repeats of the same SQL flagged as likely N+1 queries"""
+    __slots__ = ("name", "count", "seen", "flagged")
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.seen = {}  # SQL text -> times run
+        self.flagged = set()
+
+    def record(self, statement, executemany):
+        self.count += 1
+        if executemany:
+            return
+        runs = self.seen.get(statement, 0) + 1
+        self.seen[statement] = runs
+        if runs >= config.N_PLUS_ONE_THRESHOLD and statement not in self.flagged:
+            self.flagged.add(statement)
+            metrics.incr("database.n_plus_one")
+            logging.warning(
+                f"Possible N+1 in {self.name}: the same statement ran {runs} times\n"
+                f"{' '.join(statement.split())}\n"
+                f"{''.join(_caller_stack())}"
+            )
+
+def _caller_stack():
+    """The bot's own frames leading to a statement, without SQLAlchemy and asyncio internals"""
+    frames = traceback.extract_stack()[:-3]
+    ours = [frame for frame in frames if "site-packages" not in frame.filename and "asyncio" not in frame.filename]
+    return traceback.format_list(ours[-8:])
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    log = current.get()
+    if log is not None:
+        log.record(statement, executemany)
+
+def install():
+    """Count every statement against the command that ran it; meant for development only"""
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+
+def start(name):
+    """Begin counting statements for a command in the current task"""
+    return current.set(StatementLog(name))
+
+def finish(token):
+    """Stop counting for the current command and record how many statements it ran"""
+    log = current.get()
+    current.reset(token)
+    if log is not None:
+        metrics.incr(f"statements.{log.name}", log.count)
+        metrics.incr("statements.commands")
+    return log
@@ -0,0 +1,100 @@
+import os
+import asyncio
+import logging
+import multiprocessing
+import config
+from utils.cluster import shard_ranges
+from utils.state_server import StandInServer
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+# Get token from environment variables
+TOKEN = os.getenv("DISCORD_BOT_TOKEN")
+
+async def recommended_shards():
+    """Ask Discord how many shards the bot should run"""
+    import discord
+    http = discord.http.HTTPClient(asyncio.get_running_loop())
+    try:
+        await http.static_login(TOKEN)
+        data = await http.request(discord.http.Route("GET", "/gateway/bot"))
+        return data["shards"]
+    finally:
+        await http.close()
+
+def run_cluster(cluster_id, shard_ids, shard_count, state_url):
+    """Entry point of a cluster process: one AutoShardedBot connecting its range of shards"""
+    from bot import setup_bot
+
+    async def start():
+        bot = await setup_bot(shard_ids=shard_ids, shard_count=shard_count, state_url=state_url, cluster_id=cluster_id)
+        try:
+            await bot.start(TOKEN)
+        finally:
+            await bot.close()
+            await bot.state.close()
+
+    logging.info(f"Cluster {cluster_id} starting shards {shard_ids[0]}-{shard_ids[-1]} of {shard_count}")
+    try:
+        asyncio.run(start())
+    except KeyboardInterrupt:
+        pass
+
+async def main():
+    """Keep one process running per cluster, serving shared state locally if no Redis server is configured"""
+    shard_count = config.SHARD_COUNT or await recommended_shards()
+    ranges = shard_ranges(shard_count, config.CLUSTER_COUNT)
+    logging.info(f"Launching {len(ranges)} clusters for {shard_count} shards")
+
+    # In-process memory can't be shared between clusters, so stand in for Redis instead
+    state_url = config.STATE_URL
+    if state_url.startswith("memory"):
+        await StandInServer().serve(config.STATE_SERVER_HOST, config.STATE_SERVER_PORT)
+        state_url = f"redis://{config.STATE_SERVER_HOST}:{config.STATE_SERVER_PORT}/0"
+
+    context = multiprocessing.get_context("spawn")
+    processes = {}
+
+    def launch(cluster_id):
+        process = context.Process(
+            target=run_cluster,
+            args=(cluster_id, ranges[cluster_id], shard_count, state_url),
+            name=f"cluster-{cluster_id}"
+        )
+        process.start()
+        processes[cluster_id] = process
+
+    for cluster_id in range(len(ranges)):
+        launch(cluster_id)
+        # Discord only allows one identify per five seconds per bucket; stagger cluster logins
+        await asyncio.sleep(5)
+
+    try:
+        while True:
+            await asyncio.sleep(config.CLUSTER_RESTART_DELAY)
+            for cluster_id, process in list(processes.items()):
+                if not process.is_alive():
+                    logging.warning(f"Cluster {cluster_id} exited with code {process.exitcode}, restarting")
+                    launch(cluster_id)
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join()
+
+if __name__ == "__main__":
+    if not TOKEN:
+        logging.error("No Discord bot token found. Set the DISCORD_BOT_TOKEN environment variable.")
+        exit(1)
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logging.info("Launcher interrupted by user.")
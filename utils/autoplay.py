@@ -0,0 +1,139 @@
+import random
+import time
+from itertools import accumulate, product
+
+# Outcome tables are lists of (net result as a multiple of the bet, weight) pairs that
+# pay exactly what a single round of the game pays; a win keeps the stake and adds the net
+COINFLIP_OUTCOMES = [(1, 1), (-1, 1)]  # A won flip pays even money
+DICE_OUTCOMES = [(5, 1), (-1, 5)]  # Guessing the number pays 5:1
+
+# Reasons a batch can end before all its rounds are played
+STOP_LOSS = "stop_loss"
+TAKE_PROFIT = "take_profit"
+BROKE = "broke"
+
+STOP_REASONS = {
+    STOP_LOSS: "Stop-loss reached",
+    TAKE_PROFIT: "Take-profit reached",
+    BROKE: "Not enough cash for another round"
+}
+
+def slot_outcomes(symbols):
+    """Exact outcome table for one slots spin, built from the machine's symbol weights and payouts"""
+    totals = {}
+    for first, second, third in product(symbols, repeat=3):
+        weight = symbols[first]["weight"] * symbols[second]["weight"] * symbols[third]["weight"]
+        
+        # Same rules as SlotMachine.spin: full payout for three of a kind, half for a pair
+        if first == second == third:
+            multiplier = symbols[first]["payout"]
+        elif first == second or first == third:
+            multiplier = symbols[first]["payout"] // 2
+        elif second == third:
+            multiplier = symbols[second]["payout"] // 2
+        else:
+            multiplier = 0
+            
+        net = multiplier if multiplier > 0 else -1
+        totals[net] = totals.get(net, 0) + weight
+    return sorted(totals.items())
+
+def highlow_outcomes(choice):
+    """Outcome table for one high-low guess over 13 equally likely card values"""
+    if choice == "same":
+        return [(11, 13), (-1, 156)]
+    # 78 of the 169 value pairs go up, 78 go down and 13 repeat
+    return [(1, 78), (-1, 91)]
+
+def expected_return(outcomes):
+    """Average net result of one round as a multiple of the bet"""
+    total = sum(weight for net, weight in outcomes)
+    return sum(net * weight for net, weight in outcomes) / total
+
+def play_batch(outcomes, bet_amount, rounds, balance, stop_loss=None, take_profit=None, rng=random):
+    """Play up to rounds of a game in one pass over an outcome table
+    
+    Every round is drawn with a single weighted choices() call, then the running
+    profit is scanned for the first round that hits the stop-loss, the take-profit,
+    or leaves too little cash to cover another bet. Nothing is written anywhere;
+    the caller settles the returned nets in one transaction.
+    """
+    nets, weights = zip(*outcomes)
+    draws = rng.choices(nets, cum_weights=list(accumulate(weights)), k=rounds)
+    
+    played = rounds
+    stopped = None
+    for index, running in enumerate(accumulate(draws)):
+        profit = running * bet_amount
+        if stop_loss and -profit >= stop_loss:
+            stopped = STOP_LOSS
+        elif take_profit and profit >= take_profit:
+            stopped = TAKE_PROFIT
+        elif balance + profit < bet_amount:
+            stopped = BROKE
+        else:
+            continue
+        played = index + 1
+        break
+        
+    draws = draws[:played]
+    counts = {}
+    for net in draws:
+        counts[net] = counts.get(net, 0) + 1
+    wins = sum(count for net, count in counts.items() if net > 0)
+    
+    return {
+        "rounds": played,
+        "requested": rounds,
+        "nets": draws,
+        "counts": counts,
+        "wins": wins,
+        "wagered": played * bet_amount,
+        "net": sum(draws) * bet_amount,
+        "biggest_win": max(draws) * bet_amount if wins else 0,
+        "stopped": stopped if played < rounds else None
+    }
+
+def benchmark(rounds=1000, batches=1000, seed=None):
+    """Time batches against an equivalent loop of single rounds"""
+    rng = random.Random(seed)
+    outcomes = highlow_outcomes("higher")
+    
+    start = time.perf_counter()
+    for _ in range(batches):
+        play_batch(outcomes, 100, rounds, 10 ** 12, rng=rng)
+    batch_time = time.perf_counter() - start
+    
+    # One draw per round, the way separate commands would each pick an outcome
+    nets, weights = zip(*outcomes)
+    start = time.perf_counter()
+    for _ in range(batches):
+        for _ in range(rounds):
+            rng.choices(nets, weights)
+    loop_time = time.perf_counter() - start
+    
+    return {
+        "rounds": rounds,
+        "batches": batches,
+        "batch_us": batch_time / batches * 1000000,
+        "loop_us": loop_time / batches * 1000000
+    }
+
+if __name__ == "__main__":
+    import sys
+    
+    tables = {
+        "coinflip": COINFLIP_OUTCOMES,
+        "dice": DICE_OUTCOMES,
+        "highlow higher": highlow_outcomes("higher"),
+        "highlow same": highlow_outcomes("same")
+    }
+    for name, outcomes in tables.items():
+        print(f"{name}: expected return {expected_return(outcomes) * 100:+.2f}% of the bet per round")
+        
+    round_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    result = benchmark(round_count, seed=1)
+    print(
+        f"{result['rounds']:,} rounds: batch {result['batch_us']:.0f}us vs "
+        f"single-round loop {result['loop_us']:.0f}us ({result['loop_us'] / result['batch_us']:.1f}x)"
+    )
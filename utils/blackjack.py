@@ -0,0 +1,430 @@
+import random
+import time
+from utils.cards import DECK_SIZE, RANK_COUNT, Shoe, format_cards
+
+# Blackjack points for each rank index (2-10, J, Q, K count as 10, Ace as 11)
+RANK_POINTS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11)
+CARD_POINTS = tuple(RANK_POINTS[card % RANK_COUNT] for card in range(DECK_SIZE))
+
+# Hand states are packed as total * 2 + soft, where soft means an ace is counted as 11.
+# Any state at or above BUST_STATE is a bust and is never extended further.
+STATE_COUNT = 64
+EMPTY_STATE = 0
+NATURAL_STATE = 21 * 2 + 1
+BUST_STATE = 22 * 2
+DEALER_STAND_STATE = 17 * 2  # Dealer stands on all 17s
+
+# Outcomes and their net payout per unit staked
+BLACKJACK = "blackjack"
+WIN = "win"
+PUSH = "push"
+LOSS = "loss"
+PAYOUTS = {BLACKJACK: 1.5, WIN: 1, PUSH: 0, LOSS: -1}
+
+# Basic strategy actions
+HIT = 0
+STAND = 1
+DOUBLE = 2         # Double if allowed, otherwise hit
+DOUBLE_STAND = 3   # Double if allowed, otherwise stand
+ACTION_NAMES = {HIT: "hit", STAND: "stand", DOUBLE: "double", DOUBLE_STAND: "double"}
+
+# Most cards a single hand can take before the shoe has to be checked again
+MAX_CARDS_PER_HAND = 24
+
+def _build_state_table():
+    """Build the state transition table indexed by state * 52 + card"""
+    table = [0] * (STATE_COUNT * DECK_SIZE)
+    for total in range(22):
+        for soft in (0, 1):
+            state = total * 2 + soft
+            for card in range(DECK_SIZE):
+                points = CARD_POINTS[card]
+                new_total = total + points
+                soft_aces = soft + (1 if points == 11 else 0)
+                
+                # Count aces as 1 until the hand is no longer over 21
+                while new_total > 21 and soft_aces > 0:
+                    new_total -= 10
+                    soft_aces -= 1
+                    
+                table[state * DECK_SIZE + card] = min(new_total, 31) * 2 + (1 if soft_aces else 0)
+    
+    # Busted states stay busted
+    for state in range(BUST_STATE, STATE_COUNT):
+        for card in range(DECK_SIZE):
+            table[state * DECK_SIZE + card] = state
+            
+    return table
+
+def _build_strategy_table():
+    """Build the basic strategy table (S17, no splits) indexed by state * 10 + upcard - 2"""
+    table = [STAND] * (STATE_COUNT * 10)
+    for state in range(BUST_STATE):
+        total, soft = state >> 1, state & 1
+        for up in range(2, 12):
+            if soft:
+                if total <= 14:
+                    action = DOUBLE if up in (5, 6) else HIT
+                elif total <= 16:
+                    action = DOUBLE if 4 <= up <= 6 else HIT
+                elif total == 17:
+                    action = DOUBLE if 3 <= up <= 6 else HIT
+                elif total == 18:
+                    if 3 <= up <= 6:
+                        action = DOUBLE_STAND
+                    elif up in (2, 7, 8):
+                        action = STAND
+                    else:
+                        action = HIT
+                else:
+                    action = STAND
+            else:
+                if total <= 8:
+                    action = HIT
+                elif total == 9:
+                    action = DOUBLE if 3 <= up <= 6 else HIT
+                elif total == 10:
+                    action = DOUBLE if up <= 9 else HIT
+                elif total == 11:
+                    action = DOUBLE if up <= 10 else HIT
+                elif total == 12:
+                    action = STAND if 4 <= up <= 6 else HIT
+                elif total <= 16:
+                    action = STAND if up <= 6 else HIT
+                else:
+                    action = STAND
+            table[state * 10 + up - 2] = action
+    return table
+
+NEXT_STATE = _build_state_table()
+STRATEGY = _build_strategy_table()
+
+def hand_state(cards):
+    """Get the packed state of a hand of encoded cards"""
+    state = EMPTY_STATE
+    for card in cards:
+        state = NEXT_STATE[state * DECK_SIZE + card]
+    return state
+
+def hand_value(cards):
+    """Get the best blackjack total of a hand"""
+    return hand_state(cards) >> 1
+
+def is_soft(cards):
+    """Check if a hand is soft (an ace is counted as 11)"""
+    return bool(hand_state(cards) & 1)
+
+def is_natural(cards):
+    """Check if a hand is a two-card 21"""
+    return len(cards) == 2 and hand_state(cards) == NATURAL_STATE
+
+def format_hand(cards, hide_second=False):
+    """Format a hand for display using the cached card strings"""
+    return format_cards(cards, 1 if hide_second else None)
+
+def dealer_play(shoe, dealer_cards):
+    """Draw dealer cards until the dealer stands on 17 or more"""
+    state = hand_state(dealer_cards)
+    while state < DEALER_STAND_STATE:
+        card = shoe.draw()
+        dealer_cards.append(card)
+        state = NEXT_STATE[state * DECK_SIZE + card]
+    return state >> 1
+
+def settle(player_cards, dealer_cards):
+    """Get the outcome of a finished hand"""
+    player_state = hand_state(player_cards)
+    dealer_state = hand_state(dealer_cards)
+    player_natural = len(player_cards) == 2 and player_state == NATURAL_STATE
+    dealer_natural = len(dealer_cards) == 2 and dealer_state == NATURAL_STATE
+    
+    if player_natural:
+        return PUSH if dealer_natural else BLACKJACK
+    if player_state >= BUST_STATE or dealer_natural:
+        return LOSS
+    if dealer_state >= BUST_STATE:
+        return WIN
+        
+    player_total, dealer_total = player_state >> 1, dealer_state >> 1
+    if player_total > dealer_total:
+        return WIN
+    if player_total < dealer_total:
+        return LOSS
+    return PUSH
+
+def basic_strategy(player_cards, dealer_upcard, can_double=False):
+    """Get the basic strategy action name for a hand"""
+    action = STRATEGY[hand_state(player_cards) * 10 + CARD_POINTS[dealer_upcard] - 2]
+    if action == DOUBLE:
+        action = DOUBLE if can_double else HIT
+    elif action == DOUBLE_STAND:
+        action = DOUBLE if can_double else STAND
+    return ACTION_NAMES[action]
+
+class Seat:
+    """A player's seat at a multiplayer blackjack table"""
+    __slots__ = ("user_id", "name", "bet", "cards", "state", "done", "outcome", "leaving", "missed")
+    
+    def __init__(self, user_id, name, bet):
+        self.user_id = user_id
+        self.name = name
+        self.bet = bet
+        self.cards = []
+        self.state = EMPTY_STATE
+        self.done = False
+        self.outcome = None
+        self.leaving = False
+        self.missed = 0  # Rounds in a row the player let time out
+    
+    @property
+    def value(self):
+        """Best blackjack total of the seat's hand"""
+        return self.state >> 1
+
+class BlackjackTable:
+    """A table where several seats act in rounds against one dealer and one shoe"""
+    
+    def __init__(self, shoe, max_seats=7):
+        self.shoe = shoe
+        self.max_seats = max_seats
+        self.seats = {}  # user_id -> Seat, in the order players sat down
+        self.waiting = {}  # user_id -> Seat joining at the next deal
+        self.dealer = []
+        self.pending = {}  # user_id -> action queued for the current round
+        self.in_hand = False
+        self.hands_played = 0
+    
+    def sit(self, user_id, name, bet):
+        """Seat a player, returning an error message if they can't sit"""
+        seat = self.seats.get(user_id) or self.waiting.get(user_id)
+        if seat:
+            # Already seated, so this changes the bet from the next hand
+            seat.bet = bet
+            seat.leaving = False
+            return None
+        if len(self.seats) + len(self.waiting) >= self.max_seats:
+            return f"This table is full! ({self.max_seats} seats)"
+        if self.in_hand:
+            self.waiting[user_id] = Seat(user_id, name, bet)
+        else:
+            self.seats[user_id] = Seat(user_id, name, bet)
+        return None
+    
+    def leave(self, user_id):
+        """Remove a player, or stand them and remove them after the current hand"""
+        if self.waiting.pop(user_id, None):
+            return True
+        seat = self.seats.get(user_id)
+        if not seat:
+            return False
+        if self.in_hand:
+            seat.leaving = True
+            if not seat.done:
+                self.pending[user_id] = STAND
+        else:
+            del self.seats[user_id]
+        return True
+    
+    def deal(self):
+        """Start a hand, dealing two cards to every seat and the dealer"""
+        shoe = self.shoe
+        shoe.start_hand()
+        self.seats.update(self.waiting)
+        self.waiting = {}
+        self.pending = {}
+        self.dealer = []
+        for seat in self.seats.values():
+            seat.cards = []
+            seat.state = EMPTY_STATE
+            seat.done = False
+            seat.outcome = None
+        
+        # Deal around the table twice, dealer last
+        for _ in range(2):
+            for seat in self.seats.values():
+                card = shoe.draw()
+                seat.cards.append(card)
+                seat.state = NEXT_STATE[seat.state * DECK_SIZE + card]
+            self.dealer.append(shoe.draw())
+        
+        # Naturals and a dealer blackjack end the hand for those seats immediately
+        dealer_natural = hand_state(self.dealer) == NATURAL_STATE
+        for seat in self.seats.values():
+            if dealer_natural or seat.state == NATURAL_STATE:
+                seat.done = True
+                
+        self.in_hand = True
+        self.hands_played += 1
+    
+    @property
+    def active_seats(self):
+        """Seats that still have to act this hand"""
+        return [seat for seat in self.seats.values() if not seat.done]
+    
+    def queue_action(self, user_id, action):
+        """Queue a hit or stand for the current round, returning False if not allowed"""
+        seat = self.seats.get(user_id)
+        if not seat or seat.done or user_id in self.pending:
+            return False
+        self.pending[user_id] = action
+        return True
+    
+    @property
+    def round_complete(self):
+        """Whether every active seat has queued an action"""
+        return all(seat.user_id in self.pending for seat in self.active_seats)
+    
+    def apply_actions(self):
+        """Apply the queued actions; seats that didn't act stand"""
+        for seat in self.active_seats:
+            action = self.pending.get(seat.user_id)
+            if action is None:
+                seat.missed += 1
+                action = STAND
+            else:
+                seat.missed = 0
+            if action == HIT:
+                card = self.shoe.draw()
+                seat.cards.append(card)
+                seat.state = NEXT_STATE[seat.state * DECK_SIZE + card]
+                if seat.state >= (21 * 2):
+                    seat.done = True
+            else:
+                seat.done = True
+        self.pending = {}
+    
+    def finish(self):
+        """Play the dealer's hand and settle every seat
+        
+        Returns a list of (user_id, bet, net, outcome) tuples
+        """
+        # The dealer only draws if someone is still in the hand
+        if any(seat.state < BUST_STATE and seat.state != NATURAL_STATE for seat in self.seats.values()):
+            dealer_play(self.shoe, self.dealer)
+            
+        results = []
+        for seat in self.seats.values():
+            seat.outcome = settle(seat.cards, self.dealer)
+            results.append((seat.user_id, seat.bet, int(seat.bet * PAYOUTS[seat.outcome]), seat.outcome))
+        
+        # Remove players who asked to leave during the hand
+        for user_id in [seat.user_id for seat in self.seats.values() if seat.leaving]:
+            del self.seats[user_id]
+            
+        self.in_hand = False
+        return results
+
+def simulate(hands, decks=6, penetration=0.75, allow_double=False, seed=None):
+    """Play hands with basic strategy against a persistent shoe and tally the payouts"""
+    rng = random.Random(seed)
+    shoe = Shoe(decks, penetration, rng)
+    cards = shoe.cards
+    cut = min(shoe.cut, len(cards) - MAX_CARDS_PER_HAND)
+    next_state = NEXT_STATE
+    strategy = STRATEGY
+    points = CARD_POINTS
+    
+    position = 0
+    wagered = 0
+    net = 0.0
+    naturals = wins = losses = pushes = doubles = 0
+    
+    start = time.perf_counter()
+    for _ in range(hands):
+        if position >= cut:
+            shoe.shuffle()
+            position = 0
+        
+        # Deal player, dealer, player, dealer
+        p1, d1, p2, d2 = cards[position:position + 4]
+        position += 4
+        player = next_state[next_state[p1] * DECK_SIZE + p2]
+        dealer = next_state[next_state[d1] * DECK_SIZE + d2]
+        
+        stake = 1
+        
+        # Dealer peeks for blackjack
+        if dealer == NATURAL_STATE:
+            wagered += 1
+            if player == NATURAL_STATE:
+                pushes += 1
+            else:
+                losses += 1
+                net -= 1
+            continue
+            
+        if player == NATURAL_STATE:
+            wagered += 1
+            naturals += 1
+            net += 1.5
+            continue
+        
+        # Player plays by basic strategy
+        up = points[d1] - 2
+        first_decision = True
+        while player < BUST_STATE:
+            action = strategy[player * 10 + up]
+            if action == DOUBLE or action == DOUBLE_STAND:
+                if allow_double and first_decision:
+                    stake = 2
+                    doubles += 1
+                    player = next_state[player * DECK_SIZE + cards[position]]
+                    position += 1
+                    break
+                action = HIT if action == DOUBLE else STAND
+            if action == STAND:
+                break
+            player = next_state[player * DECK_SIZE + cards[position]]
+            position += 1
+            first_decision = False
+            
+        wagered += stake
+        if player >= BUST_STATE:
+            losses += 1
+            net -= stake
+            continue
+        
+        # Dealer draws to 17
+        while dealer < DEALER_STAND_STATE:
+            dealer = next_state[dealer * DECK_SIZE + cards[position]]
+            position += 1
+            
+        if dealer >= BUST_STATE or (player >> 1) > (dealer >> 1):
+            wins += 1
+            net += stake
+        elif (player >> 1) < (dealer >> 1):
+            losses += 1
+            net -= stake
+        else:
+            pushes += 1
+            
+    elapsed = time.perf_counter() - start
+    shoe.position = position
+    
+    return {
+        "hands": hands,
+        "wagered": wagered,
+        "net": net,
+        "naturals": naturals,
+        "wins": wins,
+        "losses": losses,
+        "pushes": pushes,
+        "doubles": doubles,
+        "rtp": (wagered + net) / wagered if wagered else 0,
+        "house_edge": -net / hands if hands else 0,
+        "shuffles": shoe.shuffles,
+        "elapsed": elapsed,
+        "hands_per_second": hands / elapsed if elapsed else 0
+    }
+
+if __name__ == "__main__":
+    import sys
+    
+    hand_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    for doubling in (False, True):
+        result = simulate(hand_count, allow_double=doubling, seed=1)
+        print(
+            f"double={doubling}: {result['hands']:,} hands in {result['elapsed']:.2f}s "
+            f"({result['hands_per_second']:,.0f}/s) | naturals {result['naturals']:,} "
+            f"| RTP {result['rtp'] * 100:.3f}% | edge {result['house_edge'] * 100:.3f}%"
+        )
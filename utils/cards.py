@@ -0,0 +1,79 @@
+import random
+from assets.icons import CARD_SUITS, CARD_VALUES
+
+# Cards are encoded as integers 0-51: rank = card % 13 (0 = "2" ... 12 = "A"), suit = card // 13
+DECK_SIZE = 52
+RANK_COUNT = 13
+HIDDEN_CARD = "🂠"
+
+# Display strings for every card, built once instead of formatting on each render
+CARD_TEXT = tuple(
+    f"{CARD_VALUES[card % RANK_COUNT]}{CARD_SUITS[card // RANK_COUNT]}"
+    for card in range(DECK_SIZE)
+)
+
+def card_rank(card):
+    """Get the rank index (0 = 2 ... 12 = Ace) of an encoded card"""
+    return card % RANK_COUNT
+
+def card_suit(card):
+    """Get the suit index of an encoded card"""
+    return card // RANK_COUNT
+
+def format_card(card, hidden=False):
+    """Format a single encoded card for display"""
+    if hidden:
+        return HIDDEN_CARD
+    return CARD_TEXT[card]
+
+def format_cards(cards, hide_index=None):
+    """Format a list of encoded cards, optionally hiding one of them"""
+    if hide_index is None:
+        return " ".join([CARD_TEXT[card] for card in cards])
+    return " ".join([
+        HIDDEN_CARD if i == hide_index else CARD_TEXT[card]
+        for i, card in enumerate(cards)
+    ])
+
+class Shoe:
+    """A multi-deck shoe of encoded cards that persists across hands"""
+    __slots__ = ("decks", "penetration", "cards", "position", "cut", "rng", "shuffles")
+    
+    def __init__(self, decks=6, penetration=0.75, rng=None):
+        self.decks = decks
+        self.penetration = penetration
+        self.rng = rng or random.Random()
+        self.cards = list(range(DECK_SIZE)) * decks
+        self.cut = int(len(self.cards) * penetration)
+        self.position = 0
+        self.shuffles = 0
+        self.shuffle()
+    
+    def shuffle(self):
+        """Shuffle the whole shoe and reset the position"""
+        self.rng.shuffle(self.cards)
+        self.position = 0
+        self.shuffles += 1
+    
+    @property
+    def remaining(self):
+        """Number of cards left before the shoe is exhausted"""
+        return len(self.cards) - self.position
+    
+    @property
+    def needs_shuffle(self):
+        """Whether the cut card has been reached"""
+        return self.position >= self.cut
+    
+    def draw(self):
+        """Draw the next card, reshuffling if the shoe runs out mid-hand"""
+        if self.position >= len(self.cards):
+            self.shuffle()
+        card = self.cards[self.position]
+        self.position += 1
+        return card
+    
+    def start_hand(self):
+        """Reshuffle between hands once the cut card has come out"""
+        if self.position >= self.cut:
+            self.shuffle()
@@ -0,0 +1,204 @@
+import asyncio
+import time
+from utils.metrics import metrics
+from utils.state_server import StandInServer
+
+def shard_ranges(shard_count, clusters):
+    """Split shard IDs into contiguous ranges, one per cluster process"""
+    clusters = max(1, min(clusters, shard_count))
+    size, extra = divmod(shard_count, clusters)
+    ranges = []
+    start = 0
+    for cluster_id in range(clusters):
+        end = start + size + (1 if cluster_id < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+def shard_for_guild(guild_id, shard_count):
+    """The shard Discord sends a guild's events to"""
+    return (guild_id >> 22) % shard_count
+
+class StandInGateway:
+    """Replays synthetic guild messages for a set of shards, standing in for Discord's gateway"""
+
+    def __init__(self, shard_ids, shard_count, guild_ids, user_ids, seed=0):
+        import random
+        self.rng = random.Random(seed)
+        self.guild_ids = [guild_id for guild_id in guild_ids if shard_for_guild(guild_id, shard_count) in shard_ids]
+        self.user_ids = user_ids
+
+    def events(self, count):
+        """Yield (guild_id, user_id, command) messages for this cluster's guilds"""
+        for _ in range(count):
+            yield self.rng.choice(self.guild_ids), self.rng.choice(self.user_ids), self.rng.choice(["daily", "lotto", "chat"])
+
+# Test harness: python -m utils.cluster runs several clusters against one database
+HARNESS_USERS = 50
+HARNESS_SEED_CASH = 2000000  # Enough for every user to buy lottery tickets up to the cap
+HARNESS_TICKETS = 300  # Tickets asked for per lotto command, so a few purchases reach the cap
+HARNESS_TICKET_CAP = 1000  # MAX_TICKETS in the lotto command
+HARNESS_TICKET_PRICE = 1000  # TICKET_PRICE in the lotto command
+
+def _harness_environment(database):
+    """Point this process's database at the harness file; config reads it when first imported"""
+    import os
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ["DATABASE_PARTITIONS"] = "1"
+
+def _harness_seed(database):
+    """Create the harness database and its users through the real schema and economy code"""
+    _harness_environment(database)
+    from database.database import init_db
+    from utils.economy import EconomyManager
+
+    async def run():
+        await init_db()
+        economy = EconomyManager(None)
+        for user_id in range(1, HARNESS_USERS + 1):
+            await economy.get_user(user_id)
+            await economy.add_cash(user_id, HARNESS_SEED_CASH, "Harness seed")
+
+    asyncio.run(run())
+
+def _harness_cluster(cluster_id, shard_ids, shard_count, port, database, events, results):
+    """One cluster process of the harness: a real bot for its shards, fed its shards' messages"""
+    _harness_environment(database)
+    from types import SimpleNamespace
+    from discord.ext import commands
+    from discord.ext.commands.view import StringView
+    import config
+    from bot import setup_bot
+
+    class HarnessContext(commands.Context):
+        """A command context whose replies are collected instead of sent to Discord"""
+
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.replies = []
+
+        async def send(self, content=None, **kwargs):
+            self.replies.append((content, kwargs.get("embed")))
+
+    async def run():
+        bot = await setup_bot(shard_ids=shard_ids, shard_count=shard_count, state_url=f"redis://127.0.0.1:{port}/0", cluster_id=cluster_id)
+        gateway = StandInGateway(shard_ids, shard_count, range(1 << 22, 200 << 22, 1 << 22), list(range(1, HARNESS_USERS + 1)), seed=cluster_id)
+        contents = {"daily": "daily", "lotto": f"lotto {HARNESS_TICKETS}", "chat": "hello"}
+        handled = {"daily": 0, "daily_blocked": 0, "tickets": 0, "tickets_refused": 0, "chat": 0}
+        start = time.perf_counter()
+        for index, (guild_id, user_id, command) in enumerate(gateway.events(events)):
+            # The same user can reach any cluster through different guilds
+            content = f"{config.DEFAULT_PREFIX}{contents[command]}" if command != "chat" else contents[command]
+            message = SimpleNamespace(
+                id=(cluster_id << 32) + index,
+                content=content,
+                guild=SimpleNamespace(id=guild_id),
+                channel=SimpleNamespace(id=guild_id, parent_id=None),
+                author=SimpleNamespace(id=user_id, bot=False, guild_permissions=SimpleNamespace(administrator=False))
+            )
+            bot.router.dispatch_message(message)
+            prefix = bot.prefixes.match(guild_id, content)
+            if prefix is None:
+                handled["chat"] += 1
+                continue
+
+            # What process_commands does once the gateway has built a Message
+            view = StringView(content)
+            view.skip_string(prefix)
+            invoked_with = view.get_word()
+            ctx = HarnessContext(
+                prefix=prefix, view=view, bot=bot, message=message,
+                invoked_with=invoked_with, command=bot.all_commands.get(invoked_with)
+            )
+            await bot.invoke(ctx)
+            if command == "daily":
+                handled["daily_blocked" if ctx.command_failed else "daily"] += 1
+            elif any(embed is not None and embed.title == "Lottery Tickets Purchased" for _, embed in ctx.replies):
+                handled["tickets"] += 1
+            else:
+                handled["tickets_refused"] += 1
+        handled["seconds"] = time.perf_counter() - start
+        timings = [timing for name, timing in metrics.timings.items() if name.startswith("state.")]
+        handled["ipc_us"] = sum(timing.total for timing in timings) / max(sum(timing.count for timing in timings), 1) * 1000000
+        for task in (bot.replica_lag_task, bot.liveness_task):
+            if task is not None:
+                task.cancel()
+        await bot.close()
+        await bot.state.close()
+        results.put((cluster_id, handled))
+
+    asyncio.run(run())
+
+def harness(clusters=3, shard_count=6, events=5000):
+    """Run real bot clusters as separate processes against one SQLite database and the shared state stand-in
+
+    Each cluster builds its bot with setup_bot for its shards and dispatches
+    synthetic messages into the real command handlers, so dailies go through
+    the shared cooldown and EconomyManager and lotto through the real command.
+    """
+    import multiprocessing
+    import os
+    import sqlite3
+    import tempfile
+    import config
+
+    database = os.path.join(tempfile.mkdtemp(), "harness.db")
+    context = multiprocessing.get_context("spawn")
+    seed = context.Process(target=_harness_seed, args=(database,))
+    seed.start()
+    seed.join()
+
+    async def run():
+        stand_in = StandInServer()
+        server = await stand_in.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        results = context.Queue()
+        processes = [
+            context.Process(target=_harness_cluster, args=(cluster_id, shard_ids, shard_count, port, database, events, results))
+            for cluster_id, shard_ids in enumerate(shard_ranges(shard_count, clusters))
+        ]
+        for process in processes:
+            process.start()
+        loop = asyncio.get_running_loop()
+        collected = [await loop.run_in_executor(None, results.get) for _ in processes]
+        for process in processes:
+            await loop.run_in_executor(None, process.join)
+        server.close()
+        return stand_in.store, dict(collected)
+
+    store, per_cluster = asyncio.run(run())
+
+    # Check what the clusters wrote between them
+    connection = sqlite3.connect(database)
+    total_cash = connection.execute("SELECT SUM(cash) FROM user").fetchone()[0]
+    paid, most_dailies = connection.execute(
+        "SELECT COALESCE(SUM(total), 0), COALESCE(MAX(count), 0) FROM "
+        "(SELECT SUM(amount) AS total, COUNT(*) AS count FROM \"transaction\" WHERE reason = 'Daily reward' GROUP BY user_id)"
+    ).fetchone()
+    connection.close()
+    tickets = int(store.get("lottery:tickets") or 0)
+    return {
+        "clusters": per_cluster,
+        "dailies": sum(result["daily"] for result in per_cluster.values()),
+        "most_dailies": most_dailies,
+        "total_cash": total_cash,
+        "expected_cash": HARNESS_USERS * (config.STARTING_CASH + HARNESS_SEED_CASH) + paid - tickets * HARNESS_TICKET_PRICE,
+        "tickets": tickets,
+        "pot": int(store.get("lottery:pot") or 0),
+        "most_tickets": max((int(value) for key, value in store.values.items() if key.startswith("lottery:tickets:")), default=0)
+    }
+
+if __name__ == "__main__":
+    result = harness()
+    for cluster_id, handled in sorted(result["clusters"].items()):
+        print(
+            f"cluster {cluster_id}: {sum(handled[key] for key in ('daily', 'daily_blocked', 'tickets', 'tickets_refused', 'chat')) / handled['seconds']:,.0f} events/s, "
+            f"shared state {handled['ipc_us']:.0f}us/op, {handled['daily']} dailies ({handled['daily_blocked']} blocked), "
+            f"{handled['tickets']} ticket purchases ({handled['tickets_refused']} refused)"
+        )
+    print(
+        f"{result['dailies']} dailies paid across clusters for {HARNESS_USERS} users, at most {result['most_dailies']} per user; "
+        f"cash {result['total_cash']:,} (expected {result['expected_cash']:,}); "
+        f"{result['tickets']} tickets for a ${result['pot']:,} pot, most held by one user {result['most_tickets']} (cap {HARNESS_TICKET_CAP})"
+    )
@@ -1,3 +1,4 @@
+import math
 import time
 import asyncio
 from datetime import datetime, timedelta
@@ -32,6 +33,30 @@ class Cooldowns:
         key = f"{user_id}:{command_name}"
         self.cooldowns[key] = time.time() + duration
         
+    async def claim(self, user_id, command_name, duration):
+        """Start a cooldown in shared state so it holds across every bot process
+        
+        Returns 0 if the cooldown was started, or the seconds left on one that is already running.
+        """
+        remaining = await self.bot.state.claim(f"cooldown:{user_id}:{command_name}", duration)
+        if remaining > 0:
+            self.cooldowns[f"{user_id}:{command_name}"] = time.time() + remaining
+            return math.ceil(remaining)
+        self.set_cooldown(user_id, command_name, duration)
+        
+        # Also index it by expiry so the cooldowns command can list a user's cooldowns in one call
+        await self.bot.state.zadd(f"cooldowns:{user_id}", command_name, time.time() + duration)
+        return 0
+    
+    async def refresh(self, user_id):
+        """Pull a user's cooldowns from shared state, including ones started in other bot processes"""
+        now = time.time()
+        for command_name, expiry_time in await self.bot.state.zrange(f"cooldowns:{user_id}"):
+            if expiry_time > now:
+                self.cooldowns[f"{user_id}:{command_name}"] = expiry_time
+            else:
+                await self.bot.state.zrem(f"cooldowns:{user_id}", command_name)
+    
     def is_on_cooldown(self, user_id, command_name):
         """Check if a command is on cooldown for a user"""
         return self.get_cooldown_remaining(user_id, command_name) > 0
@@ -110,17 +135,14 @@ def cooldown(cooldown_type):
         if not hasattr(bot, "cooldowns"):
             bot.cooldowns = Cooldowns(bot)
             
-        # Check if command is on cooldown
-        remaining = bot.cooldowns.get_cooldown_remaining(user_id, command_name)
+        # Check and set the cooldown in one step, shared with every cluster
+        remaining = await bot.cooldowns.claim(user_id, command_name, cooldown_duration)
         if remaining > 0:
             raise commands.CommandOnCooldown(
                 cooldown=commands.Cooldown(1, cooldown_duration),
                 retry_after=remaining,
                 type=commands.BucketType.user
             )
-            
-        # Set cooldown
-        bot.cooldowns.set_cooldown(user_id, command_name, cooldown_duration)
         return True
         
     return commands.check(predicate)
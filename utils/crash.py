@@ -0,0 +1,194 @@
+import heapq
+import math
+import random
+import time
+
+# Round phases
+BETTING = "betting"
+RUNNING = "running"
+CRASHED = "crashed"
+
+class CrashBet:
+    """A single player's bet in a crash round"""
+    __slots__ = ("user_id", "name", "amount", "auto_cashout", "cashed_at")
+    
+    def __init__(self, user_id, name, amount, auto_cashout=None):
+        self.user_id = user_id
+        self.name = name
+        self.amount = amount
+        self.auto_cashout = auto_cashout
+        self.cashed_at = None
+    
+    @property
+    def net(self):
+        """Winnings for a cashed out bet, or the lost stake"""
+        if self.cashed_at is None:
+            return -self.amount
+        return int(self.amount * (self.cashed_at - 1))
+
+def generate_crash_point(rng=random, house_edge=0.01, max_multiplier=1000.0):
+    """Pick where the rocket crashes so that P(crash >= m) = (1 - house_edge) / m"""
+    u = rng.random()
+    point = math.floor(100 * (1 - house_edge) / (1 - u)) / 100
+    return min(max(point, 1.0), max_multiplier)
+
+class CrashRound:
+    """In-memory state for one crash round shared by every player in a channel"""
+    
+    def __init__(self, crash_point, growth=0.06, key=None):
+        self.key = key  # Stakes bet on the round are held under this round key
+        self.crash_point = crash_point
+        self.growth = growth
+        self.phase = BETTING
+        self.bets = {}  # user_id -> CrashBet
+        self.auto_queue = []  # heap of (auto_cashout, user_id)
+        self.started_at = None
+        self.crash_time = math.log(crash_point) / growth
+        self.multiplier = 1.0
+        self.cashed_out = 0
+        self.version = 0  # Bumped on every visible change so renders can be skipped
+    
+    def place_bet(self, user_id, name, amount, auto_cashout=None):
+        """Add a bet while the round is taking bets, returning an error message if not allowed"""
+        if self.phase != BETTING:
+            return "This round has already launched! Wait for the next one."
+        if user_id in self.bets:
+            return "You already have a bet in this round!"
+        if auto_cashout is not None and auto_cashout <= 1.0:
+            return "Auto cash out must be above 1.00x!"
+        self.bets[user_id] = CrashBet(user_id, name, amount, auto_cashout)
+        if auto_cashout is not None:
+            heapq.heappush(self.auto_queue, (auto_cashout, user_id))
+        self.version += 1
+        return None
+    
+    def start(self, now):
+        """Launch the rocket"""
+        self.phase = RUNNING
+        self.started_at = now
+        self.version += 1
+    
+    def multiplier_at(self, now):
+        """The multiplier at a point in time, capped at the crash point"""
+        elapsed = max(0.0, now - self.started_at)
+        return min(math.floor(100 * math.exp(self.growth * elapsed)) / 100, self.crash_point)
+    
+    def tick(self, now):
+        """Advance the round, paying auto cash outs and detecting the crash"""
+        if self.phase != RUNNING:
+            return self.phase
+            
+        crashed = now - self.started_at >= self.crash_time
+        multiplier = self.crash_point if crashed else self.multiplier_at(now)
+        
+        # Auto cash outs trigger at exactly their target if the rocket got that far,
+        # including a target equal to the crash point
+        queue = self.auto_queue
+        while queue and queue[0][0] <= multiplier:
+            target, user_id = heapq.heappop(queue)
+            bet = self.bets[user_id]
+            if bet.cashed_at is None:
+                bet.cashed_at = target
+                self.cashed_out += 1
+                
+        if multiplier != self.multiplier:
+            self.multiplier = multiplier
+            self.version += 1
+            
+        if crashed:
+            self.phase = CRASHED
+            self.version += 1
+        return self.phase
+    
+    def cash_out(self, user_id, now):
+        """Cash out a player at the current multiplier, returning it or None if too late"""
+        bet = self.bets.get(user_id)
+        if not bet or bet.cashed_at is not None or self.tick(now) != RUNNING:
+            return None
+        bet.cashed_at = self.multiplier_at(now)
+        self.cashed_out += 1
+        self.version += 1
+        return bet.cashed_at
+    
+    @property
+    def total_wagered(self):
+        """Total amount bet this round"""
+        return sum(bet.amount for bet in self.bets.values())
+    
+    def results(self):
+        """Get (user_id, amount, net) for every bet, ready for bulk settlement"""
+        return [(bet.user_id, bet.amount, bet.net) for bet in self.bets.values()]
+
+def simulate_round(players, seed=None, tick_rate=10, house_edge=0.01, growth=0.06):
+    """Load test one round with many simulated players, timing the in-memory work"""
+    rng = random.Random(seed)
+    crash_round = CrashRound(generate_crash_point(rng, house_edge), growth)
+    
+    start = time.perf_counter()
+    manual = []
+    for user_id in range(players):
+        amount = rng.randint(10, 10000)
+        if rng.random() < 0.5:
+            crash_round.place_bet(user_id, f"player{user_id}", amount, round(1 + rng.expovariate(1.0), 2) + 0.01)
+        else:
+            crash_round.place_bet(user_id, f"player{user_id}", amount)
+            manual.append((rng.expovariate(0.1), user_id))
+    betting_time = time.perf_counter() - start
+    
+    # Play the round in virtual time, cashing manual players out as their timers come up
+    manual.sort()
+    crash_round.start(0.0)
+    now = 0.0
+    ticks = 0
+    tick_time = 0.0
+    next_manual = 0
+    while True:
+        now += 1 / tick_rate
+        tick_start = time.perf_counter()
+        while next_manual < len(manual) and manual[next_manual][0] <= now:
+            crash_round.cash_out(manual[next_manual][1], manual[next_manual][0])
+            next_manual += 1
+        phase = crash_round.tick(now)
+        tick_time += time.perf_counter() - tick_start
+        ticks += 1
+        if phase == CRASHED:
+            break
+            
+    settle_start = time.perf_counter()
+    results = crash_round.results()
+    settle_time = time.perf_counter() - settle_start
+    
+    return {
+        "players": players,
+        "crash_point": crash_round.crash_point,
+        "cashed_out": crash_round.cashed_out,
+        "ticks": ticks,
+        "betting_ms": betting_time * 1000,
+        "avg_tick_ms": tick_time / ticks * 1000,
+        "settle_build_ms": settle_time * 1000,
+        "wagered": sum(amount for user_id, amount, net in results),
+        "net": sum(net for user_id, amount, net in results)
+    }
+
+def simulate_rtp(rounds, cashout_at=2.0, seed=None, house_edge=0.01):
+    """Estimate the return to player for a fixed auto cash out target"""
+    rng = random.Random(seed)
+    returned = 0.0
+    for _ in range(rounds):
+        if generate_crash_point(rng, house_edge) >= cashout_at:
+            returned += cashout_at
+    return returned / rounds
+
+if __name__ == "__main__":
+    import sys
+    
+    player_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    for round_number in range(5):
+        stats = simulate_round(player_count, seed=round_number)
+        print(
+            f"{stats['players']:,} players | crash {stats['crash_point']:.2f}x after {stats['ticks']} ticks | "
+            f"{stats['cashed_out']:,} cashed out | bets {stats['betting_ms']:.1f}ms | "
+            f"tick {stats['avg_tick_ms']:.3f}ms avg | settlement rows {stats['settle_build_ms']:.1f}ms"
+        )
+    for target in (1.5, 2.0, 10.0):
+        print(f"RTP at {target}x auto cash out: {simulate_rtp(1000000, target, seed=1) * 100:.2f}%")
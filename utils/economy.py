@@ -3,8 +3,16 @@ import asyncio
 import discord
 from discord.ext import commands
 import config
-from database.models import User, Transaction
-from database.database import get_session
+from sqlalchemy import select, update, insert, delete, case, literal
+from database.models import User, Transaction, GameStats, HeldStake
+from database import database
+from database.database import get_session, user_sessions, all_sessions, mark_written
+
+def _per_user(values, column):
+    """Build a CASE expression mapping user IDs to per-user values (0 for anyone else)"""
+    if not values:
+        return literal(0)
+    return case(values, value=column, else_=0)
 
 class EconomyManager:
     """Utility class to handle economic transactions in the bot"""
@@ -90,6 +98,17 @@ class EconomyManager:
         if sender_id == receiver_id:
             return False, "You can't send money to yourself."
             
+        # Users in different partitions can't share a transaction, so use the two-phase transfer
+        partitions = database.partitions
+        if partitions is not None and partitions.partition_for(sender_id) != partitions.partition_for(receiver_id):
+            await self.get_user(sender_id)
+            tax_amount = int(amount * tax_rate)
+            final_amount = amount - tax_amount
+            balances = await partitions.transfer_cash(sender_id, receiver_id, amount, final_amount)
+            if balances is None:
+                return False, "You don't have enough cash."
+            return True, dict(balances, amount=amount, tax=tax_amount, final_amount=final_amount)
+            
         async with get_session() as session:
             sender = await session.get(User, sender_id)
             if not sender:
@@ -137,6 +156,278 @@ class EconomyManager:
                 "final_amount": final_amount
             }
     
+    async def get_balances(self, user_ids):
+        """Get the cash balances for many users in one query"""
+        if not user_ids:
+            return {}
+            
+        async with get_session() as session:
+            result = await session.execute(select(User.id, User.cash).where(User.id.in_(user_ids)))
+            balances = dict(result.all())
+        
+        # Users without a row yet start with the default cash
+        for user_id in user_ids:
+            balances.setdefault(user_id, config.STARTING_CASH)
+        return balances
+    
+    @property
+    def owner(self):
+        """The cluster whose rounds this process runs, which owns the stakes it holds"""
+        return getattr(self.bot, "cluster_id", None)
+    
+    async def hold_stakes(self, game_name, stakes, round_key, channel_id=None):
+        """Take players' stakes from their balances when their bets are placed
+        
+        stakes maps user IDs to amounts. Each stake is taken with a conditional
+        UPDATE, so it's only held if the balance covers it at that moment however
+        many bets are being placed, and is recorded against round_key in the same
+        transaction so a restart can give it back. Returns the new balances of
+        the players whose stakes were held; anyone left out couldn't afford theirs.
+        """
+        balances = {}
+        for session_factory, user_ids in user_sessions(stakes):
+            async with session_factory() as session:
+                await self._create_missing_users(session, user_ids)
+                
+                held = []
+                for user_id in user_ids:
+                    result = await session.execute(
+                        update(User)
+                        .where(User.id == user_id, User.cash >= stakes[user_id])
+                        .values(cash=User.cash - stakes[user_id])
+                        .execution_options(synchronize_session=False)
+                    )
+                    if result.rowcount == 1:
+                        held.append(user_id)
+                        
+                if held:
+                    await session.execute(insert(Transaction), [
+                        {"user_id": user_id, "amount": stakes[user_id], "type": "debit", "reason": f"{game_name} bet"}
+                        for user_id in held
+                    ])
+                    await session.execute(insert(HeldStake), [
+                        {
+                            "round_key": round_key,
+                            "user_id": user_id,
+                            "game_name": game_name,
+                            "channel_id": channel_id,
+                            "amount": stakes[user_id],
+                            "owner": self.owner
+                        }
+                        for user_id in held
+                    ])
+                    result = await session.execute(select(User.id, User.cash).where(User.id.in_(held)))
+                    balances.update(result.all())
+                    mark_written(session, held)
+                await session.commit()
+        return balances
+    
+    async def return_stakes(self, round_key, user_ids=None):
+        """Give back what is still held for a round, for some players or everyone in it
+        
+        Only stakes recorded by hold_stakes and not yet settled come back, so
+        calling this twice, or after settlement, returns nothing more. Returns
+        the amounts returned by user.
+        """
+        if user_ids is None:
+            factories = all_sessions()
+        else:
+            factories = [session_factory for session_factory, ids in user_sessions(user_ids)]
+            
+        criteria = [HeldStake.round_key == round_key]
+        if user_ids is not None:
+            criteria.append(HeldStake.user_id.in_(list(user_ids)))
+        returned = {}
+        for session_factory in factories:
+            async with session_factory() as session:
+                for user_id, game_name, channel_id, amount in await self._refund_held(session, criteria):
+                    returned[user_id] = returned.get(user_id, 0) + amount
+        return returned
+    
+    async def refund_held_stakes(self):
+        """Give back every stake this cluster held when it last stopped, for rounds that can't resume
+        
+        Returns (user_id, game_name, channel_id, amount) for each refund.
+        """
+        refunds = []
+        for session_factory in all_sessions():
+            async with session_factory() as session:
+                refunds.extend(await self._refund_held(session, [HeldStake.owner == self.owner]))
+        return refunds
+    
+    async def _refund_held(self, session, criteria):
+        """Credit back and delete the held stakes matching criteria in one partition
+        
+        The rows are deleted first, so two refunds of the same stakes can't both
+        find them. Returns (user_id, game_name, channel_id, amount) per refund.
+        """
+        result = await session.execute(
+            delete(HeldStake)
+            .where(*criteria)
+            .returning(HeldStake.user_id, HeldStake.game_name, HeldStake.channel_id, HeldStake.amount)
+        )
+        refunds = {}
+        for user_id, game_name, channel_id, amount in result.all():
+            key = (user_id, game_name, channel_id)
+            refunds[key] = refunds.get(key, 0) + amount
+        if not refunds:
+            await session.commit()
+            return []
+            
+        amounts = {}
+        for (user_id, game_name, channel_id), amount in refunds.items():
+            amounts[user_id] = amounts.get(user_id, 0) + amount
+        await session.execute(
+            update(User)
+            .where(User.id.in_(list(amounts)))
+            .values(cash=User.cash + _per_user(amounts, User.id))
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(insert(Transaction), [
+            {"user_id": user_id, "amount": amount, "type": "credit", "reason": f"{game_name} bet returned"}
+            for (user_id, game_name, channel_id), amount in refunds.items()
+        ])
+        mark_written(session, list(amounts))
+        await session.commit()
+        return [(user_id, game_name, channel_id, amount) for (user_id, game_name, channel_id), amount in refunds.items()]
+    
+    async def settle_bets(self, game_name, results, round_key=None):
+        """Settle many bet results in a single database transaction
+        
+        results is a list of (user_id, bet_amount, net) tuples where net is the
+        amount won (positive) or lost (negative). With a round_key the stakes
+        were already taken by hold_stakes for that round, so each user is
+        credited what they had held plus their net and the held stakes are
+        cleared; anything held beyond the bet goes back this way. Every table is written with
+        set-based statements, so the cost doesn't grow with the number of
+        players. A settlement that would leave anyone below zero is refused with
+        ValueError. Returns the new balances by user.
+        """
+        if not results:
+            return {}
+        
+        # Combine results per user
+        deltas = {}
+        played = {}
+        wagered = {}
+        won = {}
+        winnings = {}
+        best = {}
+        for user_id, bet_amount, net in results:
+            deltas[user_id] = deltas.get(user_id, 0) + net
+            played[user_id] = played.get(user_id, 0) + 1
+            wagered[user_id] = wagered.get(user_id, 0) + bet_amount
+            if net > 0:
+                won[user_id] = won.get(user_id, 0) + 1
+                winnings[user_id] = winnings.get(user_id, 0) + net
+                best[user_id] = max(best.get(user_id, 0), net)
+                
+        game_key = game_name.lower()
+        
+        # One transaction per database partition (just one unless partitioning is on)
+        balances = {}
+        for session_factory, user_ids in user_sessions(deltas):
+            balances.update(await self._settle_partition(session_factory, game_name, game_key, user_ids, deltas, played, wagered, won, winnings, best, round_key))
+        return balances
+    
+    async def _create_missing_users(self, session, user_ids):
+        """Create any of the users that don't have a row yet in one INSERT"""
+        result = await session.execute(select(User.id).where(User.id.in_(user_ids)))
+        existing = set(result.scalars())
+        missing = [
+            {"id": user_id, "cash": config.STARTING_CASH, "level": 1, "experience": 0}
+            for user_id in user_ids if user_id not in existing
+        ]
+        if missing:
+            await session.execute(insert(User), missing)
+    
+    async def _settle_partition(self, session_factory, game_name, game_key, user_ids, deltas, played, wagered, won, winnings, best, round_key):
+        """Apply settle_bets' writes for the users held by one partition"""
+        async with session_factory() as session:
+            await self._create_missing_users(session, user_ids)
+            
+            # Held stakes are spent now, in the same transaction that pays them out
+            if round_key:
+                result = await session.execute(
+                    delete(HeldStake)
+                    .where(HeldStake.round_key == round_key, HeldStake.user_id.in_(user_ids))
+                    .returning(HeldStake.user_id, HeldStake.amount)
+                )
+                deltas = dict(deltas)
+                for user_id, amount in result.all():
+                    deltas[user_id] += amount
+            
+            # Apply every balance change with one UPDATE, which skips anyone it would overdraw
+            change = _per_user(deltas, User.id)
+            result = await session.execute(
+                update(User)
+                .where(User.id.in_(user_ids), User.cash + change >= 0)
+                .values(
+                    cash=User.cash + change,
+                    games_played=User.games_played + _per_user(played, User.id)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != len(user_ids):
+                await session.rollback()
+                raise ValueError(f"{game_name} settlement refused: it would leave a balance below zero")
+            
+            # Record the ledger entries with one bulk INSERT; held stakes were debited already
+            credit_reason = f"{game_name} payout" if round_key else f"{game_name} win"
+            transactions = [
+                {
+                    "user_id": user_id,
+                    "amount": abs(deltas[user_id]),
+                    "type": "credit" if deltas[user_id] > 0 else "debit",
+                    "reason": credit_reason if deltas[user_id] > 0 else f"{game_name} loss"
+                }
+                for user_id in user_ids if deltas[user_id]
+            ]
+            if transactions:
+                await session.execute(insert(Transaction), transactions)
+            
+            # Create missing game stats rows, then update them all with one UPDATE
+            result = await session.execute(
+                select(GameStats.user_id).where(GameStats.user_id.in_(user_ids), GameStats.game_name == game_key)
+            )
+            have_stats = set(result.scalars())
+            new_stats = [
+                {
+                    "user_id": user_id,
+                    "game_name": game_key,
+                    "games_played": 0,
+                    "games_won": 0,
+                    "total_bet": 0,
+                    "total_won": 0,
+                    "highest_win": 0
+                }
+                for user_id in user_ids if user_id not in have_stats
+            ]
+            if new_stats:
+                await session.execute(insert(GameStats), new_stats)
+                
+            best_win = _per_user(best, GameStats.user_id)
+            await session.execute(
+                update(GameStats)
+                .where(GameStats.user_id.in_(user_ids), GameStats.game_name == game_key)
+                .values(
+                    games_played=GameStats.games_played + _per_user(played, GameStats.user_id),
+                    games_won=GameStats.games_won + _per_user(won, GameStats.user_id),
+                    total_bet=GameStats.total_bet + _per_user(wagered, GameStats.user_id),
+                    total_won=GameStats.total_won + _per_user(winnings, GameStats.user_id),
+                    highest_win=case((best_win > GameStats.highest_win, best_win), else_=GameStats.highest_win)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            
+            # Read back the new balances
+            result = await session.execute(select(User.id, User.cash).where(User.id.in_(user_ids)))
+            balances = dict(result.all())
+            
+            mark_written(session, user_ids)
+            await session.commit()
+            return balances
+    
     async def daily_reward(self, user_id):
         """Give a daily reward to a user"""
         reward = random.randint(config.DAILY_MIN, config.DAILY_MAX)
@@ -32,6 +32,12 @@ class EmbedBuilder:
             
         return embed
     
+    @staticmethod
+    def stamp(embed):
+        """Set a prebuilt embed's timestamp to now so it can be sent again without rebuilding it"""
+        embed.timestamp = datetime.utcnow()
+        return embed
+    
     @staticmethod
     def success(title, description, footer=None, thumbnail=None):
         """Create a success-themed embed"""
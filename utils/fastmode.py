@@ -0,0 +1,81 @@
+import asyncio
+from sqlalchemy import select
+from database.database import get_session
+from database.models import FastModeSetting
+from utils.metrics import metrics
+
+# Who a fast mode setting applies to
+GUILD = "guild"
+USER = "user"
+
+class FastModeSettings:
+    """Guild and user choices to skip game animations, cached in memory and written through to the database"""
+
+    def __init__(self):
+        self.guilds = {}  # guild_id -> enabled
+        self.users = {}  # user_id -> enabled
+
+    async def load(self):
+        """Load every saved setting in one query"""
+        async with get_session() as session:
+            result = await session.execute(select(FastModeSetting))
+            rows = result.scalars().all()
+
+        self.guilds.clear()
+        self.users.clear()
+        for row in rows:
+            settings = self.guilds if row.scope == GUILD else self.users
+            settings[row.target_id] = row.enabled
+
+    def is_fast(self, guild_id, user_id):
+        """Whether a user's games skip animations; their own choice wins over their guild's"""
+        enabled = self.users.get(user_id)
+        if enabled is None:
+            enabled = self.guilds.get(guild_id, False)
+        return enabled
+
+    async def set(self, scope, target_id, enabled):
+        """Save a guild's or user's setting"""
+        async with get_session() as session:
+            setting = await session.get(FastModeSetting, (scope, target_id))
+            if not setting:
+                setting = FastModeSetting(scope=scope, target_id=target_id)
+                session.add(setting)
+            setting.enabled = enabled
+            await session.commit()
+
+        settings = self.guilds if scope == GUILD else self.users
+        settings[target_id] = enabled
+
+    def forget_users(self, user_ids):
+        """Drop the cached settings of users whose rows were erased"""
+        for user_id in user_ids:
+            self.users.pop(user_id, None)
+
+async def suspense(ctx, content=None, delay=1.5, typing=False, embed=None, combined=True):
+    """Send a placeholder and wait before a game's result, unless the player is in fast mode
+
+    Returns the placeholder to edit with the result, or None in fast mode, where
+    the caller sends the result as its only message (combined with the bet result
+    message, if the game sends one). Slash commands are deferred instead so the
+    result can take as long as it needs as a single follow-up.
+    """
+    guild_id = ctx.guild.id if ctx.guild else None
+    if ctx.bot.fast_mode.is_fast(guild_id, ctx.author.id):
+        # Skips the placeholder, its edit and the typing call, less the defer an
+        # unanswered interaction needs, and the final send unless it replaces a bet result message
+        deferred = ctx.interaction is not None and not ctx.interaction.response.is_done()
+        if deferred:
+            await ctx.defer()
+        saved = 2 + (1 if typing else 0) - (1 if deferred else 0) - (0 if combined else 1)
+        metrics.incr("fast_mode.plays")
+        metrics.incr("fast_mode.rest_calls_saved", saved)
+        metrics.incr("fast_mode.seconds_saved", delay)
+        return None
+
+    message = await ctx.send(content, embed=embed)
+    if typing:
+        await ctx.typing()
+    await asyncio.sleep(delay)
+    metrics.incr("fast_mode.animated_plays")
+    return message
@@ -0,0 +1,72 @@
+from sqlalchemy import select
+from database.database import get_session
+from database.models import GuildConfig
+
+class GuildSettings:
+    """A read-only snapshot of a guild's config row"""
+    __slots__ = (
+        "guild_id", "prefix", "admin_ids", "channel_ids", "allowed_channels", "force_commands",
+        "cash_name", "cashmoji", "crypto_name", "cryptomoji", "is_premium"
+    )
+    
+    def __init__(self, row):
+        self.guild_id = row.guild_id
+        self.prefix = row.prefix
+        self.admin_ids = tuple(row.admin_ids or ())
+        self.channel_ids = tuple(row.channel_ids or ())
+        self.allowed_channels = frozenset(self.channel_ids)
+        self.force_commands = bool(row.force_commands)
+        self.cash_name = row.cash_name
+        self.cashmoji = row.cashmoji
+        self.crypto_name = row.crypto_name
+        self.cryptomoji = row.cryptomoji
+        self.is_premium = bool(row.is_premium)
+
+class GuildConfigCache:
+    """Every guild's config held in memory so prefixes and channel restrictions cost no queries
+    
+    Loaded in bulk at startup and written through by the config commands, which
+    store the row they just committed.
+    """
+    
+    def __init__(self):
+        self.guilds = {}  # guild_id -> GuildSettings
+    
+    async def load(self):
+        """Load every guild's config in one query"""
+        async with get_session() as session:
+            result = await session.execute(select(GuildConfig))
+            rows = result.scalars().all()
+        self.guilds = {row.guild_id: GuildSettings(row) for row in rows}
+        return len(self.guilds)
+    
+    def get(self, guild_id):
+        """A guild's settings, or None if it has never been configured"""
+        return self.guilds.get(guild_id)
+    
+    def store(self, row):
+        """Replace a guild's cached settings with a row that was just written"""
+        settings = GuildSettings(row)
+        self.guilds[row.guild_id] = settings
+        return settings
+    
+    def forget(self, guild_id):
+        """Drop a guild's cached settings"""
+        self.guilds.pop(guild_id, None)
+    
+    def prefix(self, guild_id):
+        """A guild's custom prefix, if it has one"""
+        settings = self.guilds.get(guild_id)
+        return settings.prefix if settings else None
+    
+    def is_admin(self, guild_id, user_id):
+        """Whether a user is one of a guild's config admins"""
+        settings = self.guilds.get(guild_id)
+        return settings is not None and user_id in settings.admin_ids
+    
+    def allows_channel(self, guild_id, channel_id, parent_id=None):
+        """Whether commands may be used in a channel (or a thread of one) under the guild's restrictions"""
+        settings = self.guilds.get(guild_id)
+        if settings is None or not settings.allowed_channels:
+            return True
+        return channel_id in settings.allowed_channels or parent_id in settings.allowed_channels
@@ -0,0 +1,127 @@
+import time
+
+def trigrams(text):
+    """Character trigrams of a word, padded so short names and prefixes still match"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class CommandEntry:
+    """Everything help needs to know about a command, worked out once"""
+    __slots__ = ("command", "name", "category", "description", "usage", "aliases", "cooldown", "hidden")
+
+    def __init__(self, command, prefix):
+        self.command = command
+        self.name = command.name
+        self.category = command.cog.qualified_name if command.cog else "No Category"
+        self.description = command.help or "No description available."
+        self.usage = f"{prefix}{command.name} {command.signature}".rstrip()
+        self.aliases = ", ".join(f"{prefix}{alias}" for alias in command.aliases) if command.aliases else None
+        self.hidden = command.hidden
+
+        # Cooldowns set through discord.py's own decorators
+        self.cooldown = None
+        buckets = getattr(command, "_buckets", None)
+        if buckets and buckets._cooldown:
+            cooldown = buckets._cooldown
+            self.cooldown = f"{cooldown.rate} use(s) every {cooldown.per:.0f} seconds"
+
+class CommandIndex:
+    """Looks up commands by name or alias with one dict hit, and suggests close names for typos"""
+
+    def __init__(self, commands, prefix):
+        self.entries = {}  # Lowercase name or alias -> CommandEntry
+        self.categories = {}  # Cog name -> visible command names, in registration order
+        self.grams = {}  # Trigram -> set of names and aliases containing it
+        self.gram_counts = {}  # Name or alias -> number of trigrams it has
+        for command in commands:
+            entry = CommandEntry(command, prefix)
+            for key in [command.name, *command.aliases]:
+                key = key.lower()
+                self.entries.setdefault(key, entry)
+                if not entry.hidden:
+                    key_grams = trigrams(key)
+                    self.gram_counts[key] = len(key_grams)
+                    for gram in key_grams:
+                        self.grams.setdefault(gram, set()).add(key)
+            if not entry.hidden:
+                self.categories.setdefault(entry.category, []).append(entry.name)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, name):
+        """Find a command by name or alias, ignoring case"""
+        return self.entries.get(name.lower().strip())
+
+    def suggest(self, name, limit=3):
+        """Command names closest to a misspelt name, best first, by trigram similarity"""
+        query = trigrams(name.lower().strip())
+        shared = {}
+        for gram in query:
+            for key in self.grams.get(gram, ()):
+                shared[key] = shared.get(key, 0) + 1
+
+        # Jaccard similarity between the trigram sets
+        scored = sorted(
+            ((count / (len(query) + self.gram_counts[key] - count), key) for key, count in shared.items()),
+            reverse=True
+        )
+        suggestions = []
+        for score, key in scored:
+            if score < 0.2:
+                break
+            command_name = self.entries[key].name
+            if command_name not in suggestions:
+                suggestions.append(command_name)
+                if len(suggestions) == limit:
+                    break
+        return suggestions
+
+def benchmark(lookups=100000):
+    """Compare an index hit against scanning every command's aliases"""
+    from types import SimpleNamespace
+
+    commands = [
+        SimpleNamespace(
+            name=f"command{i}", aliases=[f"alias{i}a", f"alias{i}b"], cog=None,
+            help="", signature="<bet>", hidden=False
+        )
+        for i in range(200)
+    ]
+    start = time.perf_counter()
+    index = CommandIndex(commands, "$")
+    build_time = time.perf_counter() - start
+
+    names = [f"alias{i % 200}b" for i in range(lookups)]
+    start = time.perf_counter()
+    for name in names:
+        index.lookup(name)
+    index_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name in names[:lookups // 100]:
+        for command in commands:
+            if name in [alias.lower() for alias in command.aliases]:
+                break
+    scan_time = (time.perf_counter() - start) * 100
+
+    start = time.perf_counter()
+    for i in range(1000):
+        index.suggest(f"comand{i % 200}")
+    suggest_time = time.perf_counter() - start
+
+    return {
+        "commands": len(commands),
+        "build_ms": build_time * 1000,
+        "index_us": index_time / lookups * 1000000,
+        "scan_us": scan_time / lookups * 1000000,
+        "suggest_us": suggest_time / 1000 * 1000000
+    }
+
+if __name__ == "__main__":
+    result = benchmark()
+    print(
+        f"{result['commands']} commands indexed in {result['build_ms']:.1f}ms | "
+        f"lookup {result['index_us']:.2f}us vs alias scan {result['scan_us']:.1f}us | "
+        f"fuzzy suggestion {result['suggest_us']:.0f}us"
+    )
@@ -3,6 +3,7 @@ import re
 import asyncio
 import random
 from datetime import datetime, timedelta
+from utils.router import ROUTED_PREFIX
 
 def parse_amount(amount_str, max_value):
     """Parse an amount string, supporting 'max'/'all' keywords"""
@@ -66,6 +67,26 @@ def get_game_emoji(game_name):
     
     return emojis.get(game_name.lower(), "🎮")
 
+class RoutedView(discord.ui.View):
+    """Buttons whose clicks are delivered through the bot's InteractionRouter
+    
+    Each button's custom_id is "rv:<session key>:<action>"; the router only
+    answers clicks carrying that prefix. The view is stopped
+    straight away so discord.py doesn't keep it in its view store; clicks still
+    arrive through on_interaction, including on messages sent before a restart.
+    """
+    
+    def __init__(self, session_key, buttons, disabled=()):
+        super().__init__(timeout=None)
+        for action, label, style in buttons:
+            self.add_item(discord.ui.Button(
+                label=label,
+                style=style,
+                custom_id=f"{ROUTED_PREFIX}{session_key}:{action}",
+                disabled=action in disabled
+            ))
+        self.stop()
+
 async def create_paginated_embed(ctx, pages, timeout=60):
     """Create a paginated embed with navigation buttons"""
     if not pages:
@@ -73,45 +94,37 @@ async def create_paginated_embed(ctx, pages, timeout=60):
         
     current_page = 0
     
-    # Create the initial message
-    message = await ctx.send(embed=pages[current_page])
+    # Create the initial message with navigation buttons
+    session_key = f"page:{ctx.message.id}"
+    buttons = RoutedView(session_key, [
+        ("prev", "⬅️", discord.ButtonStyle.secondary),
+        ("next", "➡️", discord.ButtonStyle.secondary),
+        ("close", "❌", discord.ButtonStyle.danger)
+    ])
     
-    # Add navigation reactions
-    navigation = ["⬅️", "➡️", "❌"]
-    for emoji in navigation:
-        await message.add_reaction(emoji)
+    with ctx.bot.router.components_for(session_key, {ctx.author.id}) as clicks:
+        message = await ctx.send(embed=pages[current_page], view=buttons)
         
-    def check(reaction, user):
-        return (
-            reaction.message.id == message.id and
-            user.id == ctx.author.id and
-            str(reaction.emoji) in navigation
-        )
-    
-    # Listen for reactions
-    while True:
-        try:
-            reaction, user = await ctx.bot.wait_for("reaction_add", timeout=timeout, check=check)
-            
-            # Remove the user's reaction
-            await message.remove_reaction(reaction, user)
+        # Listen for clicks
+        while True:
+            try:
+                interaction, action = await clicks.get(timeout)
+            except asyncio.TimeoutError:
+                await message.edit(view=None)
+                break
             
             # Handle navigation
-            if str(reaction.emoji) == "⬅️":
+            if action == "prev":
                 current_page = (current_page - 1) % len(pages)
-                await message.edit(embed=pages[current_page])
+                await interaction.response.edit_message(embed=pages[current_page])
                 
-            elif str(reaction.emoji) == "➡️":
+            elif action == "next":
                 current_page = (current_page + 1) % len(pages)
-                await message.edit(embed=pages[current_page])
+                await interaction.response.edit_message(embed=pages[current_page])
                 
-            elif str(reaction.emoji) == "❌":
-                await message.clear_reactions()
+            elif action == "close":
+                await interaction.response.edit_message(view=None)
                 break
-                
-        except asyncio.TimeoutError:
-            await message.clear_reactions()
-            break
 
 class RockPaperScissors:
     """Helper class for Rock Paper Scissors game"""
@@ -0,0 +1,73 @@
+import time
+from contextlib import contextmanager
+
+class Timing:
+    """Running count, total and worst case of a timed operation"""
+    __slots__ = ("count", "total", "worst")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.worst:
+            self.worst = seconds
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else 0.0
+
+class Metrics:
+    """In-process counters and timings, grouped by dotted names like "fast_mode.plays" """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.counters = {}
+        self.timings = {}
+
+    def incr(self, name, amount=1):
+        """Add to a counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        """Record how long one operation took"""
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = self.timings[name] = Timing()
+        timing.add(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """Time the body of a with block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    @property
+    def uptime(self):
+        return time.monotonic() - self.started
+
+    def groups(self):
+        """Counters and timings grouped by the first part of their name"""
+        grouped = {}
+        for name, value in sorted(self.counters.items()):
+            group, _, key = name.partition(".")
+            grouped.setdefault(group, []).append((key or group, value))
+        for name, timing in sorted(self.timings.items()):
+            group, _, key = name.partition(".")
+            grouped.setdefault(group, []).append((key or group, timing))
+        return grouped
+
+    def reset(self):
+        """Clear every counter and timing"""
+        self.started = time.monotonic()
+        self.counters.clear()
+        self.timings.clear()
+
+# Shared registry for the whole bot process
+metrics = Metrics()
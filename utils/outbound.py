@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from utils.metrics import metrics
+
+# Kinds of queued request
+SEND = "send"
+EDIT = "edit"
+
+class TokenBucket:
+    """A per-channel rate limit: capacity requests per window, refilled continuously"""
+    __slots__ = ("capacity", "window", "tokens", "updated")
+
+    def __init__(self, capacity, window):
+        self.capacity = capacity
+        self.window = window
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def acquire(self, now):
+        """Take a token, or return how many seconds to wait for one without taking it"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / self.window)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) * self.window / self.capacity
+
+class Outgoing:
+    """A queued send or edit and the futures waiting on it"""
+    __slots__ = ("kind", "target", "kwargs", "futures", "merge", "queued_at")
+
+    def __init__(self, kind, target, kwargs, future, merge=False):
+        self.kind = kind
+        self.target = target  # The channel to send to, or the message to edit
+        self.kwargs = kwargs
+        self.futures = [future]
+        self.merge = merge
+        self.queued_at = time.monotonic()
+
+    @property
+    def mergeable(self):
+        """Whether this is a plain embed result that can share a message with others"""
+        return self.kind == SEND and self.merge and set(self.kwargs) <= {"embed", "embeds"}
+
+    @property
+    def embeds(self):
+        if "embeds" in self.kwargs:
+            return list(self.kwargs["embeds"])
+        return [self.kwargs["embed"]] if self.kwargs.get("embed") else []
+
+class ChannelQueue:
+    """Pending requests for one channel with its send and edit rate limit buckets"""
+    __slots__ = ("pending", "edits", "send_bucket", "edit_bucket", "worker")
+
+    def __init__(self, sends_per_window, edits_per_window, window):
+        self.pending = deque()
+        self.edits = {}  # message_id -> pending Outgoing edit
+        self.send_bucket = TokenBucket(sends_per_window, window)
+        self.edit_bucket = TokenBucket(edits_per_window, window)
+        self.worker = None
+
+class OutboundQueue:
+    """Paces game messages per channel so busy channels stay under Discord's rate limits
+
+    Edits to a message that are still waiting are coalesced into one edit with
+    the latest state, and plain embed results waiting in the same channel can be
+    merged into a single message. Interaction responses go out directly, since
+    they are limited per interaction rather than per channel.
+    """
+
+    def __init__(self, sends_per_window=5, edits_per_window=5, window=5.0, merge_limit=10):
+        self.sends_per_window = sends_per_window
+        self.edits_per_window = edits_per_window
+        self.window = window
+        self.merge_limit = merge_limit
+        self.channels = {}  # channel_id -> ChannelQueue
+        self.sent = 0  # Requests that reached Discord
+        self.failed = 0  # Requests Discord refused
+        self.coalesced = 0  # Edits folded into a waiting edit to the same message
+        self.merged = 0  # Sends folded into another result's message
+        self.dropped = 0  # Requests abandoned unsent when their channel's worker was cancelled
+
+    def _queue(self, channel_id):
+        queue = self.channels.get(channel_id)
+        if queue is None:
+            queue = ChannelQueue(self.sends_per_window, self.edits_per_window, self.window)
+            self.channels[channel_id] = queue
+        return queue
+
+    def _future(self, future=None):
+        """A future for a caller, which may never await it"""
+        future = future or asyncio.get_event_loop().create_future()
+        future.add_done_callback(self._retrieve)
+        return future
+    
+    def _retrieve(self, future):
+        """Mark a failed request's exception as retrieved so asyncio doesn't log it for fire-and-forget callers"""
+        if not future.cancelled() and future.exception() is not None:
+            metrics.incr("outbound.failed_results")
+    
+    def _start(self, channel_id, queue):
+        if queue.worker is None or queue.worker.done():
+            queue.worker = asyncio.ensure_future(self._drain(channel_id, queue))
+
+    def send(self, destination, content=None, *, merge=False, **kwargs):
+        """Queue a message to a channel or command context, returning an awaitable for the sent message
+
+        Takes the same arguments as Messageable.send. With merge=True a plain
+        embed result may be combined with other waiting results into one
+        message, which every merged caller gets back.
+        """
+        if content is not None:
+            kwargs["content"] = content
+        # Slash command responses and follow-ups aren't limited by the channel bucket
+        if getattr(destination, "interaction", None) is not None:
+            metrics.incr("outbound.direct")
+            return self._future(asyncio.ensure_future(destination.send(**kwargs)))
+
+        channel = getattr(destination, "channel", destination)
+        future = self._future()
+        item = Outgoing(SEND, channel, kwargs, future, merge)
+
+        queue = self._queue(channel.id)
+        queue.pending.append(item)
+        self._start(channel.id, queue)
+        return future
+
+    def edit(self, message, **kwargs):
+        """Queue an edit to a message, returning an awaitable for the edited message
+
+        If an edit to the same message is still waiting, the two are coalesced so
+        only the latest state is sent.
+        """
+        queue = self._queue(message.channel.id)
+        waiting = queue.edits.get(message.id)
+        if waiting is not None:
+            waiting.kwargs.update(kwargs)
+            self.coalesced += 1
+            metrics.incr("outbound.edits_coalesced")
+            return waiting.futures[0]
+
+        future = self._future()
+        item = Outgoing(EDIT, message, kwargs, future)
+        queue.edits[message.id] = item
+        queue.pending.append(item)
+        self._start(message.channel.id, queue)
+        return future
+
+    def _merge(self, queue, first):
+        """Fold waiting mergeable results into the first one, up to the embed limit"""
+        embeds = first.embeds
+        kept = deque()
+        while queue.pending:
+            item = queue.pending.popleft()
+            if item.mergeable and len(embeds) + len(item.embeds) <= self.merge_limit:
+                embeds.extend(item.embeds)
+                first.futures.extend(item.futures)
+                self.merged += 1
+                metrics.incr("outbound.sends_merged")
+                metrics.observe("outbound.queue_wait", time.monotonic() - item.queued_at)
+            else:
+                kept.append(item)
+        queue.pending = kept
+        if len(first.futures) > 1:
+            first.kwargs = {"embeds": embeds}
+
+    async def _drain(self, channel_id, queue):
+        """Send a channel's queued requests in order as its rate limit buckets allow"""
+        try:
+            await self._drain_pending(channel_id, queue)
+        except asyncio.CancelledError:
+            # Shutting down: whatever is still waiting won't be sent
+            for item in queue.pending:
+                for future in item.futures:
+                    future.cancel()
+            self.dropped += len(queue.pending)
+            metrics.incr("outbound.dropped", len(queue.pending))
+            queue.pending.clear()
+            queue.edits.clear()
+            raise
+        finally:
+            if self.channels.get(channel_id) is queue and not queue.pending:
+                del self.channels[channel_id]
+    
+    async def _drain_pending(self, channel_id, queue):
+        """Work through a channel's queue until it is empty"""
+        while queue.pending:
+            item = queue.pending[0]
+            bucket = queue.edit_bucket if item.kind == EDIT else queue.send_bucket
+            wait = bucket.acquire(time.monotonic())
+            if wait:
+                metrics.incr("outbound.throttled")
+                await asyncio.sleep(wait)
+                continue
+
+            queue.pending.popleft()
+            if item.kind == EDIT:
+                del queue.edits[item.target.id]
+                request = item.target.edit(**item.kwargs)
+            else:
+                if item.mergeable:
+                    self._merge(queue, item)
+                request = item.target.send(**item.kwargs)
+            metrics.observe("outbound.queue_wait", time.monotonic() - item.queued_at)
+
+            try:
+                result = await request
+            except Exception as e:
+                self.failed += 1
+                metrics.incr("outbound.failed")
+                logging.warning(f"Outbound {item.kind} to channel {channel_id} failed: {e}")
+                for future in item.futures:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                self.sent += 1
+                metrics.incr(f"outbound.{item.kind}s")
+                for future in item.futures:
+                    if not future.done():
+                        future.set_result(result)
+
+    def stats(self):
+        """Channels with queued requests, the total waiting, and what happened to requests so far"""
+        return {
+            "channels": len(self.channels),
+            "pending": sum(len(queue.pending) for queue in self.channels.values()),
+            "sent": self.sent,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "merged": self.merged,
+            "dropped": self.dropped
+        }
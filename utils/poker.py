@@ -0,0 +1,599 @@
+import random
+import time
+from itertools import combinations
+from utils.cards import DECK_SIZE, RANK_COUNT, Shoe, format_cards
+
+# Hand strengths follow Cactus Kev's numbering: 1 is a royal flush, 7462 is 7-5-4-3-2 offsuit.
+# Lower is better. These are the worst strengths in each category.
+WORST_STRAIGHT_FLUSH = 10
+WORST_FOUR_OF_A_KIND = 166
+WORST_FULL_HOUSE = 322
+WORST_FLUSH = 1599
+WORST_STRAIGHT = 1609
+WORST_THREE_OF_A_KIND = 2467
+WORST_TWO_PAIR = 3325
+WORST_PAIR = 6185
+WORST_HIGH_CARD = 7462
+
+HAND_CATEGORIES = (
+    (WORST_STRAIGHT_FLUSH, "Straight Flush"),
+    (WORST_FOUR_OF_A_KIND, "Four of a Kind"),
+    (WORST_FULL_HOUSE, "Full House"),
+    (WORST_FLUSH, "Flush"),
+    (WORST_STRAIGHT, "Straight"),
+    (WORST_THREE_OF_A_KIND, "Three of a Kind"),
+    (WORST_TWO_PAIR, "Two Pair"),
+    (WORST_PAIR, "Pair"),
+    (WORST_HIGH_CARD, "High Card"),
+)
+
+# One prime per rank, so the product of a hand's primes identifies its ranks regardless of order
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Per-card lookups so evaluation never does division or modulo
+CARD_PRIME = tuple(PRIMES[card % RANK_COUNT] for card in range(DECK_SIZE))
+CARD_BIT = tuple(1 << card for card in range(DECK_SIZE))  # Suit s occupies bits 13*s .. 13*s+12
+SUIT_MASK = (1 << RANK_COUNT) - 1
+
+# Rank masks of the ten straights from ace-high down to the wheel
+STRAIGHT_MASKS = tuple(0b11111 << low for low in range(8, -1, -1)) + (0b1000000001111,)
+
+def _prime_product(ranks):
+    """Multiply the primes of a list of ranks"""
+    product = 1
+    for rank in ranks:
+        product *= PRIMES[rank]
+    return product
+
+def _build_five_card_tables():
+    """Number every distinct 5-card hand class from best to worst
+    
+    Returns the flush table keyed by 13-bit rank mask and the unsuited table
+    keyed by prime product.
+    """
+    flushes = {}
+    unsuited = {}
+    descending = range(RANK_COUNT - 1, -1, -1)
+    straights = set(STRAIGHT_MASKS)
+    
+    # Five distinct ranks in descending order, minus the straights
+    high_cards = []
+    for ranks in combinations(descending, 5):
+        mask = sum(1 << rank for rank in ranks)
+        if mask not in straights:
+            high_cards.append((mask, ranks))
+            
+    strength = 1
+    for mask in STRAIGHT_MASKS:
+        flushes[mask] = strength
+        strength += 1
+    for quad in descending:
+        for kicker in descending:
+            if kicker != quad:
+                unsuited[PRIMES[quad] ** 4 * PRIMES[kicker]] = strength
+                strength += 1
+    for trips in descending:
+        for pair in descending:
+            if pair != trips:
+                unsuited[PRIMES[trips] ** 3 * PRIMES[pair] ** 2] = strength
+                strength += 1
+    for mask, ranks in high_cards:
+        flushes[mask] = strength
+        strength += 1
+    for mask in STRAIGHT_MASKS:
+        unsuited[_prime_product(rank for rank in range(RANK_COUNT) if mask >> rank & 1)] = strength
+        strength += 1
+    for trips in descending:
+        for kickers in combinations([rank for rank in descending if rank != trips], 2):
+            unsuited[PRIMES[trips] ** 3 * _prime_product(kickers)] = strength
+            strength += 1
+    for high, low in combinations(descending, 2):
+        for kicker in descending:
+            if kicker != high and kicker != low:
+                unsuited[PRIMES[high] ** 2 * PRIMES[low] ** 2 * PRIMES[kicker]] = strength
+                strength += 1
+    for pair in descending:
+        for kickers in combinations([rank for rank in descending if rank != pair], 3):
+            unsuited[PRIMES[pair] ** 2 * _prime_product(kickers)] = strength
+            strength += 1
+    for mask, ranks in high_cards:
+        unsuited[_prime_product(ranks)] = strength
+        strength += 1
+        
+    return flushes, unsuited
+
+FLUSH_5, UNSUITED_5 = _build_five_card_tables()
+
+def _build_flush_table():
+    """Best flush strength for every 13-bit suit mask, or 0 if it holds fewer than five cards"""
+    table = [0] * (1 << RANK_COUNT)
+    for mask in range(1 << RANK_COUNT):
+        if bin(mask).count("1") < 5:
+            continue
+        best = 0
+        for straight in STRAIGHT_MASKS:
+            if mask & straight == straight:
+                best = FLUSH_5[straight]
+                break
+        if not best:
+            # No straight flush, so the best flush is the five highest cards
+            top = 0
+            bits = 0
+            for rank in range(RANK_COUNT - 1, -1, -1):
+                if mask >> rank & 1:
+                    top |= 1 << rank
+                    bits += 1
+                    if bits == 5:
+                        break
+            best = FLUSH_5[top]
+        table[mask] = best
+    return table
+
+def _build_unsuited_table():
+    """Best non-flush strength for every 5, 6 and 7 card rank multiset, keyed by prime product"""
+    table = dict(UNSUITED_5)
+    
+    def add_multisets(size, start, ranks, counts):
+        if len(ranks) == size:
+            # Dropping one card at a time reaches every best subset through the smaller table
+            product = _prime_product(ranks)
+            table[product] = min(table[product // PRIMES[rank]] for rank in set(ranks))
+            return
+        for rank in range(start, RANK_COUNT):
+            if counts[rank] < 4:
+                counts[rank] += 1
+                ranks.append(rank)
+                add_multisets(size, rank, ranks, counts)
+                ranks.pop()
+                counts[rank] -= 1
+                
+    add_multisets(6, 0, [], [0] * RANK_COUNT)
+    add_multisets(7, 0, [], [0] * RANK_COUNT)
+    return table
+
+FLUSH_TABLE = _build_flush_table()
+UNSUITED_TABLE = _build_unsuited_table()
+
+def evaluate(cards):
+    """Get the strength of the best 5-card hand in 5 to 7 encoded cards (lower is better)"""
+    mask = 0
+    product = 1
+    for card in cards:
+        mask |= CARD_BIT[card]
+        product *= CARD_PRIME[card]
+    
+    # A suit with five or more cards rules out quads and full houses, so the flush is the best hand
+    flushes = FLUSH_TABLE
+    strength = (
+        flushes[mask & SUIT_MASK]
+        or flushes[mask >> 13 & SUIT_MASK]
+        or flushes[mask >> 26 & SUIT_MASK]
+        or flushes[mask >> 39]
+    )
+    return strength or UNSUITED_TABLE[product]
+
+def hand_category(strength):
+    """Get the name of the category a hand strength falls in"""
+    for worst, name in HAND_CATEGORIES:
+        if strength <= worst:
+            return name
+    return None
+
+def equity(hands, board=(), iterations=10000, rng=None):
+    """Estimate each hand's share of the pot against the others
+    
+    Boards with three or more cards are enumerated exactly; earlier streets are
+    sampled with Monte Carlo. Ties split the share between the tied hands.
+    """
+    rng = rng or random.Random()
+    dead = set(board)
+    for hand in hands:
+        dead.update(hand)
+    deck = [card for card in range(DECK_SIZE) if card not in dead]
+    missing = 5 - len(board)
+    
+    if missing == 0:
+        runouts = [()]
+    elif len(board) >= 3:
+        runouts = combinations(deck, missing)
+    else:
+        runouts = (rng.sample(deck, missing) for _ in range(iterations))
+    
+    # Fold each hand's hole cards into a partial mask and product once
+    partials = []
+    for hand in hands:
+        mask = 0
+        product = 1
+        for card in list(hand) + list(board):
+            mask |= CARD_BIT[card]
+            product *= CARD_PRIME[card]
+        partials.append((mask, product))
+        
+    flushes = FLUSH_TABLE
+    unsuited = UNSUITED_TABLE
+    shares = [0.0] * len(hands)
+    trials = 0
+    for runout in runouts:
+        run_mask = 0
+        run_product = 1
+        for card in runout:
+            run_mask |= CARD_BIT[card]
+            run_product *= CARD_PRIME[card]
+            
+        best = WORST_HIGH_CARD + 1
+        winners = []
+        for i, (mask, product) in enumerate(partials):
+            mask |= run_mask
+            strength = (
+                flushes[mask & SUIT_MASK]
+                or flushes[mask >> 13 & SUIT_MASK]
+                or flushes[mask >> 26 & SUIT_MASK]
+                or flushes[mask >> 39]
+                or unsuited[product * run_product]
+            )
+            if strength < best:
+                best = strength
+                winners = [i]
+            elif strength == best:
+                winners.append(i)
+                
+        split = 1 / len(winners)
+        for i in winners:
+            shares[i] += split
+        trials += 1
+        
+    return [share / trials for share in shares]
+
+# Betting actions
+FOLD = "fold"
+CHECK = "check"
+CALL = "call"
+RAISE = "raise"
+
+# Streets
+PREFLOP = 0
+FLOP = 1
+TURN = 2
+RIVER = 3
+SHOWDOWN = 4
+STREET_NAMES = ("Pre-Flop", "Flop", "Turn", "River", "Showdown")
+
+class HoldemSeat:
+    """A player's seat at a Hold'em table"""
+    __slots__ = ("user_id", "name", "cards", "street_bet", "total_bet", "folded", "acted", "missed", "leaving", "strength")
+    
+    def __init__(self, user_id, name):
+        self.user_id = user_id
+        self.name = name
+        self.cards = []
+        self.street_bet = 0  # Amount put in on the current street
+        self.total_bet = 0  # Amount put in this hand
+        self.folded = False
+        self.acted = False
+        self.missed = 0  # Turns in a row the player let time out
+        self.leaving = False
+        self.strength = None
+
+class HoldemTable:
+    """A fixed-limit Texas Hold'em cash table
+    
+    The small bet is the stake (used pre-flop and on the flop), the big bet is
+    twice the stake (turn and river), and each street is capped at a bet and
+    three raises. The table only counts chips: the caller takes each blind and
+    bet from the player's balance as it's posted (see blinds and cost) and
+    settles the hand once it's over.
+    """
+    __slots__ = (
+        "stake", "max_seats", "max_raises", "shoe", "seats", "waiting", "board",
+        "button", "street", "to_act", "current_bet", "raises", "in_hand", "hands_played"
+    )
+    
+    def __init__(self, stake, max_seats=9, max_raises=3, rng=None):
+        self.stake = stake
+        self.max_seats = max_seats
+        self.max_raises = max_raises
+        self.shoe = Shoe(1, 0.0, rng)  # Single deck, shuffled before every hand
+        self.seats = []  # HoldemSeats in table order
+        self.waiting = []  # HoldemSeats joining at the next deal
+        self.board = []
+        self.button = -1
+        self.street = PREFLOP
+        self.to_act = None  # Index of the seat whose turn it is
+        self.current_bet = 0
+        self.raises = 0
+        self.in_hand = False
+        self.hands_played = 0
+    
+    @property
+    def max_loss(self):
+        """The most a single player can lose in one hand"""
+        return (self.max_raises + 1) * self.stake * 6
+    
+    def find(self, user_id):
+        """Get a player's seat, including players waiting for the next hand"""
+        for seat in self.seats + self.waiting:
+            if seat.user_id == user_id:
+                return seat
+        return None
+    
+    def sit(self, user_id, name):
+        """Seat a player, returning an error message if they can't sit"""
+        seat = self.find(user_id)
+        if seat:
+            seat.leaving = False
+            return None
+        if len(self.seats) + len(self.waiting) >= self.max_seats:
+            return f"This table is full! ({self.max_seats} seats)"
+        if self.in_hand:
+            self.waiting.append(HoldemSeat(user_id, name))
+        else:
+            self.seats.append(HoldemSeat(user_id, name))
+        return None
+    
+    def leave(self, user_id):
+        """Remove a player, folding them first if a hand is in progress"""
+        for seat in self.waiting:
+            if seat.user_id == user_id:
+                self.waiting.remove(seat)
+                return True
+        for index, seat in enumerate(self.seats):
+            if seat.user_id == user_id:
+                if self.in_hand:
+                    seat.leaving = True
+                    if index == self.to_act:
+                        self.act(user_id, FOLD)
+                    elif not seat.folded:
+                        seat.folded = True
+                        if len(self.live_seats) == 1:
+                            self.street = SHOWDOWN
+                            self.to_act = None
+                else:
+                    del self.seats[index]
+                return True
+        return False
+    
+    @property
+    def live_seats(self):
+        """Seats that haven't folded this hand"""
+        return [seat for seat in self.seats if not seat.folded]
+    
+    @property
+    def current_seat(self):
+        """The seat whose turn it is, if any"""
+        return self.seats[self.to_act] if self.to_act is not None else None
+    
+    @property
+    def bet_size(self):
+        """The fixed bet and raise size on the current street"""
+        return self.stake if self.street <= FLOP else self.stake * 2
+    
+    def _next_live(self, index):
+        """Index of the next seat after index that hasn't folded"""
+        count = len(self.seats)
+        for step in range(1, count + 1):
+            candidate = (index + step) % count
+            if not self.seats[candidate].folded:
+                return candidate
+        return None
+    
+    def _post(self, seat, amount):
+        """Put chips in for a seat"""
+        seat.street_bet += amount
+        seat.total_bet += amount
+    
+    def _blind_indexes(self, count):
+        """The (button, small blind, big blind) seat indexes for the next hand"""
+        # Heads up the button posts the small blind and acts first pre-flop
+        button = (self.button + 1) % count
+        small_blind = button if count == 2 else (button + 1) % count
+        return button, small_blind, (small_blind + 1) % count
+    
+    def blinds(self):
+        """The (user_id, amount) blinds the next deal will post, empty if it can't deal"""
+        seats = self.seats + self.waiting
+        if len(seats) < 2:
+            return []
+        _, small_blind, big_blind = self._blind_indexes(len(seats))
+        return [(seats[small_blind].user_id, self.stake // 2), (seats[big_blind].user_id, self.stake)]
+    
+    def cost(self, action):
+        """Chips the seat whose turn it is would put in with an action"""
+        seat = self.current_seat
+        if seat is None:
+            return 0
+        if action == CALL:
+            return self.current_bet - seat.street_bet
+        if action == RAISE:
+            return self.current_bet + self.bet_size - seat.street_bet
+        return 0
+    
+    def deal(self):
+        """Start a hand: seat newcomers, move the button, post blinds and deal hole cards
+        
+        Returns False if fewer than two players are seated.
+        """
+        self.seats.extend(self.waiting)
+        self.waiting = []
+        if len(self.seats) < 2:
+            return False
+            
+        shoe = self.shoe
+        shoe.start_hand()
+        self.board = []
+        for seat in self.seats:
+            seat.cards = []
+            seat.street_bet = 0
+            seat.total_bet = 0
+            seat.folded = False
+            seat.acted = False
+            seat.strength = None
+        for _ in range(2):
+            for seat in self.seats:
+                seat.cards.append(shoe.draw())
+        
+        count = len(self.seats)
+        self.button, small_blind, big_blind = self._blind_indexes(count)
+        self._post(self.seats[small_blind], self.stake // 2)
+        self._post(self.seats[big_blind], self.stake)
+        
+        self.street = PREFLOP
+        self.current_bet = self.stake
+        self.raises = 0
+        self.to_act = (big_blind + 1) % count
+        self.in_hand = True
+        self.hands_played += 1
+        return True
+    
+    def legal_actions(self):
+        """Actions available to the seat whose turn it is"""
+        seat = self.current_seat
+        if seat is None:
+            return []
+        actions = [FOLD]
+        actions.append(CHECK if seat.street_bet == self.current_bet else CALL)
+        if self.raises < self.max_raises:
+            actions.append(RAISE)
+        return actions
+    
+    def act(self, user_id, action):
+        """Apply an action for the seat whose turn it is, returning an error message if not allowed"""
+        seat = self.current_seat
+        if seat is None or seat.user_id != user_id:
+            return "It isn't your turn!"
+        if action not in self.legal_actions():
+            return f"You can't {action} right now!"
+            
+        if action == FOLD:
+            seat.folded = True
+        elif action == CALL:
+            self._post(seat, self.cost(CALL))
+        elif action == RAISE:
+            # An unopened post-flop pot is a bet rather than a raise
+            self._post(seat, self.cost(RAISE))
+            if self.current_bet:
+                self.raises += 1
+            self.current_bet += self.bet_size
+            for other in self.seats:
+                other.acted = False
+        seat.acted = True
+        
+        live = self.live_seats
+        if len(live) == 1:
+            # Everyone else folded
+            self.street = SHOWDOWN
+            self.to_act = None
+        elif all(other.acted and other.street_bet == self.current_bet for other in live):
+            self._next_street()
+        else:
+            self.to_act = self._next_live(self.to_act)
+        return None
+    
+    def _next_street(self):
+        """Deal the next street, or move to the showdown after the river"""
+        self.street += 1
+        self.current_bet = 0
+        self.raises = 0
+        for seat in self.seats:
+            seat.street_bet = 0
+            seat.acted = False
+            
+        if self.street == FLOP:
+            self.board.extend(self.shoe.draw() for _ in range(3))
+        elif self.street <= RIVER:
+            self.board.append(self.shoe.draw())
+            
+        self.to_act = self._next_live(self.button) if self.street < SHOWDOWN else None
+    
+    @property
+    def hand_over(self):
+        """Whether betting has finished for the current hand"""
+        return self.street == SHOWDOWN
+    
+    @property
+    def pot(self):
+        """Total chips put in this hand"""
+        return sum(seat.total_bet for seat in self.seats)
+    
+    def finish(self):
+        """Run out the showdown and split the pot between the best hands
+        
+        Returns a list of (user_id, total_bet, net, won) tuples.
+        """
+        live = self.live_seats
+        if len(live) > 1:
+            for seat in live:
+                seat.strength = evaluate(seat.cards + self.board)
+            best = min(seat.strength for seat in live)
+            winners = [seat for seat in live if seat.strength == best]
+        else:
+            winners = live
+        
+        # Odd chips go to the first winner after the button
+        pot = self.pot
+        share, odd = divmod(pot, len(winners))
+        count = len(self.seats)
+        order = sorted(winners, key=lambda seat: (self.seats.index(seat) - self.button - 1) % count)
+        payouts = {seat.user_id: share + (1 if i < odd else 0) for i, seat in enumerate(order)}
+        
+        results = []
+        for seat in self.seats:
+            won = payouts.get(seat.user_id, 0)
+            results.append((seat.user_id, seat.total_bet, won - seat.total_bet, seat.user_id in payouts))
+        
+        # Remove players who asked to leave during the hand
+        self.seats = [seat for seat in self.seats if not seat.leaving]
+        if self.seats:
+            self.button %= len(self.seats)
+        self.to_act = None
+        self.in_hand = False
+        return results
+    
+    def describe(self, seat):
+        """One-line description of a seat's hand for the showdown"""
+        if seat.strength is None:
+            return format_cards(seat.cards)
+        return f"{format_cards(seat.cards)} ({hand_category(seat.strength)})"
+
+def benchmark(evaluations=1000000, seed=None):
+    """Time 7-card evaluations and a heads-up equity calculation"""
+    rng = random.Random(seed)
+    hands = [rng.sample(range(DECK_SIZE), 7) for _ in range(min(evaluations, 100000))]
+    
+    start = time.perf_counter()
+    done = 0
+    while done < evaluations:
+        for hand in hands[:evaluations - done]:
+            evaluate(hand)
+        done += min(len(hands), evaluations - done)
+    evaluate_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    preflop = equity([[51, 38], [11, 24]], iterations=100000, rng=rng)  # AA vs KK
+    preflop_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    flop = equity([[51, 38], [11, 24]], board=[10, 22, 5])
+    flop_time = time.perf_counter() - start
+    
+    return {
+        "evaluations": evaluations,
+        "evaluations_per_second": evaluations / evaluate_time,
+        "preflop_equity": preflop,
+        "preflop_runouts_per_second": 100000 / preflop_time,
+        "flop_equity": flop,
+        "flop_ms": flop_time * 1000
+    }
+
+if __name__ == "__main__":
+    import sys
+    
+    start = time.perf_counter()
+    _build_five_card_tables()
+    _build_flush_table()
+    _build_unsuited_table()
+    print(f"Tables: {len(FLUSH_5) + len(UNSUITED_5):,} 5-card classes, {len(UNSUITED_TABLE):,} unsuited keys, rebuilt in {time.perf_counter() - start:.2f}s")
+    
+    result = benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000, seed=1)
+    print(f"evaluate: {result['evaluations']:,} 7-card hands at {result['evaluations_per_second']:,.0f}/s")
+    print(f"AA vs KK pre-flop: {result['preflop_equity'][0] * 100:.2f}% / {result['preflop_equity'][1] * 100:.2f}% ({result['preflop_runouts_per_second']:,.0f} runouts/s)")
+    print(f"AA vs KK on a 4-Q-7 flop: {result['flop_equity'][0] * 100:.2f}% / {result['flop_equity'][1] * 100:.2f}% (exact, {result['flop_ms']:.1f}ms)")
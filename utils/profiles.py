@@ -0,0 +1,169 @@
+import asyncio
+import discord
+import config
+from database import database
+from database.database import get_session
+from database.read_models import load_profile, load_game_stats, load_mining_page, load_activity
+from utils.embeds import EmbedBuilder
+from utils.helpers import format_number
+from utils.metrics import metrics
+
+# Page names and the aliases people type for them
+PAGES = {
+    "overview": "overview",
+    "score": "games",
+    "stats": "games",
+    "games": "games",
+    "mine": "mining",
+    "mining": "mining",
+    "activity": "activity",
+    "recent": "activity"
+}
+
+class ProfilePages:
+    """Profile pages built on demand, one query each, and cached per user until that user's data changes
+
+    Rendered pages live in shared state under one key per user, so any cluster
+    can serve them, tagged with the user's version. Every commit that touches a
+    user's rows bumps that version through the database write listeners, which
+    retires their pages, and a page is only stored if the version didn't move
+    while it was built.
+    """
+
+    def __init__(self, state):
+        self.state = state
+        self.pending = set()  # Invalidations still in flight
+        self.builders = {
+            "overview": self.overview,
+            "games": self.games,
+            "mining": self.mining,
+            "activity": self.activity
+        }
+        database.write_listeners.append(self.invalidate)
+
+    async def render(self, member, page=None):
+        """The embed for one of a member's profile pages, or None if they have no account yet
+
+        Misses are built from the primary, since a replica trailing a write
+        would otherwise have its old page cached until the next one.
+        """
+        page = PAGES.get(page.lower(), "overview") if page else "overview"
+        key = f"profile:{member.id}"
+        version_key = f"profile_version:{member.id}"
+        values = await self.state.get_many([key, version_key])
+        version = values[version_key] or 0
+        cached = values[key]
+        if not cached or cached.get("version") != version:
+            cached = {"version": version, "pages": {}}
+        if page in cached["pages"]:
+            metrics.incr("profiles.hits")
+            return discord.Embed.from_dict(cached["pages"][page])
+
+        metrics.incr("profiles.misses")
+        with metrics.timer(f"profiles.build.{page}"):
+            async with get_session() as session:
+                embed = await self.builders[page](session, member)
+        if embed is None:
+            return None
+        
+        # A write committed while the page was built bumps the version; storing it then would pin the old page
+        if (await self.state.get(version_key) or 0) == version:
+            cached["pages"][page] = embed.to_dict()
+            await self.state.set(key, cached, ttl=config.PROFILE_CACHE_TTL)
+        else:
+            metrics.incr("profiles.stale_builds")
+        return embed
+
+    def invalidate(self, user_ids):
+        """Retire the cached pages of users a commit just changed by bumping their version"""
+        for user_id in user_ids:
+            task = asyncio.get_running_loop().create_task(self.state.incr(f"profile_version:{user_id}"))
+            self.pending.add(task)
+            task.add_done_callback(self.pending.discard)
+
+    async def overview(self, session, member):
+        """Cash, level and counters, with the mine and inventory from the same query"""
+        profile = await load_profile(session, member.id)
+        if profile is None:
+            return None
+        embed = EmbedBuilder.profile(member, profile.cash, profile.level, profile.experience)
+        embed.add_field(name="Mining Level", value=profile.mining_level, inline=True)
+        embed.add_field(name="Commands Used", value=profile.commands_used, inline=True)
+        embed.add_field(name="Games Played", value=profile.games_played, inline=True)
+        if profile.mine:
+            embed.add_field(
+                name="Mine",
+                value=f"{profile.mine.mine_name} (level {profile.mine.mining_level}, {profile.mine.mine_depth}m)",
+                inline=False
+            )
+        if profile.inventory:
+            gems = profile.inventory.diamond + profile.inventory.emerald + profile.inventory.redstone + profile.inventory.lapis
+            ores = profile.inventory.coal + profile.inventory.iron + profile.inventory.gold
+            embed.add_field(name="Ores", value=format_number(ores), inline=True)
+            embed.add_field(name="Gems", value=format_number(gems), inline=True)
+        return embed
+
+    async def games(self, session, member):
+        """A member's record at each game"""
+        stats = await load_game_stats(session, member.id)
+        embed = EmbedBuilder.info(
+            title=f"{member.name}'s Game Stats",
+            description="Record at every game played" if stats else "No games played yet!",
+            thumbnail=member.display_avatar.url
+        )
+        for game in stats[:24]:
+            win_rate = game.games_won / game.games_played * 100 if game.games_played else 0
+            embed.add_field(
+                name=game.game_name.capitalize(),
+                value=(
+                    f"Played: {format_number(game.games_played)} ({win_rate:.0f}% won)\n"
+                    f"Net: ${game.total_won - game.total_bet:,}\n"
+                    f"Best win: ${game.highest_win:,}"
+                ),
+                inline=True
+            )
+        return embed
+
+    async def mining(self, session, member):
+        """A member's mine, inventory and units"""
+        page = await load_mining_page(session, member.id)
+        if page is None:
+            return EmbedBuilder.info(
+                title=f"{member.name}'s Mine",
+                description="No mine started yet!",
+                thumbnail=member.display_avatar.url
+            )
+        embed = EmbedBuilder.info(
+            title=page.mine.mine_name,
+            description=f"Level {page.mine.mining_level} Mine | Depth: {page.mine.mine_depth}m",
+            thumbnail=member.display_avatar.url
+        )
+        embed.add_field(name="Ores Mined", value=format_number(page.mine.ores_mined), inline=True)
+        embed.add_field(name="Gems Found", value=format_number(page.mine.gems_found), inline=True)
+        embed.add_field(name="Unprocessed Materials", value=format_number(page.mine.unprocessed_materials), inline=True)
+        embed.add_field(name="Mining Units", value=f"{format_number(page.units)} across {page.unit_types} types", inline=True)
+        embed.add_field(name="Production", value=f"{page.production:,.1f}", inline=True)
+        if page.inventory:
+            packs = page.inventory.tech_packs + page.inventory.utility_packs + page.inventory.production_packs
+            embed.add_field(name="Packs", value=format_number(packs), inline=True)
+        return embed
+
+    async def activity(self, session, member):
+        """A member's credits and debits per day over the last week"""
+        days = await load_activity(session, member.id)
+        embed = EmbedBuilder.info(
+            title=f"{member.name}'s Recent Activity",
+            description="Cash in and out over the last 7 days" if days else "No activity in the last 7 days!",
+            thumbnail=member.display_avatar.url
+        )
+        totals = {}
+        for day in days:
+            credit, debit = totals.get(day.day, (0, 0))
+            if day.type == "credit":
+                credit += day.total
+            else:
+                debit += day.total
+            totals[day.day] = (credit, debit)
+        for day, (credit, debit) in totals.items():
+            embed.add_field(name=day, value=f"+${credit:,} / -${debit:,}", inline=False)
+        return embed
@@ -0,0 +1,172 @@
+import random
+
+# European single-zero wheel
+POCKETS = 37
+RED_NUMBERS = frozenset({1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36})
+BLACK_NUMBERS = frozenset(range(1, POCKETS)) - RED_NUMBERS
+
+# Payouts are quoted as odds-to-one
+STRAIGHT_ODDS = 35
+SPLIT_ODDS = 17
+STREET_ODDS = 11
+CORNER_ODDS = 8
+DOZEN_ODDS = 2
+COLUMN_ODDS = 2
+EVEN_MONEY_ODDS = 1
+
+# Display text for every pocket
+NUMBER_TEXT = tuple(
+    f"🟢 {n}" if n == 0 else f"🔴 {n}" if n in RED_NUMBERS else f"⚫ {n}"
+    for n in range(POCKETS)
+)
+
+def _mask(numbers):
+    """Build the 37-bit mask of the pockets a bet covers"""
+    mask = 0
+    for number in numbers:
+        mask |= 1 << number
+    return mask
+
+def _build_bet_table():
+    """Build every bet as bet key -> (mask, odds, label)"""
+    table = {}
+    
+    # Straight up bets, including zero
+    for n in range(POCKETS):
+        table[str(n)] = (_mask([n]), STRAIGHT_ODDS, f"Straight {n}")
+    
+    # Splits: horizontal and vertical neighbours on the layout, plus the zero splits
+    for n in range(1, POCKETS):
+        if n % 3 != 0:
+            table[f"{n}/{n + 1}"] = (_mask([n, n + 1]), SPLIT_ODDS, f"Split {n}/{n + 1}")
+        if n + 3 < POCKETS:
+            table[f"{n}/{n + 3}"] = (_mask([n, n + 3]), SPLIT_ODDS, f"Split {n}/{n + 3}")
+    for n in (1, 2, 3):
+        table[f"0/{n}"] = (_mask([0, n]), SPLIT_ODDS, f"Split 0/{n}")
+    
+    # Streets: rows of three, plus the two zero trios
+    for n in range(1, POCKETS, 3):
+        table[f"{n}/{n + 1}/{n + 2}"] = (_mask([n, n + 1, n + 2]), STREET_ODDS, f"Street {n}-{n + 2}")
+    table["0/1/2"] = (_mask([0, 1, 2]), STREET_ODDS, "Trio 0/1/2")
+    table["0/2/3"] = (_mask([0, 2, 3]), STREET_ODDS, "Trio 0/2/3")
+    
+    # Corners: squares of four, plus the first four
+    for n in range(1, POCKETS - 3):
+        if n % 3 != 0:
+            numbers = [n, n + 1, n + 3, n + 4]
+            key = "/".join(str(x) for x in numbers)
+            table[key] = (_mask(numbers), CORNER_ODDS, f"Corner {key}")
+    table["0/1/2/3"] = (_mask([0, 1, 2, 3]), CORNER_ODDS, "First Four")
+    
+    # Outside bets
+    table["red"] = (_mask(RED_NUMBERS), EVEN_MONEY_ODDS, "Red")
+    table["black"] = (_mask(BLACK_NUMBERS), EVEN_MONEY_ODDS, "Black")
+    table["even"] = (_mask(range(2, POCKETS, 2)), EVEN_MONEY_ODDS, "Even")
+    table["odd"] = (_mask(range(1, POCKETS, 2)), EVEN_MONEY_ODDS, "Odd")
+    table["low"] = (_mask(range(1, 19)), EVEN_MONEY_ODDS, "1-18")
+    table["high"] = (_mask(range(19, POCKETS)), EVEN_MONEY_ODDS, "19-36")
+    for i in range(3):
+        table[f"dozen{i + 1}"] = (_mask(range(i * 12 + 1, i * 12 + 13)), DOZEN_ODDS, f"Dozen {i * 12 + 1}-{i * 12 + 12}")
+        table[f"column{i + 1}"] = (_mask(range(i + 1, POCKETS, 3)), COLUMN_ODDS, f"Column {i + 1}")
+        
+    return table
+
+BET_TABLE = _build_bet_table()
+
+# Alternative names players can use for the named bets
+BET_ALIASES = {
+    "r": "red", "b": "black", "green": "0", "g": "0",
+    "e": "even", "o": "odd",
+    "1-18": "low", "l": "low", "19-36": "high", "h": "high",
+    "1-12": "dozen1", "first12": "dozen1", "1st12": "dozen1", "d1": "dozen1",
+    "13-24": "dozen2", "second12": "dozen2", "2nd12": "dozen2", "d2": "dozen2",
+    "25-36": "dozen3", "third12": "dozen3", "3rd12": "dozen3", "d3": "dozen3",
+    "col1": "column1", "c1": "column1",
+    "col2": "column2", "c2": "column2",
+    "col3": "column3", "c3": "column3",
+    "basket": "0/1/2/3", "firstfour": "0/1/2/3",
+}
+
+def lookup_bet(choice):
+    """Resolve a player's bet choice to its table key, or None if it isn't a valid bet"""
+    choice = choice.lower().strip()
+    choice = BET_ALIASES.get(choice, choice)
+    if choice in BET_TABLE:
+        return choice
+    
+    # Inside bets can list their numbers in any order, separated by / or -
+    parts = choice.replace("-", "/").split("/")
+    if not all(part.isdigit() for part in parts):
+        return None
+    key = "/".join(str(n) for n in sorted(int(part) for part in parts))
+    return key if key in BET_TABLE else None
+
+def spin(rng=random):
+    """Spin the wheel"""
+    return rng.randrange(POCKETS)
+
+def resolve(bets, result):
+    """Resolve (bet_key, amount) bets against one spin
+    
+    Returns a list of (bet_key, amount, net) and the total net.
+    """
+    bit = 1 << result
+    resolved = []
+    total = 0
+    for key, amount in bets:
+        mask, odds, label = BET_TABLE[key]
+        net = amount * odds if mask & bit else -amount
+        resolved.append((key, amount, net))
+        total += net
+    return resolved, total
+
+def bet_label(key):
+    """Get the display label for a bet"""
+    return BET_TABLE[key][2]
+
+def bet_odds(key):
+    """Get the odds-to-one payout for a bet"""
+    return BET_TABLE[key][1]
+
+class RouletteTable:
+    """A channel-wide roulette table that collects bets from everyone for one shared spin"""
+    
+    def __init__(self, max_bets=20, key=None):
+        self.max_bets = max_bets
+        self.key = key  # Stakes placed on the table are held under this round key
+        self.bets = {}  # user_id -> list of (bet_key, amount)
+        self.names = {}  # user_id -> display name
+        self.closed = False
+    
+    def committed(self, user_id):
+        """Total amount a player already has on the table"""
+        return sum(amount for key, amount in self.bets.get(user_id, []))
+    
+    def add_bets(self, user_id, name, bets):
+        """Add bets for a player, returning an error message if they can't be placed"""
+        if self.closed:
+            return "Betting is closed for this spin!"
+        placed = self.bets.setdefault(user_id, [])
+        if len(placed) + len(bets) > self.max_bets:
+            return f"You can place at most {self.max_bets} bets per spin!"
+        placed.extend(bets)
+        self.names[user_id] = name
+        return None
+    
+    @property
+    def player_count(self):
+        """Number of players with bets on the table"""
+        return len(self.bets)
+    
+    def spin(self, rng=random):
+        """Close betting, spin once and resolve every player's bets
+        
+        Returns the winning number and a list of (user_id, total_bet, net, resolved).
+        """
+        self.closed = True
+        result = spin(rng)
+        results = []
+        for user_id, bets in self.bets.items():
+            resolved, net = resolve(bets, result)
+            results.append((user_id, sum(amount for key, amount in bets), net, resolved))
+        return result, results
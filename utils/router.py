@@ -0,0 +1,211 @@
+import asyncio
+import time
+
+ROUTED_PREFIX = "rv:"  # Starts every custom_id RoutedView builds, so clicks on anyone else's components are left alone
+
+class Subscription:
+    """A game's feed of routed replies or button clicks, backed by a queue"""
+    __slots__ = ("router", "keys", "user_ids", "accept", "queue", "component")
+    
+    def __init__(self, router, keys, user_ids=None, accept=None, component=False):
+        self.router = router
+        self.keys = keys
+        self.user_ids = user_ids
+        self.accept = accept
+        self.queue = asyncio.Queue()
+        self.component = component
+    
+    async def get(self, timeout=None):
+        """Wait for the next routed item, raising asyncio.TimeoutError if none arrives in time"""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+    
+    def close(self):
+        """Stop routing to this subscription"""
+        self.router.remove(self)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class InteractionRouter:
+    """Routes chat replies and component clicks to the game waiting for them
+    
+    Replies are looked up by (channel_id, user_id) and clicks by the session
+    key in their custom_id ("rv:<session key>:<action>"), so the cost of routing
+    an event doesn't depend on how many games are running.
+    """
+    
+    def __init__(self):
+        self.replies = {}  # (channel_id, user_id) -> list of Subscriptions
+        self.components = {}  # session key -> Subscription
+        self.messages_seen = 0
+        self.messages_routed = 0
+        self.clicks_seen = 0
+        self.clicks_routed = 0
+    
+    def replies_from(self, channel_id, user_ids, accept=None):
+        """Subscribe to messages from some users in a channel, optionally filtered by accept(message)"""
+        keys = [(channel_id, user_id) for user_id in user_ids]
+        subscription = Subscription(self, keys, set(user_ids), accept)
+        for key in keys:
+            self.replies.setdefault(key, []).append(subscription)
+        return subscription
+    
+    def components_for(self, session_key, user_ids=None):
+        """Subscribe to clicks on buttons whose custom_id starts with session_key
+        
+        Clicks from anyone outside user_ids (if given) are turned away.
+        """
+        subscription = Subscription(self, [session_key], set(user_ids) if user_ids else None, component=True)
+        self.components[session_key] = subscription
+        return subscription
+    
+    def remove(self, subscription):
+        """Unregister a subscription from every key it was routed by"""
+        for key in subscription.keys:
+            if subscription.component:
+                if self.components.get(key) is subscription:
+                    del self.components[key]
+                continue
+            subscriptions = self.replies.get(key)
+            if subscriptions and subscription in subscriptions:
+                subscriptions.remove(subscription)
+                if not subscriptions:
+                    del self.replies[key]
+    
+    @property
+    def active(self):
+        """Number of live subscriptions"""
+        reply_subscriptions = {id(subscription) for subscriptions in self.replies.values() for subscription in subscriptions}
+        return len(reply_subscriptions) + len(self.components)
+    
+    def dispatch_message(self, message):
+        """Hand a message to the subscription waiting for it, returning True if one took it"""
+        self.messages_seen += 1
+        subscriptions = self.replies.get((message.channel.id, message.author.id))
+        if not subscriptions:
+            return False
+        for subscription in subscriptions:
+            if subscription.accept is None or subscription.accept(message):
+                subscription.queue.put_nowait(message)
+                self.messages_routed += 1
+                return True
+        return False
+    
+    def dispatch_click(self, custom_id, user_id, interaction):
+        """Hand a button click to its session
+        
+        Returns "routed", "forbidden" (someone else's game) or "expired" (no
+        session is listening), or None if the custom_id wasn't issued by a
+        RoutedView.
+        """
+        if not custom_id.startswith(ROUTED_PREFIX):
+            return None
+        self.clicks_seen += 1
+        session_key, separator, action = custom_id[len(ROUTED_PREFIX):].rpartition(":")
+        if not separator:
+            return None
+        subscription = self.components.get(session_key)
+        if subscription is None:
+            return "expired"
+        if subscription.user_ids is not None and user_id not in subscription.user_ids:
+            return "forbidden"
+        subscription.queue.put_nowait((interaction, action))
+        self.clicks_routed += 1
+        return "routed"
+    
+    async def on_message(self, message):
+        """Listener for every message the bot sees"""
+        if message.author.bot:
+            return
+        self.dispatch_message(message)
+    
+    async def on_interaction(self, interaction):
+        """Listener for every interaction; only clicks on RoutedView buttons are answered"""
+        data = interaction.data or {}
+        custom_id = data.get("custom_id")
+        if not custom_id or "component_type" not in data:
+            return
+            
+        result = self.dispatch_click(custom_id, interaction.user.id, interaction)
+        if result == "forbidden":
+            await interaction.response.send_message("This isn't your game!", ephemeral=True)
+        elif result == "expired":
+            await interaction.response.send_message("This game has already ended.", ephemeral=True)
+    
+    def stats(self):
+        """Routing counters and live subscription count"""
+        return {
+            "active": self.active,
+            "messages_seen": self.messages_seen,
+            "messages_routed": self.messages_routed,
+            "clicks_seen": self.clicks_seen,
+            "clicks_routed": self.clicks_routed
+        }
+
+def benchmark(games=10000, messages=100000):
+    """Compare per-message routing cost against one check closure per waiting game"""
+    from types import SimpleNamespace
+    
+    router = InteractionRouter()
+    checks = []
+    for game in range(games):
+        channel_id = game % 500
+        user_id = 1000000 + game
+        accept = lambda message: message.content.lower() in ("hit", "h", "stand", "s")
+        router.replies_from(channel_id, [user_id], accept)
+        
+        # What a wait_for("message", check=...) listener per game costs
+        def check(message, channel_id=channel_id, user_id=user_id):
+            return (
+                message.author.id == user_id and
+                message.channel.id == channel_id and
+                message.content.lower() in ("hit", "h", "stand", "s")
+            )
+        checks.append(check)
+    
+    # Mostly chatter from users not in a game, plus some game replies
+    feed = []
+    for i in range(messages):
+        player = i % 10 == 0
+        user_id = 1000000 + (i % games) if player else 5000000 + i
+        channel_id = (i % games) % 500 if player else i % 500
+        feed.append(SimpleNamespace(
+            channel=SimpleNamespace(id=channel_id),
+            author=SimpleNamespace(id=user_id, bot=False),
+            content="hit" if player else "hello"
+        ))
+        
+    start = time.perf_counter()
+    for message in feed:
+        router.dispatch_message(message)
+    routed_time = time.perf_counter() - start
+    
+    sample = feed[:max(1, messages // 100)]
+    start = time.perf_counter()
+    for message in sample:
+        for check in checks:
+            check(message)
+    scan_time = (time.perf_counter() - start) * len(feed) / len(sample)
+    
+    return {
+        "games": games,
+        "messages": messages,
+        "routed": router.messages_routed,
+        "router_us_per_message": routed_time / messages * 1000000,
+        "scan_us_per_message": scan_time / messages * 1000000
+    }
+
+if __name__ == "__main__":
+    import sys
+    
+    game_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    result = benchmark(game_count)
+    print(
+        f"{result['games']:,} waiting games, {result['messages']:,} messages ({result['routed']:,} routed): "
+        f"router {result['router_us_per_message']:.2f}us/message vs "
+        f"check scan {result['scan_us_per_message']:.0f}us/message "
+        f"({result['scan_us_per_message'] / result['router_us_per_message']:,.0f}x)"
+    )
@@ -0,0 +1,256 @@
+import asyncio
+import json
+import logging
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, update, delete
+from database.database import get_session
+from database.models import GameSession
+
+async def busy_users(state, user_ids):
+    """The users any bot process has marked busy in a game"""
+    keys = [f"playing:{user_id}" for user_id in user_ids]
+    values = await state.get_many(keys)
+    return [user_id for user_id, key in zip(user_ids, keys) if values[key] is not None]
+
+class LiveSession:
+    """An in-flight game held in memory and mirrored to the game_session table"""
+    __slots__ = ("store", "key", "game_name", "user_ids", "channel_id", "message_id", "bet_amount", "state", "encoded", "expires_at")
+    
+    def __init__(self, store, key, game_name, user_ids, channel_id, bet_amount=0, state=None, message_id=None, expires_at=None):
+        self.store = store
+        self.key = key
+        self.game_name = game_name
+        self.user_ids = list(user_ids)
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.bet_amount = bet_amount
+        self.state = state if state is not None else {}
+        self.encoded = encode_state(self.state)
+        self.expires_at = expires_at
+    
+    @property
+    def expired(self):
+        """Whether the session has gone longer than its TTL without a transition"""
+        return self.expires_at is not None and self.expires_at <= datetime.utcnow()
+    
+    async def save(self, state=None, message_id=None):
+        """Persist a state transition"""
+        await self.store.save(self, state, message_id)
+
+class BusyPlayers(dict):
+    """Busy players by user ID, mirrored to shared state so other bot processes see them too
+    
+    Writes to shared state go out in the background; each entry expires with the
+    session TTL there, so a process that dies can't leave players locked.
+    """
+    
+    def __init__(self, state, ttl):
+        super().__init__()
+        self.state = state
+        self.ttl = ttl
+    
+    def __setitem__(self, user_id, value):
+        super().__setitem__(user_id, value)
+        if self.state is not None:
+            asyncio.ensure_future(self.state.set(f"playing:{user_id}", value, ttl=self.ttl))
+    
+    async def claim(self, user_id, value):
+        """Mark a player busy unless they already are here or in another process; True if this call did
+        
+        The entry is taken locally before waiting on shared state, so two commands
+        in this process can't both win, and shared state is claimed with SET NX.
+        """
+        if user_id in self:
+            return False
+        super().__setitem__(user_id, value)
+        if self.state is not None and await self.state.claim(f"playing:{user_id}", self.ttl, value):
+            if self.get(user_id) == value:
+                super().pop(user_id)
+            return False
+        return True
+    
+    def refresh(self, user_ids):
+        """Push back the shared state expiry of players in long-running games"""
+        if self.state is None:
+            return
+        for user_id in user_ids:
+            if user_id in self:
+                asyncio.ensure_future(self.state.set(f"playing:{user_id}", self[user_id], ttl=self.ttl))
+    
+    def __delitem__(self, user_id):
+        super().__delitem__(user_id)
+        if self.state is not None:
+            asyncio.ensure_future(self.state.delete(f"playing:{user_id}"))
+    
+    def pop(self, user_id, *default):
+        if user_id in self:
+            value = super().pop(user_id)
+            if self.state is not None:
+                asyncio.ensure_future(self.state.delete(f"playing:{user_id}"))
+            return value
+        return super().pop(user_id, *default)
+
+def encode_state(state):
+    """Serialize game state as compact JSON"""
+    return json.dumps(state, separators=(",", ":"))
+
+class SessionStore:
+    """Tracks in-flight games in memory and persists each transition so they survive restarts
+    
+    Also owns the map of players that are busy in a game, which is released
+    whenever a session closes or expires, so a game that raises can't leave
+    its players locked.
+    """
+    
+    def __init__(self, ttl=600, state=None):
+        self.ttl = ttl
+        self.state = state
+        self.sessions = {}  # session key -> LiveSession
+        self.players = BusyPlayers(state, ttl)  # user_id -> session key, or a tag for games that aren't persisted
+        self.saves = 0
+        self.expired = 0
+    
+    async def is_playing(self, user_id):
+        """Whether a user is already in a game here or in another bot process
+        
+        Only a quick check before a command does any work; games take the player
+        with claim, which is what keeps two games from starting at once.
+        """
+        if user_id in self.players:
+            return True
+        return self.state is not None and await self.state.get(f"playing:{user_id}") is not None
+    
+    async def claim(self, user_id, tag):
+        """Mark a user busy in a game, returning False if they already are here or elsewhere"""
+        return await self.players.claim(user_id, tag)
+    
+    def _expiry(self):
+        return datetime.utcnow() + timedelta(seconds=self.ttl)
+    
+    def adopt(self, session):
+        """Track a session in memory and lock its players"""
+        self.sessions[session.key] = session
+        for user_id in session.user_ids:
+            self.players[user_id] = session.key
+    
+    async def start(self, key, game_name, user_ids, channel_id, bet_amount=0, state=None, message_id=None):
+        """Open a session and write its first snapshot"""
+        session = LiveSession(self, key, game_name, user_ids, channel_id, bet_amount, state, message_id, self._expiry())
+        self.adopt(session)
+        
+        async with get_session() as db:
+            await db.execute(insert(GameSession).values(
+                id=key,
+                game_name=game_name,
+                channel_id=channel_id,
+                message_id=message_id,
+                player_ids=session.user_ids,
+                bet_amount=bet_amount,
+                state=session.encoded,
+                expires_at=session.expires_at
+            ))
+            await db.commit()
+        self.saves += 1
+        return session
+    
+    async def save(self, session, state=None, message_id=None):
+        """Write a new snapshot of a session and push back its expiry"""
+        if state is not None:
+            session.state = state
+        if message_id is not None:
+            session.message_id = message_id
+        session.encoded = encode_state(session.state)
+        session.expires_at = self._expiry()
+        
+        async with get_session() as db:
+            await db.execute(
+                update(GameSession)
+                .where(GameSession.id == session.key)
+                .values(state=session.encoded, message_id=session.message_id, expires_at=session.expires_at)
+            )
+            await db.commit()
+        self.saves += 1
+    
+    def _forget(self, session):
+        """Drop a session from memory and release its players"""
+        if self.sessions.get(session.key) is session:
+            del self.sessions[session.key]
+        for user_id in session.user_ids:
+            if self.players.get(user_id) == session.key:
+                del self.players[user_id]
+    
+    async def close(self, session):
+        """End a session and delete its snapshot"""
+        self._forget(session)
+        async with get_session() as db:
+            await db.execute(delete(GameSession).where(GameSession.id == session.key))
+            await db.commit()
+    
+    @asynccontextmanager
+    async def open(self, key, game_name, user_ids, channel_id, bet_amount=0, state=None, message_id=None):
+        """Run a game inside a session that is always closed, even if the game raises"""
+        session = await self.start(key, game_name, user_ids, channel_id, bet_amount, state, message_id)
+        try:
+            yield session
+        finally:
+            await self.close(session)
+    
+    async def load_open(self):
+        """Load every session left in the database by a previous run"""
+        async with get_session() as db:
+            result = await db.execute(select(GameSession))
+            rows = result.scalars().all()
+            
+        sessions = []
+        for row in rows:
+            try:
+                state = json.loads(row.state) if row.state else {}
+            except ValueError:
+                state = {}
+            sessions.append(LiveSession(
+                self, row.id, row.game_name, row.player_ids or [], row.channel_id,
+                row.bet_amount or 0, state, row.message_id, row.expires_at
+            ))
+        return sessions
+    
+    async def sweep(self):
+        """Expire sessions that have gone quiet for longer than the TTL"""
+        expired = [session for session in self.sessions.values() if session.expired]
+        for session in expired:
+            logging.warning(f"Expiring abandoned {session.game_name} session {session.key}")
+            self._forget(session)
+        
+        # One DELETE clears every expired snapshot, including ones no live game owns
+        async with get_session() as db:
+            result = await db.execute(delete(GameSession).where(GameSession.expires_at <= datetime.utcnow()))
+            await db.commit()
+            
+        self.expired += len(expired)
+        return max(len(expired), result.rowcount or 0)
+    
+    async def run_sweeper(self, interval):
+        """Sweep expired sessions forever"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logging.error(f"Session sweep failed: {e}")
+    
+    def stats(self):
+        """Live session count and approximate memory held by the store"""
+        memory = sys.getsizeof(self.sessions) + sys.getsizeof(self.players)
+        state_bytes = 0
+        for session in self.sessions.values():
+            state_bytes += len(session.encoded)
+            memory += sys.getsizeof(session) + sys.getsizeof(session.encoded) + sys.getsizeof(session.user_ids)
+        return {
+            "live": len(self.sessions),
+            "players": len(self.players),
+            "state_bytes": state_bytes,
+            "memory_bytes": memory,
+            "saves": self.saves,
+            "expired": self.expired
+        }
@@ -0,0 +1,503 @@
+import asyncio
+import functools
+from abc import ABC, abstractmethod
+import heapq
+import json
+import time
+from urllib.parse import urlparse
+from utils.metrics import metrics
+
+# Scripts RedisState runs with EVAL so each check-and-write is one atomic step on the server
+LOCK_SCRIPT = (
+    "local holder = redis.call('GET', KEYS[1]) "
+    "if holder and holder ~= ARGV[1] then return 0 end "
+    "redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2]) return 1"
+)
+UNLOCK_SCRIPT = "if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end return 0"
+INCR_LIMIT_SCRIPT = (
+    "if tonumber(redis.call('GET', KEYS[1]) or '0') + tonumber(ARGV[1]) > tonumber(ARGV[2]) then return nil end "
+    "return redis.call('INCRBY', KEYS[1], ARGV[1])"
+)
+
+def timed(operation):
+    """Record an operation's latency under state.<backend>.<operation>"""
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                metrics.observe(f"state.{self.name}.{operation}", time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+class MemoryStore:
+    """The subset of Redis the bot uses, kept in process memory
+
+    Values are stored as strings like Redis stores them, so both backends hand
+    back exactly the same data.
+    """
+
+    def __init__(self):
+        self.values = {}  # key -> string
+        self.expiries = {}  # key -> monotonic deadline
+        self.zsets = {}  # key -> {member -> score}
+
+    def _alive(self, key):
+        deadline = self.expiries.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.values.pop(key, None)
+            self.zsets.pop(key, None)
+            del self.expiries[key]
+            return False
+        return key in self.values or key in self.zsets
+
+    def get(self, key):
+        return self.values.get(key) if self._alive(key) else None
+
+    def set(self, key, value, px=None, nx=False):
+        if nx and self._alive(key):
+            return False
+        self.values[key] = value
+        if px is not None:
+            self.expiries[key] = time.monotonic() + px / 1000
+        else:
+            self.expiries.pop(key, None)
+        return True
+
+    def delete(self, key):
+        existed = self._alive(key)
+        self.values.pop(key, None)
+        self.zsets.pop(key, None)
+        self.expiries.pop(key, None)
+        return 1 if existed else 0
+
+    def pttl(self, key):
+        if not self._alive(key):
+            return -2
+        deadline = self.expiries.get(key)
+        return -1 if deadline is None else int((deadline - time.monotonic()) * 1000)
+
+    def incrby(self, key, amount):
+        value = int(self.get(key) or 0) + amount
+        self.values[key] = str(value)
+        return value
+
+    def incrby_within(self, key, amount, limit):
+        """INCRBY unless the result would pass limit, in which case nothing changes and None comes back"""
+        if int(self.get(key) or 0) + amount > limit:
+            return None
+        return self.incrby(key, amount)
+    
+    def lock(self, key, owner, px):
+        """Set key to owner for px milliseconds unless someone else holds it; 1 if owner now does"""
+        holder = self.get(key)
+        if holder is not None and holder != owner:
+            return 0
+        self.set(key, owner, px=px)
+        return 1
+    
+    def unlock(self, key, owner):
+        """Delete key only if owner still holds it"""
+        return self.delete(key) if self.get(key) == owner else 0
+    
+    def zincrby(self, key, amount, member):
+        self._alive(key)
+        zset = self.zsets.setdefault(key, {})
+        zset[member] = zset.get(member, 0) + amount
+        return zset[member]
+
+    def zadd(self, key, score, member):
+        self._alive(key)
+        zset = self.zsets.setdefault(key, {})
+        added = member not in zset
+        zset[member] = score
+        return 1 if added else 0
+
+    def zrem(self, key, member):
+        zset = self.zsets.get(key) if self._alive(key) else None
+        if not zset or member not in zset:
+            return 0
+        del zset[member]
+        return 1
+
+    def zscore(self, key, member):
+        zset = self.zsets.get(key) if self._alive(key) else None
+        return zset.get(member) if zset else None
+
+    def zrange(self, key, start, stop, reverse=False):
+        """Members with scores ordered by score, with Redis's inclusive, negative-aware indices"""
+        zset = self.zsets.get(key) if self._alive(key) else None
+        if not zset:
+            return []
+        order = lambda item: (item[1], item[0])
+        if start >= 0 and stop >= 0:
+            # Only the first stop + 1 are needed, which a heap finds without sorting the whole set
+            pick = heapq.nlargest if reverse else heapq.nsmallest
+            return pick(stop + 1, zset.items(), key=order)[start:]
+        ordered = sorted(zset.items(), key=order, reverse=reverse)
+        stop = len(ordered) + stop if stop < 0 else stop
+        return ordered[start:stop + 1]
+
+class SharedState(ABC):
+    """Counters, TTL keys, sorted sets and locks that every bot process can share
+
+    Values are JSON, so anything the cogs store comes back the same whichever
+    backend is in use. Each operation's latency is recorded per backend.
+    """
+    name = "base"
+
+    @abstractmethod
+    async def get(self, key):
+        pass
+
+    @abstractmethod
+    async def get_many(self, keys):
+        """Several keys at once, as key -> value (None when missing)"""
+        pass
+
+    @abstractmethod
+    async def set(self, key, value, ttl=None):
+        pass
+
+    @abstractmethod
+    async def delete(self, key):
+        pass
+
+    @abstractmethod
+    async def claim(self, key, ttl, value=True):
+        """Set a key for ttl seconds unless it is already set
+
+        Returns 0 if this call set it, or the seconds left on the existing key.
+        """
+        pass
+
+    @abstractmethod
+    async def incr(self, key, amount=1, limit=None):
+        """Add to a counter; returns the new value, or None (and changes nothing) if it would pass the limit"""
+        pass
+
+    @abstractmethod
+    async def zincrby(self, key, member, amount):
+        pass
+
+    @abstractmethod
+    async def zadd(self, key, member, score):
+        pass
+
+    @abstractmethod
+    async def zrem(self, key, member):
+        pass
+
+    @abstractmethod
+    async def zscore(self, key, member):
+        pass
+
+    @abstractmethod
+    async def zrange(self, key, start=0, stop=-1, descending=True):
+        """Members of a sorted set with their scores, highest first by default"""
+        pass
+    
+    @abstractmethod
+    async def lock(self, name, owner, ttl):
+        """Take a named lock for ttl seconds, or extend it if the owner holds it; True if they now do"""
+        pass
+    
+    @abstractmethod
+    async def unlock(self, name, owner):
+        """Release a named lock if the owner still holds it, checked and deleted in one step"""
+        pass
+
+    async def close(self):
+        pass
+
+def _decode(raw):
+    return json.loads(raw) if raw is not None else None
+
+class MemoryState(SharedState):
+    """Shared state for a bot running as a single process"""
+    name = "memory"
+
+    def __init__(self, store=None):
+        self.store = store or MemoryStore()
+
+    @timed("get")
+    async def get(self, key):
+        return _decode(self.store.get(key))
+
+    @timed("get_many")
+    async def get_many(self, keys):
+        return {key: _decode(self.store.get(key)) for key in keys}
+
+    @timed("set")
+    async def set(self, key, value, ttl=None):
+        self.store.set(key, json.dumps(value), px=int(ttl * 1000) if ttl else None)
+
+    @timed("delete")
+    async def delete(self, key):
+        self.store.delete(key)
+
+    @timed("claim")
+    async def claim(self, key, ttl, value=True):
+        if self.store.set(key, json.dumps(value), px=int(ttl * 1000), nx=True):
+            return 0
+        return max(self.store.pttl(key), 0) / 1000
+
+    @timed("incr")
+    async def incr(self, key, amount=1, limit=None):
+        if limit is not None:
+            return self.store.incrby_within(key, amount, limit)
+        return self.store.incrby(key, amount)
+
+    @timed("zincrby")
+    async def zincrby(self, key, member, amount):
+        return self.store.zincrby(key, float(amount), str(member))
+
+    @timed("zadd")
+    async def zadd(self, key, member, score):
+        self.store.zadd(key, float(score), str(member))
+
+    @timed("zrem")
+    async def zrem(self, key, member):
+        self.store.zrem(key, str(member))
+
+    @timed("zscore")
+    async def zscore(self, key, member):
+        return self.store.zscore(key, str(member))
+
+    @timed("zrange")
+    async def zrange(self, key, start=0, stop=-1, descending=True):
+        return self.store.zrange(key, start, stop, reverse=descending)
+
+    @timed("lock")
+    async def lock(self, name, owner, ttl):
+        return self.store.lock(name, json.dumps(owner), int(ttl * 1000)) == 1
+    
+    @timed("unlock")
+    async def unlock(self, name, owner):
+        self.store.unlock(name, json.dumps(owner))
+
+class RedisError(Exception):
+    """An error reply from a Redis-compatible server"""
+    pass
+
+class RedisState(SharedState):
+    """Shared state kept on a Redis-compatible server, so several processes see the same values
+
+    Speaks just enough of the Redis protocol for the operations below over a
+    single pipelined connection; replies arrive in request order.
+    """
+    name = "redis"
+
+    def __init__(self, host="127.0.0.1", port=6379, db=0, password=None):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.reader = None
+        self.writer = None
+        self.waiting = None
+        self.listener = None
+        self.connecting = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.waiting = asyncio.Queue()
+        self.listener = asyncio.ensure_future(self._listen())
+        if self.password:
+            await self._send("AUTH", self.password)
+        if self.db:
+            await self._send("SELECT", self.db)
+
+    async def _read(self):
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            return RedisError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2].decode()
+        if kind == b"*":
+            length = int(body)
+            return None if length < 0 else [await self._read() for _ in range(length)]
+        raise ConnectionError(f"Unexpected Redis reply: {line!r}")
+
+    async def _listen(self):
+        try:
+            while True:
+                reply = await self._read()
+                future = await self.waiting.get()
+                if future.done():
+                    continue
+                if isinstance(reply, RedisError):
+                    future.set_exception(reply)
+                else:
+                    future.set_result(reply)
+        except Exception as e:
+            # Fail anything still waiting so callers don't hang on a dead server
+            while not self.waiting.empty():
+                future = self.waiting.get_nowait()
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Lost connection to Redis: {e}"))
+            self.writer = None
+
+    async def _send(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        future = asyncio.get_event_loop().create_future()
+        self.waiting.put_nowait(future)
+        self.writer.write(b"".join(parts))
+        return await future
+
+    async def execute(self, *args):
+        """Send one command and wait for its reply, connecting first if needed"""
+        if self.writer is None:
+            if self.connecting is None or self.connecting.done():
+                self.connecting = asyncio.ensure_future(self._connect())
+            await self.connecting
+        return await self._send(*args)
+
+    @timed("get")
+    async def get(self, key):
+        return _decode(await self.execute("GET", key))
+
+    @timed("get_many")
+    async def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        return {key: _decode(raw) for key, raw in zip(keys, await self.execute("MGET", *keys))}
+
+    @timed("set")
+    async def set(self, key, value, ttl=None):
+        if ttl:
+            await self.execute("SET", key, json.dumps(value), "PX", int(ttl * 1000))
+        else:
+            await self.execute("SET", key, json.dumps(value))
+
+    @timed("delete")
+    async def delete(self, key):
+        await self.execute("DEL", key)
+
+    @timed("claim")
+    async def claim(self, key, ttl, value=True):
+        for _ in range(2):
+            if await self.execute("SET", key, json.dumps(value), "PX", int(ttl * 1000), "NX") == "OK":
+                return 0
+            remaining = await self.execute("PTTL", key)
+            if remaining >= 0:
+                return remaining / 1000
+            # The key expired between the two calls, so try once more
+        return ttl
+
+    @timed("incr")
+    async def incr(self, key, amount=1, limit=None):
+        if limit is not None:
+            # Checked and added on the server in one step, so nobody ever sees it over the limit
+            return await self.execute("EVAL", INCR_LIMIT_SCRIPT, 1, key, amount, limit)
+        return await self.execute("INCRBY", key, amount)
+
+    @timed("zincrby")
+    async def zincrby(self, key, member, amount):
+        return float(await self.execute("ZINCRBY", key, amount, member))
+
+    @timed("zadd")
+    async def zadd(self, key, member, score):
+        await self.execute("ZADD", key, score, member)
+
+    @timed("zrem")
+    async def zrem(self, key, member):
+        await self.execute("ZREM", key, member)
+
+    @timed("zscore")
+    async def zscore(self, key, member):
+        score = await self.execute("ZSCORE", key, member)
+        return float(score) if score is not None else None
+
+    @timed("zrange")
+    async def zrange(self, key, start=0, stop=-1, descending=True):
+        reply = await self.execute("ZREVRANGE" if descending else "ZRANGE", key, start, stop, "WITHSCORES")
+        return [(reply[i], float(reply[i + 1])) for i in range(0, len(reply), 2)]
+
+    @timed("lock")
+    async def lock(self, name, owner, ttl):
+        return await self.execute("EVAL", LOCK_SCRIPT, 1, name, json.dumps(owner), int(ttl * 1000)) == 1
+    
+    @timed("unlock")
+    async def unlock(self, name, owner):
+        await self.execute("EVAL", UNLOCK_SCRIPT, 1, name, json.dumps(owner))
+    
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        if self.listener is not None:
+            self.listener.cancel()
+
+def create_state(url):
+    """Build the shared state backend for a URL: memory:// or redis://[:password@]host:port/db"""
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryState()
+    if parsed.scheme == "redis":
+        db = int(parsed.path.lstrip("/") or 0)
+        return RedisState(parsed.hostname or "127.0.0.1", parsed.port or 6379, db, parsed.password)
+    raise ValueError(f"Unsupported shared state URL: {url}")
+
+async def _exercise(state, operations):
+    """A cooldown, counter and leaderboard mix like the cogs produce"""
+    for i in range(operations):
+        user_id = i % 500
+        await state.claim(f"cooldown:{user_id}:work", 3600)
+        await state.incr(f"lottery:tickets:{user_id}", 1, limit=1000)
+        await state.zincrby("leaderboard:wins", user_id, 1)
+        if i % 50 == 0:
+            await state.zrange("leaderboard:wins", 0, 9)
+
+def benchmark(operations=5000):
+    """Average latency per operation for the memory backend and a Redis-compatible one
+
+    Uses REDIS_URL if it is set, otherwise the bundled stand-in server.
+    """
+    import os
+    from utils.state_server import StandInServer
+
+    async def run():
+        results = {}
+        server = None
+        url = os.getenv("REDIS_URL")
+        if not url:
+            server = await StandInServer().serve("127.0.0.1", 0)
+            url = f"redis://127.0.0.1:{server.sockets[0].getsockname()[1]}/0"
+
+        for backend in [MemoryState(), create_state(url)]:
+            metrics.reset()
+            start = time.perf_counter()
+            await _exercise(backend, operations)
+            elapsed = time.perf_counter() - start
+            timings = {name.rsplit(".", 1)[1]: timing.average * 1000000 for name, timing in metrics.timings.items()}
+            results[backend.name] = {"total_ms": elapsed * 1000, "operations_us": timings}
+            await backend.close()
+
+        if server is not None:
+            server.close()
+        return results
+
+    return asyncio.run(run())
+
+if __name__ == "__main__":
+    for backend, result in benchmark().items():
+        timings = ", ".join(f"{name} {value:.0f}us" for name, value in sorted(result["operations_us"].items()))
+        print(f"{backend}: {result['total_ms']:,.0f}ms total | {timings}")
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from utils.state import MemoryStore, LOCK_SCRIPT, UNLOCK_SCRIPT, INCR_LIMIT_SCRIPT
+
+class StandInServer:
+    """A local stand-in for a Redis server, speaking the protocol for the commands RedisState sends
+
+    Used by the cluster launcher when no Redis URL is configured and by the
+    harness and benchmarks, so the Redis backend runs without a real server.
+    """
+
+    def __init__(self, store=None):
+        self.store = store or MemoryStore()
+        self.server = None
+
+    def execute(self, command, args):
+        """Run one command against the store and return its reply"""
+        store = self.store
+        if command == "PING":
+            return "PONG"
+        if command in ("AUTH", "SELECT"):
+            return "OK"
+        if command == "GET":
+            return store.get(args[0])
+        if command == "MGET":
+            return [store.get(key) for key in args]
+        if command == "SET":
+            key, value, options = args[0], args[1], [option.upper() for option in args[2:]]
+            px = None
+            if "PX" in options:
+                px = int(args[2 + options.index("PX") + 1])
+            elif "EX" in options:
+                px = int(args[2 + options.index("EX") + 1]) * 1000
+            return "OK" if store.set(key, value, px=px, nx="NX" in options) else None
+        if command == "DEL":
+            return sum(store.delete(key) for key in args)
+        if command == "PTTL":
+            return store.pttl(args[0])
+        if command == "INCRBY":
+            return store.incrby(args[0], int(args[1]))
+        if command == "DECRBY":
+            return store.incrby(args[0], -int(args[1]))
+        if command == "EVAL":
+            # No Lua here: the scripts RedisState sends run as their MemoryStore equivalents
+            script, keys = args[0], args[2:2 + int(args[1])]
+            values = args[2 + int(args[1]):]
+            if script == LOCK_SCRIPT:
+                return store.lock(keys[0], values[0], int(values[1]))
+            if script == UNLOCK_SCRIPT:
+                return store.unlock(keys[0], values[0])
+            if script == INCR_LIMIT_SCRIPT:
+                return store.incrby_within(keys[0], int(values[0]), int(values[1]))
+            raise ValueError("ERR unknown script")
+        if command == "ZINCRBY":
+            return _score(store.zincrby(args[0], float(args[1]), args[2]))
+        if command == "ZADD":
+            return store.zadd(args[0], float(args[1]), args[2])
+        if command == "ZREM":
+            return store.zrem(args[0], args[1])
+        if command == "ZSCORE":
+            score = store.zscore(args[0], args[1])
+            return _score(score) if score is not None else None
+        if command in ("ZRANGE", "ZREVRANGE"):
+            members = store.zrange(args[0], int(args[1]), int(args[2]), reverse=command == "ZREVRANGE")
+            reply = []
+            for member, score in members:
+                reply.extend([member, _score(score)])
+            return reply
+        if command == "FLUSHDB":
+            self.store = MemoryStore()
+            return "OK"
+        raise ValueError(f"ERR unknown command '{command}'")
+
+    async def _serve_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                count = int(line[1:-2])
+                args = []
+                for _ in range(count):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2].decode())
+                try:
+                    reply = self.execute(args[0].upper(), args[1:])
+                except Exception as e:
+                    reply = e
+                writer.write(_encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        """Listen for connections"""
+        self.server = await asyncio.start_server(self._serve_client, host, port)
+        logging.info(f"Shared state stand-in listening on {host}:{port}")
+        return self.server
+
+def _score(score):
+    return str(int(score)) if score == int(score) else repr(score)
+
+def _encode(reply):
+    """Encode a reply in the Redis protocol"""
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Exception):
+        return f"-{reply}\r\n".encode()
+    if isinstance(reply, bool) or isinstance(reply, int):
+        return f":{int(reply)}\r\n".encode()
+    if isinstance(reply, list):
+        return f"*{len(reply)}\r\n".encode() + b"".join(_encode(item) for item in reply)
+    if reply in ("OK", "PONG"):
+        return f"+{reply}\r\n".encode()
+    data = str(reply).encode()
+    return b"$%d\r\n%s\r\n" % (len(data), data)